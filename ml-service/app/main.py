@@ -1,19 +1,51 @@
-from fastapi import FastAPI, File, UploadFile, HTTPException, Body
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, File, Form, UploadFile, HTTPException, Body, Depends, Header, Query
+from fastapi.responses import PlainTextResponse, Response
+from starlette.background import BackgroundTask
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import List, Optional, Dict
+from pydantic import BaseModel, Field
+from typing import List, Optional, Dict, Tuple
+import asyncio
+import hashlib
 import os
 import shutil
+import threading
+import uuid
 from pathlib import Path
 from app.services.resume_parser import resume_parser
 from app.services.skill_extractor import skill_extractor
 from app.services.matcher import matcher
 from app.services.gemini_service import gemini_service
+from app.services.resume_pipeline import ANALYSIS_STAGES, parse_and_extract_file, run_complete_analysis
+from app.utils.resilience import Deadline
+from app.utils.executors import run_cpu, run_io, run_llm, run_lookup, run_parse, get_executor_stats, shutdown_executors
+from app.utils.admission import AdmissionMiddleware, get_admission_stats
+from app.utils.admin import require_admin
+from app.utils.memory_diagnostics import GROUP_BY, TRACEMALLOC_DEFAULT_FRAMES, deep_sizeof, memory_diagnostics
+from app.utils.profiling import ProfilingMiddleware, profiler
+from app.utils.degradation import extraction_policy
+from app.utils.timing import TimingMiddleware, registry, stage
+from app.utils.logger import RequestIdMiddleware, flush_logs
+from app.utils.responses import CleanupStreamingResponse, FastJSONResponse, dumps, parse_fields, project
+from app.utils.process_memory import current_report, directory_usage, read_memory
+from app.utils.warmup import PENDING, warmup
+from app.utils.job_queue import (
+    JOB_DB_PATH,
+    IdempotencyConflict,
+    JobQueue,
+    JobStore,
+    QueueFull,
+    fingerprint
+)
 from app.utils.dataset_utils import (
+    dataset_manager,
+    resume_manifest,
+    get_search_index,
+    get_title_index,
+    get_random_resume_path,
     get_random_job_description,
     get_job_description_by_title,
-    search_jobs_by_keywords,
+    autocomplete_job_titles,
+    search_jobs_page,
     get_dataset_stats,
     get_resume_categories,
     get_sample_resumes_by_category
@@ -23,8 +55,39 @@ from app.utils.dataset_utils import (
 app = FastAPI(
     title="HireSight AI ML Service",
     description="AI/NLP microservice for resume parsing and analysis",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=FastJSONResponse
+)
+
+# On-demand profiling of sampled requests (off unless PROFILING_ENABLED or
+# turned on via /admin/profiling). Innermost, so shed requests are not profiled.
+app.add_middleware(ProfilingMiddleware)
+
+# Admission control per endpoint class. Added right after profiling, so it
+# sits just outside it: shed requests are not profiled, but their responses
+# still get CORS headers, timing and a request ID.
+# Endpoints not listed (health, readiness, metrics, status) are never limited.
+ADMISSION_ROUTES = {
+    ("POST", "/parse-resume"): "upload",
+    ("POST", "/parse-and-extract"): "upload",
+    ("POST", "/parse-and-extract/batch"): "upload",
+    ("POST", "/complete-analysis"): "upload",
+    ("POST", "/jobs"): "upload",
+    ("POST", "/extract-skills"): "nlp",
+    ("POST", "/batch-match"): "nlp",
+    ("POST", "/analyze-resume"): "llm",
+    ("POST", "/generate-interview-questions"): "llm",
+    ("POST", "/match"): "lookup",
+    ("POST", "/skill-gap"): "lookup",
+    ("GET", "/skills/all"): "lookup",
+    ("GET", "/skills/search"): "lookup",
+    ("POST", "/dataset/search-jobs"): "lookup",
+}
+ADMISSION_PREFIXES = (
+    ("GET", "/dataset/", "lookup"),
+    ("GET", "/jobs/", "lookup"),
 )
+app.add_middleware(AdmissionMiddleware, routes=ADMISSION_ROUTES, prefixes=ADMISSION_PREFIXES)
 
 # CORS middleware
 app.add_middleware(
@@ -33,12 +96,124 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "X-Request-ID", "Retry-After", "X-Profile-ID"],
 )
 
+# Per-endpoint latency histograms and Server-Timing headers
+app.add_middleware(TimingMiddleware)
+
+# Correlation ID for every log record written while serving a request
+app.add_middleware(RequestIdMiddleware)
+
 # Create temp directory for uploads
 TEMP_DIR = Path("temp_uploads")
 TEMP_DIR.mkdir(exist_ok=True)
 
+# Default time budget for the LLM step when the caller does not send one
+LLM_ANALYSIS_BUDGET_SECONDS = float(os.getenv("LLM_ANALYSIS_BUDGET_SECONDS", "45"))
+# Time budget for interview question generation, retries included
+LLM_QUESTIONS_BUDGET_SECONDS = float(os.getenv("LLM_QUESTIONS_BUDGET_SECONDS", "30"))
+
+# Uploads waiting for a queued job live next to the job database
+JOB_FILES_DIR = JOB_DB_PATH.parent / "files"
+JOB_FILES_DIR.mkdir(parents=True, exist_ok=True)
+
+# Seconds clients are asked to wait when the job queue is full
+JOB_QUEUE_RETRY_AFTER = 30
+
+# Batch upload limits
+BATCH_MAX_FILES = int(os.getenv("BATCH_MAX_FILES", "500"))
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", str(os.cpu_count() or 4)))
+
+
+def _request_deadline(request_timeout: Optional[float]) -> Deadline:
+    """
+    Build the deadline for a request's LLM work
+
+    Args:
+        request_timeout: Seconds the caller is still willing to wait (X-Request-Timeout)
+
+    Returns:
+        Deadline bounded by both the caller budget and the service default
+    """
+    budget = LLM_ANALYSIS_BUDGET_SECONDS
+    if request_timeout is not None and request_timeout > 0:
+        budget = min(budget, request_timeout)
+    return Deadline(budget)
+
+
+def _temp_path(file: UploadFile) -> Path:
+    """Unique temp file path for an upload"""
+    return TEMP_DIR / f"temp_{uuid.uuid4().hex}_{Path(file.filename).name}"
+
+
+def _llm_error_status(result: Dict) -> int:
+    """
+    HTTP status for a failed LLM service result
+
+    Args:
+        result: Result dict with success False
+
+    Returns:
+        503 when the circuit is open, 504 when the deadline ran out, else 500
+    """
+    if result.get("circuit_open"):
+        return 503
+    if result.get("deadline_exceeded"):
+        return 504
+    return 500
+
+
+def _save_upload(file: UploadFile, temp_file_path: Optional[Path] = None) -> Path:
+    """
+    Spool an uploaded file to a uniquely named temp file
+    
+    Args:
+        file: Uploaded file
+        temp_file_path: Path to write to (default: a new unique path)
+        
+    Returns:
+        Path of the temp file
+    """
+    temp_file_path = temp_file_path or _temp_path(file)
+    with stage("upload"), open(temp_file_path, "wb") as buffer:
+        shutil.copyfileobj(file.file, buffer)
+    return temp_file_path
+
+
+def _remove_temp(temp_file_path: Optional[Path]):
+    """Delete a temp upload if it exists; safe to call more than once"""
+    if temp_file_path:
+        try:
+            os.remove(temp_file_path)
+        except FileNotFoundError:
+            pass
+
+
+def _remove_temps(temp_file_paths: List[Path]):
+    """Delete several temp uploads"""
+    for temp_file_path in temp_file_paths:
+        _remove_temp(temp_file_path)
+
+
+FIELDS_DESCRIPTION = "Comma-separated data fields to return, e.g. skills,match.score"
+
+
+def _field_selection(fields: Optional[str]):
+    """
+    Parse a fields= query parameter
+
+    Args:
+        fields: Raw parameter value
+
+    Returns:
+        Field tree for project(), or None for the full payload
+    """
+    try:
+        return parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 
 # Pydantic models for request validation
 class SkillExtractionRequest(BaseModel):
@@ -85,24 +260,50 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint"""
+    """Liveness check: the process is up and serving (see /ready for warmup)"""
     return {
         "status": "healthy",
         "service": "ml-service"
     }
 
 
+@app.get("/ready")
+async def readiness_check():
+    """
+    Readiness check: 200 once startup warmup has completed, 503 before
+    
+    Returns:
+        JSON with warmup status and the duration of each step
+    """
+    ready = warmup.ready
+    return FastJSONResponse(
+        status_code=200 if ready else 503,
+        headers=None if ready else {"Retry-After": "5"},
+        content={
+            "success": ready,
+            "message": "Service is ready" if ready else f"Service is not ready ({warmup.status})",
+            "data": warmup.report()
+        }
+    )
+
+
 @app.post("/parse-resume")
-async def parse_resume(file: UploadFile = File(...)):
+async def parse_resume(
+    file: UploadFile = File(...),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)
+):
     """
     Parse resume PDF and extract text
     
     Args:
         file: PDF file upload
+        fields: Optional sparse fieldset over the data object
         
     Returns:
         JSON with extracted text and metadata
     """
+    selection = _field_selection(fields)
+    
     # Validate file type
     if not file.filename.endswith('.pdf'):
         raise HTTPException(
@@ -114,13 +315,10 @@ async def parse_resume(file: UploadFile = File(...)):
     
     try:
         # Save uploaded file temporarily
-        temp_file_path = TEMP_DIR / f"temp_{file.filename}"
-        
-        with open(temp_file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        temp_file_path = await run_io(_save_upload, file)
         
         # Parse the PDF
-        result = resume_parser.parse_pdf(str(temp_file_path))
+        result = await run_cpu(resume_parser.parse_pdf, str(temp_file_path))
         
         if not result.get("success"):
             raise HTTPException(
@@ -128,16 +326,16 @@ async def parse_resume(file: UploadFile = File(...)):
                 detail=f"Failed to parse resume: {result.get('error')}"
             )
         
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=200,
             content={
                 "success": True,
                 "message": "Resume parsed successfully",
-                "data": {
+                "data": project({
                     "text": result["text"],
                     "char_count": result["char_count"],
                     "word_count": result["word_count"]
-                }
+                }, selection)
             }
         )
         
@@ -150,8 +348,7 @@ async def parse_resume(file: UploadFile = File(...)):
         )
     finally:
         # Clean up temporary file
-        if temp_file_path and os.path.exists(temp_file_path):
-            os.remove(temp_file_path)
+        await run_io(_remove_temp, temp_file_path)
 
 
 @app.post("/extract-skills")
@@ -166,7 +363,7 @@ async def extract_skills(request: SkillExtractionRequest):
         JSON with extracted skills
     """
     try:
-        result = skill_extractor.extract_skills(request.text)
+        result = await run_cpu(skill_extractor.extract_skills, request.text)
         
         if not result.get("success"):
             raise HTTPException(
@@ -174,7 +371,7 @@ async def extract_skills(request: SkillExtractionRequest):
                 detail=f"Failed to extract skills: {result.get('error')}"
             )
         
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=200,
             content={
                 "success": True,
@@ -183,6 +380,7 @@ async def extract_skills(request: SkillExtractionRequest):
                     "skills": result["skills"],
                     "skill_count": result["skill_count"],
                     "categorized_skills": result["categorized_skills"],
+                    "matched_forms": result["matched_forms"],
                     "extraction_methods": result["extraction_methods"]
                 }
             }
@@ -197,16 +395,22 @@ async def extract_skills(request: SkillExtractionRequest):
 
 
 @app.post("/parse-and-extract")
-async def parse_and_extract(file: UploadFile = File(...)):
+async def parse_and_extract(
+    file: UploadFile = File(...),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)
+):
     """
     Parse resume PDF and extract skills in one call
     
     Args:
         file: PDF file upload
+        fields: Optional sparse fieldset over the data object
         
     Returns:
         JSON with parsed text and extracted skills
     """
+    selection = _field_selection(fields)
+    
     # Validate file type
     if not file.filename.endswith('.pdf'):
         raise HTTPException(
@@ -218,13 +422,10 @@ async def parse_and_extract(file: UploadFile = File(...)):
     
     try:
         # Save uploaded file temporarily
-        temp_file_path = TEMP_DIR / f"temp_{file.filename}"
-        
-        with open(temp_file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        temp_file_path = await run_io(_save_upload, file)
         
         # Parse the PDF
-        parse_result = resume_parser.parse_pdf(str(temp_file_path))
+        parse_result = await run_cpu(resume_parser.parse_pdf, str(temp_file_path))
         
         if not parse_result.get("success"):
             raise HTTPException(
@@ -233,21 +434,23 @@ async def parse_and_extract(file: UploadFile = File(...)):
             )
         
         # Extract skills from parsed text
-        skill_result = skill_extractor.extract_skills(parse_result["text"])
+        skill_result = await run_cpu(skill_extractor.extract_skills, parse_result["text"])
         
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=200,
             content={
                 "success": True,
                 "message": "Resume parsed and skills extracted successfully",
-                "data": {
+                "data": project({
                     "text": parse_result["text"],
                     "char_count": parse_result["char_count"],
                     "word_count": parse_result["word_count"],
                     "skills": skill_result.get("skills", []),
                     "skill_count": skill_result.get("skill_count", 0),
-                    "categorized_skills": skill_result.get("categorized_skills", {})
-                }
+                    "categorized_skills": skill_result.get("categorized_skills", {}),
+                    "matched_forms": skill_result.get("matched_forms", {}),
+                    "extraction_methods": skill_result.get("extraction_methods", {})
+                }, selection)
             }
         )
         
@@ -260,23 +463,144 @@ async def parse_and_extract(file: UploadFile = File(...)):
         )
     finally:
         # Clean up temporary file
-        if temp_file_path and os.path.exists(temp_file_path):
-            os.remove(temp_file_path)
+        await run_io(_remove_temp, temp_file_path)
+
+
+@app.post("/parse-and-extract/batch")
+async def parse_and_extract_batch(
+    files: List[UploadFile] = File(...),
+    concurrency: Optional[int] = Query(None, ge=1, description="Files processed at once"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)
+):
+    """
+    Parse many resume PDFs and extract their skills in one request
+    
+    Results are streamed as NDJSON in completion order, one line per file
+    tagged with the file's position in the upload, followed by a summary
+    line. A failing file produces an error line and does not affect the
+    others.
+    
+    Args:
+        files: PDF file uploads
+        concurrency: Files processed at once (capped by BATCH_MAX_CONCURRENCY)
+        fields: Optional sparse fieldset over each file's data object
+        
+    Returns:
+        application/x-ndjson stream
+    """
+    selection = _field_selection(fields)
+    if len(files) > BATCH_MAX_FILES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {BATCH_MAX_FILES} files per batch"
+        )
+    limit = min(concurrency or BATCH_MAX_CONCURRENCY, BATCH_MAX_CONCURRENCY)
+    
+    # Spool every upload now: the request's files are closed once the
+    # handler returns, before the response body is streamed. Paths are
+    # chosen up front so every file can be removed whatever happens next.
+    temp_paths = [
+        _temp_path(file) if file.filename and file.filename.endswith('.pdf') else None
+        for file in files
+    ]
+    spool_paths = [path for path in temp_paths if path is not None]
+    abandoned = threading.Event()
+    
+    def save(file: UploadFile, temp_file_path: Path) -> Path:
+        _save_upload(file, temp_file_path)
+        # A cancelled request does not wait for saves already running; the
+        # last one out removes the file
+        if abandoned.is_set():
+            _remove_temp(temp_file_path)
+        return temp_file_path
+    
+    async def spool(file: UploadFile, temp_file_path: Optional[Path]):
+        if temp_file_path is None:
+            return None
+        return await run_io(save, file, temp_file_path)
+    
+    try:
+        spooled = await asyncio.gather(
+            *(spool(file, path) for file, path in zip(files, temp_paths)),
+            return_exceptions=True
+        )
+    except BaseException:
+        abandoned.set()
+        _remove_temps(spool_paths)
+        raise
+    filenames = [file.filename for file in files]
+    
+    async def process(index: int, temp_file_path: Optional[Path], semaphore: asyncio.Semaphore) -> Dict:
+        line = {"index": index, "filename": filenames[index]}
+        try:
+            if isinstance(temp_file_path, BaseException):
+                return {**line, "success": False, "error": f"Error saving upload: {temp_file_path}"}
+            if temp_file_path is None:
+                return {**line, "success": False, "error": "Only PDF files are accepted"}
+            async with semaphore:
+                result = await run_parse(parse_and_extract_file, temp_file_path)
+            if not result["success"]:
+                return {**line, "success": False, "error": result["error"]}
+            return {**line, "success": True, "data": project(result["data"], selection)}
+        except Exception as e:
+            return {**line, "success": False, "error": f"Error processing resume: {str(e)}"}
+        finally:
+            if not isinstance(temp_file_path, BaseException):
+                await run_io(_remove_temp, temp_file_path)
+    
+    async def stream():
+        semaphore = asyncio.Semaphore(limit)
+        tasks = [
+            asyncio.create_task(process(index, temp_file_path, semaphore))
+            for index, temp_file_path in enumerate(spooled)
+        ]
+        succeeded = 0
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                line = await next_done
+                succeeded += line["success"]
+                yield dumps(line) + b"\n"
+            yield dumps({
+                "summary": {
+                    "total": len(tasks),
+                    "succeeded": succeeded,
+                    "failed": len(tasks) - succeeded
+                }
+            }) + b"\n"
+        finally:
+            # Client went away: drop files that have not started yet
+            for task in tasks:
+                task.cancel()
+    
+    # Files whose task never ran, or a stream that never started, are
+    # removed once the response finishes or the client disconnects
+    return CleanupStreamingResponse(
+        stream(),
+        media_type="application/x-ndjson",
+        background=BackgroundTask(run_io, _remove_temps, spool_paths)
+    )
 
 
 @app.post("/match")
-async def match_resume(request: MatchRequest):
+async def match_resume(
+    request: MatchRequest,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)
+):
     """
     Match resume skills against job requirements
     
     Args:
         request: JSON with resume_skills and job_description or job_skills
+        fields: Optional sparse fieldset over the data object
         
     Returns:
         JSON with match score and details
     """
+    selection = _field_selection(fields)
+    
     try:
-        result = matcher.calculate_match(
+        result = await run_lookup(
+            matcher.calculate_match,
             resume_skills=request.resume_skills,
             job_description=request.job_description,
             job_skills=request.job_skills
@@ -288,12 +612,12 @@ async def match_resume(request: MatchRequest):
                 detail=result.get("error", "Match calculation failed")
             )
         
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=200,
             content={
                 "success": True,
                 "message": "Match calculated successfully",
-                "data": result
+                "data": project(result, selection)
             }
         )
     except HTTPException:
@@ -306,18 +630,25 @@ async def match_resume(request: MatchRequest):
 
 
 @app.post("/batch-match")
-async def batch_match_resume(request: BatchMatchRequest):
+async def batch_match_resume(
+    request: BatchMatchRequest,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)
+):
     """
     Match resume against multiple job listings
     
     Args:
         request: JSON with resume_skills and job_listings
+        fields: Optional sparse fieldset over the data object
         
     Returns:
         JSON with ranked matches
     """
+    selection = _field_selection(fields)
+    
     try:
-        result = matcher.batch_match(
+        result = await run_cpu(
+            matcher.batch_match,
             resume_skills=request.resume_skills,
             job_listings=request.job_listings
         )
@@ -328,12 +659,12 @@ async def batch_match_resume(request: BatchMatchRequest):
                 detail=result.get("error", "Batch match failed")
             )
         
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=200,
             content={
                 "success": True,
                 "message": "Batch match completed successfully",
-                "data": result
+                "data": project(result, selection)
             }
         )
     except HTTPException:
@@ -357,7 +688,8 @@ async def skill_gap_analysis(request: SkillGapRequest):
         JSON with detailed gap analysis
     """
     try:
-        result = matcher.get_skill_gap_analysis(
+        result = await run_lookup(
+            matcher.get_skill_gap_analysis,
             resume_skills=request.resume_skills,
             target_skills=request.target_skills
         )
@@ -368,7 +700,7 @@ async def skill_gap_analysis(request: SkillGapRequest):
                 detail=result.get("error", "Skill gap analysis failed")
             )
         
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=200,
             content={
                 "success": True,
@@ -395,7 +727,7 @@ async def get_all_skills():
     """
     try:
         skills = skill_extractor.get_all_skills()
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=200,
             content={
                 "success": True,
@@ -423,7 +755,7 @@ async def search_skills(query: str):
     """
     try:
         matches = skill_extractor.search_skills(query)
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=200,
             content={
                 "success": True,
@@ -442,30 +774,57 @@ async def search_skills(query: str):
         )
 
 
+@app.get("/llm/status")
+async def llm_status():
+    """
+    Resilience state of the LLM integration
+    
+    Returns:
+        JSON with breaker state, retry/hedge counters and latency estimates
+    """
+    return FastJSONResponse(
+        status_code=200,
+        content={
+            "success": True,
+            "message": "LLM status retrieved",
+            "data": {
+                "available": gemini_service.is_available(),
+                **gemini_service.get_stats()
+            }
+        }
+    )
+
+
 @app.post("/analyze-resume")
-async def analyze_resume_with_gemini(request: GeminiAnalysisRequest):
+async def analyze_resume_with_gemini(
+    request: GeminiAnalysisRequest,
+    x_request_timeout: Optional[float] = Header(None)
+):
     """
     Analyze resume against job description using Google Gemini AI
     
     Args:
         request: JSON with resume_text and job_description
+        x_request_timeout: Optional seconds the caller is willing to wait
         
     Returns:
         JSON with AI-powered analysis including fit score, suggestions, and improvement areas
     """
     try:
-        result = gemini_service.analyze_resume(
+        result = await run_llm(
+            gemini_service.analyze_resume,
             resume_text=request.resume_text,
-            job_description=request.job_description
+            job_description=request.job_description,
+            deadline=_request_deadline(x_request_timeout)
         )
         
         if not result.get("success"):
             raise HTTPException(
-                status_code=500,
+                status_code=_llm_error_status(result),
                 detail=result.get("error", "Analysis failed")
             )
         
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=200,
             content={
                 "success": True,
@@ -483,17 +842,28 @@ async def analyze_resume_with_gemini(request: GeminiAnalysisRequest):
 
 
 @app.post("/complete-analysis")
-async def complete_resume_analysis(file: UploadFile = File(...), job_description: str = Body(...)):
+async def complete_resume_analysis(
+    file: UploadFile = File(...),
+    job_description: str = Body(...),
+    x_request_timeout: Optional[float] = Header(None),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)
+):
     """
     Complete workflow: Parse PDF → Extract Skills → Gemini Analysis
     
     Args:
         file: PDF resume file
         job_description: Job description text
+        x_request_timeout: Optional seconds the caller is willing to wait
+        fields: Optional sparse fieldset over the data object
         
     Returns:
         Complete analysis with text, skills, and AI insights
     """
+    # Start the clock before local work so parsing counts against the budget
+    deadline = _request_deadline(x_request_timeout)
+    selection = _field_selection(fields)
+    
     # Validate file type
     if not file.filename.endswith('.pdf'):
         raise HTTPException(
@@ -505,65 +875,22 @@ async def complete_resume_analysis(file: UploadFile = File(...), job_description
     
     try:
         # Save uploaded file temporarily
-        temp_file_path = TEMP_DIR / f"temp_{file.filename}"
+        temp_file_path = await run_io(_save_upload, file)
         
-        with open(temp_file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        result = await run_complete_analysis(temp_file_path, job_description, deadline)
         
-        # Step 1: Parse the PDF
-        parse_result = resume_parser.parse_pdf(str(temp_file_path))
-        
-        if not parse_result.get("success"):
+        if not result.get("success"):
             raise HTTPException(
                 status_code=500,
-                detail=f"Failed to parse resume: {parse_result.get('error')}"
+                detail=result.get("error")
             )
         
-        resume_text = parse_result["text"]
-        
-        # Step 2: Extract skills
-        skill_result = skill_extractor.extract_skills(resume_text)
-        
-        # Step 3: Get Gemini analysis
-        gemini_result = gemini_service.analyze_resume(
-            resume_text=resume_text,
-            job_description=job_description
-        )
-        
-        # Step 4: Calculate match score
-        if skill_result.get("success"):
-            match_result = matcher.calculate_match(
-                resume_skills=skill_result.get("skills", []),
-                job_description=job_description
-            )
-        else:
-            match_result = {"success": False}
-        
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=200,
             content={
                 "success": True,
                 "message": "Complete analysis finished",
-                "data": {
-                    "resume": {
-                        "text": resume_text,
-                        "char_count": parse_result["char_count"],
-                        "word_count": parse_result["word_count"]
-                    },
-                    "skills": {
-                        "extracted": skill_result.get("skills", []),
-                        "count": skill_result.get("skill_count", 0),
-                        "categorized": skill_result.get("categorized_skills", {})
-                    },
-                    "match": {
-                        "score": match_result.get("match_score", 0) if match_result.get("success") else 0,
-                        "matched_skills": match_result.get("matched_skills", []) if match_result.get("success") else [],
-                        "missing_skills": match_result.get("missing_skills", []) if match_result.get("success") else []
-                    },
-                    "ai_analysis": gemini_result.get("analysis", {}) if gemini_result.get("success") else {
-                        "error": "AI analysis unavailable"
-                    }
-                }
+                "data": project(result["data"], selection)
             }
         )
         
@@ -576,8 +903,7 @@ async def complete_resume_analysis(file: UploadFile = File(...), job_description
         )
     finally:
         # Clean up temporary file
-        if temp_file_path and os.path.exists(temp_file_path):
-            os.remove(temp_file_path)
+        await run_io(_remove_temp, temp_file_path)
 
 
 @app.post("/generate-interview-questions")
@@ -592,19 +918,21 @@ async def generate_interview_questions(request: InterviewQuestionsRequest):
         JSON with generated interview questions
     """
     try:
-        result = gemini_service.generate_interview_questions(
+        result = await run_llm(
+            gemini_service.generate_interview_questions,
             resume_text=request.resume_text,
             job_description=request.job_description,
-            num_questions=request.num_questions
+            num_questions=request.num_questions,
+            deadline=Deadline(LLM_QUESTIONS_BUDGET_SECONDS)
         )
         
         if not result.get("success"):
             raise HTTPException(
-                status_code=500,
+                status_code=_llm_error_status(result),
                 detail=result.get("error", "Failed to generate questions")
             )
         
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=200,
             content={
                 "success": True,
@@ -640,8 +968,8 @@ async def get_dataset_statistics():
         - resumes_by_category: Count of resumes per category
     """
     try:
-        stats = get_dataset_stats()
-        return JSONResponse(
+        stats = await run_io(get_dataset_stats)
+        return FastJSONResponse(
             status_code=200,
             content={
                 "success": True,
@@ -666,14 +994,14 @@ async def get_random_job():
         - job_description: Full job description
     """
     try:
-        job = get_random_job_description()
+        job = await run_io(get_random_job_description)
         if not job['job_title']:
             raise HTTPException(
                 status_code=404,
                 detail="No job descriptions found in dataset"
             )
         
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=200,
             content={
                 "success": True,
@@ -692,32 +1020,46 @@ async def get_random_job():
 
 class JobSearchRequest(BaseModel):
     keywords: List[str]
-    limit: int = 10
+    limit: int = Field(10, ge=1, le=100)
+    offset: int = Field(0, ge=0, le=10000)
 
 
 @app.post("/dataset/search-jobs")
-async def search_jobs(request: JobSearchRequest):
+async def search_jobs(
+    request: JobSearchRequest,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)
+):
     """
-    Search for jobs by keywords.
+    Search for jobs by keywords, ranked by BM25 relevance.
     
     Request body:
         - keywords: List of keywords to search for
-        - limit: Maximum number of results (default: 10)
+        - limit: Page size (default: 10)
+        - offset: Number of ranked results to skip (default: 0)
+    
+    Query parameters:
+        - fields: Optional sparse fieldset, e.g. jobs.title,jobs.score,has_more
     
     Returns:
-        List of matching job descriptions
+        One page of matching job descriptions, best first
     """
+    selection = _field_selection(fields)
+    
     try:
-        jobs = search_jobs_by_keywords(request.keywords, request.limit)
-        return JSONResponse(
+        page = await run_io(search_jobs_page, request.keywords, request.limit, request.offset)
+        jobs = page["jobs"]
+        return FastJSONResponse(
             status_code=200,
             content={
                 "success": True,
                 "message": f"Found {len(jobs)} matching jobs",
-                "data": {
+                "data": project({
                     "jobs": jobs,
-                    "count": len(jobs)
-                }
+                    "count": len(jobs),
+                    "offset": request.offset,
+                    "limit": request.limit,
+                    "has_more": page["has_more"]
+                }, selection)
             }
         )
     except Exception as e:
@@ -739,14 +1081,14 @@ async def get_job_by_title(title: str):
         Matching job description
     """
     try:
-        job = get_job_description_by_title(title)
+        job = await run_io(get_job_description_by_title, title)
         if not job['job_title']:
             raise HTTPException(
                 status_code=404,
                 detail=f"No job found matching title: {title}"
             )
         
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=200,
             content={
                 "success": True,
@@ -763,6 +1105,42 @@ async def get_job_by_title(title: str):
         )
 
 
+@app.get("/dataset/titles/autocomplete")
+async def autocomplete_titles(
+    prefix: str = Query(..., min_length=1),
+    limit: int = Query(10, ge=1, le=50)
+):
+    """
+    Suggest job titles starting with a prefix.
+    
+    Args:
+        prefix: Beginning of a job title (seniority words are ignored)
+        limit: Maximum number of suggestions (default: 10)
+    
+    Returns:
+        Matching titles, most common first
+    """
+    try:
+        suggestions = await run_io(autocomplete_job_titles, prefix, limit)
+        return FastJSONResponse(
+            status_code=200,
+            content={
+                "success": True,
+                "message": f"Found {len(suggestions)} matching titles",
+                "data": {
+                    "prefix": prefix,
+                    "suggestions": suggestions,
+                    "count": len(suggestions)
+                }
+            }
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error autocompleting titles: {str(e)}"
+        )
+
+
 @app.get("/dataset/categories")
 async def get_categories():
     """
@@ -773,7 +1151,7 @@ async def get_categories():
     """
     try:
         categories = get_resume_categories()
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=200,
             content={
                 "success": True,
@@ -804,9 +1182,9 @@ async def get_resumes_by_category(category: str):
     """
     try:
         category = category.upper()
-        resumes = get_sample_resumes_by_category(category)
+        resumes = await run_io(get_sample_resumes_by_category, category)
         
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=200,
             content={
                 "success": True,
@@ -825,9 +1203,682 @@ async def get_resumes_by_category(category: str):
         )
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """
+    Prometheus metrics
+    
+    Returns:
+        Stage and endpoint latency histograms, executor and LLM gauges in text format
+    """
+    # Collectors read locks and pool state; keep them off the event loop
+    return PlainTextResponse(
+        await run_io(registry.render_prometheus),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+@app.get("/process/memory")
+async def process_memory():
+    """
+    Unique (USS), proportional (PSS) and resident memory and open file
+    descriptors per worker, plus the size of the upload spool directories
+    
+    Under the pre-fork launcher this covers the parent and every worker;
+    otherwise only the serving process.
+    
+    Returns:
+        JSON with per-process memory in bytes, fleet totals and temp_dirs
+        (files and bytes under temp_uploads and the job upload spool)
+    """
+    report = await run_io(current_report)
+    report["temp_dirs"] = {
+        "temp_uploads": await run_io(directory_usage, TEMP_DIR),
+        "job_files": await run_io(directory_usage, JOB_FILES_DIR)
+    }
+    return FastJSONResponse(
+        status_code=200,
+        content={
+            "success": True,
+            "message": "Process memory retrieved",
+            "data": report
+        }
+    )
+
+
+@app.get("/executors/status")
+async def executors_status():
+    """
+    Saturation of the CPU, I/O and LLM executor pools
+    
+    Returns:
+        JSON with per-pool workers, active/queued tasks and average wait/run times
+    """
+    return FastJSONResponse(
+        status_code=200,
+        content={
+            "success": True,
+            "message": "Executor status retrieved",
+            "data": get_executor_stats()
+        }
+    )
+
+
+@app.get("/admission/status")
+async def admission_status():
+    """
+    Admission control state per endpoint class
+    
+    Returns:
+        JSON with slots, active/queued requests, rejections and average service time
+    """
+    return FastJSONResponse(
+        status_code=200,
+        content={
+            "success": True,
+            "message": "Admission status retrieved",
+            "data": get_admission_stats()
+        }
+    )
+
+
+@app.get("/extraction/status")
+async def extraction_status():
+    """
+    Adaptive skill extraction mode, the load signals driving it and spaCy batching
+    
+    Returns:
+        JSON with the current mode (full or keyword_only), queue depth, CPU wait,
+        thresholds and micro-batcher counters
+    """
+    return FastJSONResponse(
+        status_code=200,
+        content={
+            "success": True,
+            "message": "Extraction status retrieved",
+            "data": {
+                **extraction_policy.stats(),
+                "nlp_batcher": skill_extractor.batcher.stats() if skill_extractor.batcher else None
+            }
+        }
+    )
+
+
+class ProfilingConfigRequest(BaseModel):
+    enabled: Optional[bool] = None
+    sample_rate: Optional[float] = Field(None, ge=0.0, le=1.0)
+
+
+@app.get("/admin/profiling", dependencies=[Depends(require_admin)])
+async def profiling_status():
+    """
+    Profiling settings and stored request profiles (admin)
+    
+    Returns:
+        JSON with the sampling settings and a summary of every stored profile,
+        newest first
+    """
+    return FastJSONResponse(
+        status_code=200,
+        content={
+            "success": True,
+            "message": "Profiling status retrieved",
+            "data": profiler.stats()
+        }
+    )
+
+
+@app.post("/admin/profiling", dependencies=[Depends(require_admin)])
+async def configure_profiling(request: ProfilingConfigRequest):
+    """
+    Turn request profiling on or off and set the sampling rate (admin)
+    
+    Requests sent with ``X-Profile: 1`` are profiled whenever profiling is on.
+    
+    Args:
+        request: enabled and/or sample_rate
+    
+    Returns:
+        JSON with the new settings
+    """
+    profiler.configure(enabled=request.enabled, sample_rate=request.sample_rate)
+    return FastJSONResponse(
+        status_code=200,
+        content={
+            "success": True,
+            "message": "Profiling " + ("enabled" if profiler.enabled else "disabled"),
+            "data": {"enabled": profiler.enabled, "sample_rate": profiler.sample_rate}
+        }
+    )
+
+
+@app.get("/admin/profiling/profiles/{profile_id}", dependencies=[Depends(require_admin)])
+async def get_profile(
+    profile_id: str,
+    format: str = Query("summary", pattern="^(summary|pstats|collapsed)$"),
+    sort: str = Query("cumulative", pattern="^(cumulative|tottime|ncalls)$"),
+    limit: int = Query(25, ge=1, le=500)
+):
+    """
+    One stored profile (admin)
+    
+    Args:
+        profile_id: ID from the X-Profile-ID response header or /admin/profiling
+        format: summary (JSON with the top functions), pstats (binary, for
+            ``python -m pstats`` or snakeviz) or collapsed (stacks for flame graphs)
+        sort: pstats sort key for the summary table
+        limit: Rows in the summary table
+    
+    Returns:
+        The profile in the requested format
+    """
+    profile = profiler.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail=f"No profile {profile_id}")
+
+    if format == "pstats":
+        data = await run_cpu(profile.pstats_bytes)
+        if data is None:
+            raise HTTPException(status_code=404, detail="No worker-thread time was profiled for this request")
+        return Response(
+            data,
+            media_type="application/octet-stream",
+            headers={"Content-Disposition": f'attachment; filename="profile-{profile_id}.pstats"'}
+        )
+    if format == "collapsed":
+        return PlainTextResponse(await run_cpu(profile.collapsed))
+
+    return FastJSONResponse(
+        status_code=200,
+        content={
+            "success": True,
+            "message": "Profile retrieved",
+            "data": {
+                **profile.summary(),
+                "top_functions": await run_cpu(profile.top_functions, limit, sort)
+            }
+        }
+    )
+
+
+@app.delete("/admin/profiling/profiles", dependencies=[Depends(require_admin)])
+async def clear_profiles():
+    """
+    Drop every stored profile (admin)
+    
+    Returns:
+        JSON with the number of profiles removed
+    """
+    return FastJSONResponse(
+        status_code=200,
+        content={
+            "success": True,
+            "message": "Profiles cleared",
+            "data": {"removed": profiler.clear()}
+        }
+    )
+
+
+# Long-lived structures reported by /admin/memory and the
+# hiresight_structure_* gauges. Sizes are (bytes, entries); None while a
+# structure has not been built. Nothing here loads data.
+def _taxonomy_size():
+    taxonomy = skill_extractor.taxonomy
+    nbytes, _ = deep_sizeof((taxonomy.categories, taxonomy.canonical, taxonomy.aliases))
+    return nbytes, len(taxonomy.canonical)
+
+
+def _skill_matcher_size():
+    taxonomy = skill_extractor.taxonomy
+    nbytes, _ = deep_sizeof((taxonomy.surfaces, taxonomy.max_lengths, taxonomy._canonical_cache))
+    return nbytes, len(taxonomy.surfaces)
+
+
+def _skill_implications_size():
+    taxonomy = skill_extractor.taxonomy
+    nbytes, _ = deep_sizeof((taxonomy.implications, taxonomy.closure, taxonomy.closure_rows, taxonomy.implied_columns))
+    return nbytes, len(taxonomy.closure_rows)
+
+
+def _spacy_strings_size():
+    if skill_extractor.nlp is None:
+        return None
+    strings = skill_extractor.nlp.vocab.strings
+    # StringStore keeps UTF-8 copies keyed by 64-bit hash outside the Python heap
+    return sum(len(value.encode("utf-8")) + 16 for value in strings), len(strings)
+
+
+def _spacy_vocab_size():
+    if skill_extractor.nlp is None:
+        return None
+    vocab = skill_extractor.nlp.vocab
+    return vocab.vectors.data.nbytes, len(vocab)
+
+
+def _job_table_size():
+    jobs = dataset_manager.jobs.peek()
+    return (jobs.nbytes, len(jobs)) if jobs is not None else None
+
+
+def _job_derived_size(key: str, entries):
+    def size():
+        jobs = dataset_manager.jobs.peek()
+        index = jobs.peek_derived(key) if jobs is not None else None
+        return (index.nbytes, entries(index)) if index is not None else None
+    return size
+
+
+def _manifest_size():
+    nbytes, _ = deep_sizeof(resume_manifest)
+    return nbytes, resume_manifest.scanned_files()
+
+
+def _profiles_size():
+    nbytes, _ = deep_sizeof(profiler.profiles)
+    return nbytes, len(profiler.profiles)
+
+
+def _snapshots_size():
+    snapshots = list(memory_diagnostics.snapshots)
+    # Roughly 64 bytes per stored trace; tracebacks are shared between traces
+    return sum(len(snapshot.snapshot.traces) * 64 for snapshot in snapshots), len(snapshots)
+
+
+memory_diagnostics.register("skills_taxonomy", _taxonomy_size)
+memory_diagnostics.register("skill_matcher", _skill_matcher_size)
+memory_diagnostics.register("skill_implications", _skill_implications_size)
+memory_diagnostics.register("spacy_strings", _spacy_strings_size)
+memory_diagnostics.register("spacy_vocab_vectors", _spacy_vocab_size)
+memory_diagnostics.register("job_table", _job_table_size)
+memory_diagnostics.register("search_index", _job_derived_size("bm25", lambda index: index.num_docs))
+memory_diagnostics.register("title_index", _job_derived_size("titles", lambda index: len(index.keys)))
+memory_diagnostics.register("resume_manifest", _manifest_size)
+memory_diagnostics.register("stored_profiles", _profiles_size)
+memory_diagnostics.register("tracemalloc_snapshots", _snapshots_size)
+
+
+class TracemallocRequest(BaseModel):
+    frames: int = Field(TRACEMALLOC_DEFAULT_FRAMES, ge=1, le=100)
+
+
+def _get_snapshot_or_404(snapshot_id: str):
+    snapshot = memory_diagnostics.get_snapshot(snapshot_id)
+    if snapshot is None:
+        raise HTTPException(status_code=404, detail=f"No snapshot {snapshot_id}")
+    return snapshot
+
+
+@app.get("/admin/memory", dependencies=[Depends(require_admin)])
+async def memory_report(refresh: bool = Query(False)):
+    """
+    Memory of this worker: long-lived structure sizes, GC state and tracemalloc (admin)
+    
+    Args:
+        refresh: Re-measure structure sizes now instead of reusing the last
+            measurement (MEMORY_SIZE_INTERVAL), and count GC-tracked objects
+    
+    Returns:
+        JSON with per-structure bytes and entries, process RSS/USS, GC counts and
+        tracemalloc status with stored snapshots
+    """
+    report = await run_cpu(memory_diagnostics.report, refresh)
+    report["process"] = await run_io(read_memory, os.getpid())
+    return FastJSONResponse(
+        status_code=200,
+        content={
+            "success": True,
+            "message": "Memory report retrieved",
+            "data": report
+        }
+    )
+
+
+@app.post("/admin/memory/tracemalloc/start", dependencies=[Depends(require_admin)])
+async def start_tracemalloc(request: TracemallocRequest = Body(TracemallocRequest())):
+    """
+    Start tracing allocations (admin)
+    
+    Tracing slows allocation-heavy code noticeably and holds a record per
+    live allocation; stop it once the snapshots are taken.
+    
+    Args:
+        request: frames of traceback kept per allocation
+    
+    Returns:
+        JSON with the tracemalloc status
+    """
+    return FastJSONResponse(
+        status_code=200,
+        content={
+            "success": True,
+            "message": "tracemalloc started",
+            "data": memory_diagnostics.start_tracing(request.frames)
+        }
+    )
+
+
+@app.post("/admin/memory/tracemalloc/stop", dependencies=[Depends(require_admin)])
+async def stop_tracemalloc():
+    """
+    Stop tracing allocations; stored snapshots are kept (admin)
+    
+    Returns:
+        JSON with the tracemalloc status
+    """
+    return FastJSONResponse(
+        status_code=200,
+        content={
+            "success": True,
+            "message": "tracemalloc stopped",
+            "data": memory_diagnostics.stop_tracing()
+        }
+    )
+
+
+@app.post("/admin/memory/snapshots", dependencies=[Depends(require_admin)])
+async def take_memory_snapshot(
+    limit: int = Query(25, ge=1, le=500),
+    group_by: str = Query("lineno", pattern="^(" + "|".join(GROUP_BY) + ")$")
+):
+    """
+    Take a tracemalloc snapshot (admin)
+    
+    Args:
+        limit: Allocation sites returned
+        group_by: lineno, filename or traceback
+    
+    Returns:
+        JSON with the snapshot ID, its top allocation sites and, when an
+        earlier snapshot exists, the sites that grew most since then
+    """
+    try:
+        snapshot = await run_cpu(memory_diagnostics.take_snapshot)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    previous = memory_diagnostics.previous_snapshot(snapshot.id)
+    data = {
+        **snapshot.summary(),
+        "top": await run_cpu(memory_diagnostics.top, snapshot, group_by, limit)
+    }
+    if previous is not None:
+        data["base"] = previous.id
+        data["growth"] = await run_cpu(memory_diagnostics.diff, snapshot, previous, group_by, limit)
+    return FastJSONResponse(
+        status_code=200,
+        content={
+            "success": True,
+            "message": "Snapshot taken",
+            "data": data
+        }
+    )
+
+
+@app.get("/admin/memory/snapshots/{snapshot_id}", dependencies=[Depends(require_admin)])
+async def get_memory_snapshot(
+    snapshot_id: str,
+    base: Optional[str] = Query(None, description="Snapshot to diff against"),
+    limit: int = Query(25, ge=1, le=500),
+    group_by: str = Query("lineno", pattern="^(" + "|".join(GROUP_BY) + ")$")
+):
+    """
+    Top allocation sites of a stored snapshot, or its diff against another (admin)
+    
+    Args:
+        snapshot_id: Snapshot ID
+        base: Earlier snapshot ID; when given, sites are ranked by growth
+        limit: Allocation sites returned
+        group_by: lineno, filename or traceback
+    
+    Returns:
+        JSON with the allocation sites
+    """
+    snapshot = _get_snapshot_or_404(snapshot_id)
+    data = snapshot.summary()
+    if base is not None:
+        base_snapshot = _get_snapshot_or_404(base)
+        data["base"] = base_snapshot.id
+        data["growth"] = await run_cpu(memory_diagnostics.diff, snapshot, base_snapshot, group_by, limit)
+    else:
+        data["top"] = await run_cpu(memory_diagnostics.top, snapshot, group_by, limit)
+    return FastJSONResponse(
+        status_code=200,
+        content={
+            "success": True,
+            "message": "Snapshot retrieved",
+            "data": data
+        }
+    )
+
+
+# Asynchronous analysis jobs
+async def _complete_analysis_job(payload: Dict, progress) -> Dict:
+    """Job handler: complete analysis of a spooled resume"""
+    result = await run_complete_analysis(
+        payload["file_path"],
+        payload["job_description"],
+        Deadline(LLM_ANALYSIS_BUDGET_SECONDS),
+        on_stage=progress
+    )
+    if not result.get("success"):
+        raise RuntimeError(result.get("error"))
+    return result["data"]
+
+
+job_queue = JobQueue(JobStore(JOB_DB_PATH))
+job_queue.register(
+    "complete_analysis",
+    _complete_analysis_job,
+    stages=ANALYSIS_STAGES,
+    cleanup=lambda payload: _remove_temp(Path(payload["file_path"]))
+)
+registry.register_collector(
+    lambda: (("hiresight_jobs", {"status": status}, count) for status, count in job_queue.store.counts().items()),
+    help_texts={"hiresight_jobs": "Retained analysis jobs per status"}
+)
+
+
+def _spool_job_upload(file: UploadFile) -> Tuple[Path, str]:
+    """
+    Keep an upload until its job runs
+    
+    Returns:
+        (path, SHA-256 of the file contents)
+    """
+    path = JOB_FILES_DIR / f"{uuid.uuid4().hex}.pdf"
+    digest = hashlib.sha256()
+    with stage("upload"), open(path, "wb") as buffer:
+        for chunk in iter(lambda: file.file.read(1 << 20), b""):
+            digest.update(chunk)
+            buffer.write(chunk)
+    return path, digest.hexdigest()
+
+
+def _job_view(job: Dict) -> Dict:
+    """Public representation of a job"""
+    view = {key: value for key, value in job.items() if key != "payload"}
+    view["status_url"] = f"/jobs/{job['id']}"
+    return view
+
+
+@app.post("/jobs")
+async def create_job(
+    file: UploadFile = File(...),
+    job_description: str = Form(...),
+    priority: int = Form(0, ge=-10, le=10),
+    idempotency_key: Optional[str] = Header(None, max_length=255)
+):
+    """
+    Queue a complete analysis (parse → skills → AI → match) and return at once
+    
+    Args:
+        file: PDF resume file
+        job_description: Job description text
+        priority: Higher runs first (-10 to 10)
+        idempotency_key: Idempotency-Key header; retries with the same key
+            return the original job instead of queueing the work again
+        
+    Returns:
+        202 with the queued job, or 200 with the existing job for a repeated key
+    """
+    if not file.filename.endswith('.pdf'):
+        raise HTTPException(
+            status_code=400,
+            detail="Only PDF files are accepted"
+        )
+    
+    file_path, file_hash = await run_io(_spool_job_upload, file)
+    try:
+        job, created = await job_queue.submit(
+            "complete_analysis",
+            {"file_path": str(file_path), "job_description": job_description, "filename": file.filename},
+            priority=priority,
+            idempotency_key=idempotency_key,
+            request_fingerprint=fingerprint(file_hash, job_description, priority)
+        )
+    except IdempotencyConflict as e:
+        await run_io(_remove_temp, file_path)
+        raise HTTPException(status_code=409, detail=str(e))
+    except QueueFull as e:
+        await run_io(_remove_temp, file_path)
+        raise HTTPException(
+            status_code=503,
+            detail=f"Job queue is full: {str(e)}",
+            headers={"Retry-After": str(JOB_QUEUE_RETRY_AFTER)}
+        )
+    
+    if not created:
+        await run_io(_remove_temp, file_path)
+    
+    return FastJSONResponse(
+        status_code=202 if created else 200,
+        headers={"Location": f"/jobs/{job['id']}"},
+        content={
+            "success": True,
+            "message": "Job queued" if created else "Job already exists for this Idempotency-Key",
+            "data": _job_view(job)
+        }
+    )
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(
+    job_id: str,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)
+):
+    """
+    Status, per-stage progress and (once finished) result of a job
+    
+    Args:
+        job_id: Job id returned by POST /jobs
+        fields: Optional sparse fieldset, e.g. status,progress,result.match
+        
+    Returns:
+        JSON with the job
+    """
+    selection = _field_selection(fields)
+    job = await job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Job not found or expired"
+        )
+    
+    return FastJSONResponse(
+        status_code=200,
+        content={
+            "success": True,
+            "message": f"Job {job['status']}",
+            "data": project(_job_view(job), selection)
+        }
+    )
+
+
+# Startup warmup: exercise the first-request code paths before /ready passes
+WARMUP_RESUME_TEXT = (
+    "Senior software engineer with 6 years of experience in Python, Django, FastAPI "
+    "and React. Built data pipelines with Pandas, SQL and Apache Spark on AWS, "
+    "deployed with Docker and Kubernetes, and led an agile team of five."
+)
+WARMUP_JOB_DESCRIPTION = (
+    "We are hiring a backend developer skilled in Python, FastAPI, PostgreSQL, "
+    "Docker and AWS. Experience with machine learning and CI/CD is a plus."
+)
+
+
+def _warm_skill_extraction():
+    result = skill_extractor.extract_skills(WARMUP_RESUME_TEXT)
+    if not result.get("success"):
+        raise RuntimeError(result.get("error"))
+    return {"skills": result["skill_count"], "nlp": skill_extractor.nlp is not None}
+
+
+def _warm_matching():
+    result = matcher.calculate_match(
+        resume_skills=["python", "docker", "aws"],
+        job_description=WARMUP_JOB_DESCRIPTION
+    )
+    if not result.get("success"):
+        raise RuntimeError(result.get("error"))
+    matcher.batch_match(["python"], [{"title": "Warmup", "skills": ["python", "sql"]}])
+    return {"match_score": result["match_score"]}
+
+
+def _warm_pdf_parser():
+    path = get_random_resume_path()
+    if path is None:
+        return {"skipped": "no sample resumes"}
+    result = resume_parser.parse_pdf(path)
+    if not result.get("success"):
+        raise RuntimeError(result.get("error"))
+    return {"words": result["word_count"]}
+
+
+def _warm_dataset():
+    if dataset_manager.get_jobs() is None:
+        return {"skipped": "job dataset not found"}
+    get_random_job_description()
+    return {"jobs": dataset_manager.job_count()}
+
+
+def _warm_search_index():
+    if get_search_index() is None:
+        return {"skipped": "job dataset not found"}
+    search_jobs_page(["python", "developer"], limit=5)
+
+
+def _warm_title_index():
+    if get_title_index() is None:
+        return {"skipped": "job dataset not found"}
+    autocomplete_job_titles("soft")
+    get_job_description_by_title("software engineer")
+
+
+def _warm_resume_manifest():
+    resume_manifest.refresh(force=True)
+    return {"resumes": sum(resume_manifest.counts().values())}
+
+
+warmup.add_step("skill_extraction", _warm_skill_extraction)
+warmup.add_step("matching", _warm_matching)
+warmup.add_step("pdf_parser", _warm_pdf_parser, required=False)
+warmup.add_step("dataset", _warm_dataset, required=False)
+warmup.add_step("search_index", _warm_search_index, required=False)
+warmup.add_step("title_index", _warm_title_index, required=False)
+warmup.add_step("resume_manifest", _warm_resume_manifest, required=False)
+
+# Reference to the background warmup task so it is not garbage collected
+_warmup_task = None
+
+
 @app.on_event("startup")
 async def startup_event():
     """Run on application startup"""
+    global _warmup_task
+    job_queue.start()
+    # Warm up in the background so liveness answers at once; already done
+    # in pre-forked workers, which inherit the parent's warm state
+    if warmup.status == PENDING:
+        _warmup_task = asyncio.create_task(run_cpu(warmup.run))
     print("🚀 ML Service started successfully")
     print("📍 Temp directory:", TEMP_DIR.absolute())
 
@@ -836,3 +1887,6 @@ async def startup_event():
 async def shutdown_event():
     """Run on application shutdown"""
     print("👋 ML Service shutting down")
+    await job_queue.stop()
+    shutdown_executors()
+    flush_logs()
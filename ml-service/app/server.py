@@ -0,0 +1,194 @@
+"""
+Pre-fork production launcher for the ML service
+
+The parent process imports the app, runs the startup warmup (taxonomy, spaCy
+model, dataset indexes) once, freezes the GC and then forks the uvicorn workers,
+which share those pages copy-on-write and accept on one listening socket.
+
+    python -m app.server --workers 8 --port 8000
+
+Large structures are already fork-friendly: the dataset columns and search
+index postings are a few big numpy buffers (or a memory-mapped Arrow
+snapshot, shared through the page cache), so reading them never dirties
+shared pages. gc.freeze() keeps the collector from writing to the headers
+of the preloaded objects.
+"""
+import argparse
+import gc
+import os
+import signal
+import socket
+import sys
+import time
+from typing import Dict
+
+import uvicorn
+
+from app.utils.logger import flush_logs, log_error, log_info
+from app.utils.process_memory import PARENT_PID_ENV, format_megabytes, memory_report
+
+# Seconds between per-worker memory reports in the parent log (0 disables)
+MEMORY_REPORT_INTERVAL = float(os.getenv("MEMORY_REPORT_INTERVAL", "300"))
+
+# Workers that die sooner than this after starting are restarted with a delay
+MIN_WORKER_UPTIME = 5.0
+
+
+def preload():
+    """
+    Build everything workers would otherwise build per process
+
+    Returns:
+        The ASGI app
+    """
+    from app.main import app, job_queue
+    from app.utils.warmup import warmup
+
+    started = time.perf_counter()
+    # Loads the dataset, builds the indexes and warms spaCy and the parsers;
+    # workers inherit the finished state and are ready as soon as they start
+    warmup.run()
+
+    # Requeue jobs left by a previous run whose leases have expired; each
+    # worker also recovers at start and periodically, which leases make safe
+    job_queue.recover()
+
+    # Move everything allocated so far out of the collector's reach, so
+    # collections in the workers do not touch (and copy) the shared pages
+    gc.collect()
+    gc.freeze()
+    log_info("Preload complete", {
+        "seconds": round(time.perf_counter() - started, 3),
+        "frozen_objects": gc.get_freeze_count()
+    })
+    return app
+
+
+def bind_socket(host: str, port: int, backlog: int) -> socket.socket:
+    """Listening socket shared by all workers"""
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def run_worker(app, sock: socket.socket, args: argparse.Namespace):
+    """Body of a forked worker process; never returns"""
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    status = 0
+    try:
+        from app.services.gemini_service import gemini_service
+        gemini_service.reset_after_fork()
+
+        config = uvicorn.Config(
+            app,
+            log_level=args.log_level,
+            access_log=False,
+            timeout_keep_alive=args.keep_alive,
+            lifespan="on"
+        )
+        uvicorn.Server(config).run(sockets=[sock])
+    except Exception as e:
+        log_error("Worker crashed", e)
+        status = 1
+    finally:
+        flush_logs()
+        os._exit(status)
+
+
+class Supervisor:
+    """
+    Forks workers, restarts the ones that die and forwards shutdown signals
+    """
+
+    def __init__(self, app, sock: socket.socket, args: argparse.Namespace):
+        self.app = app
+        self.sock = sock
+        self.args = args
+        self.workers: Dict[int, float] = {}
+        self.stopping = False
+
+    def spawn(self):
+        flush_logs()
+        pid = os.fork()
+        if pid == 0:
+            run_worker(self.app, self.sock, self.args)
+        self.workers[pid] = time.monotonic()
+
+    def stop(self, signum, frame):
+        self.stopping = True
+        for pid in list(self.workers):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def report_memory(self):
+        report = memory_report(os.getpid(), list(self.workers))
+        log_info("Worker memory", {
+            "parent_rss": format_megabytes((report["parent"] or {}).get("rss")),
+            "workers": [
+                {"pid": worker["pid"], "uss": format_megabytes(worker["uss"]),
+                 "pss": format_megabytes(worker["pss"]), "rss": format_megabytes(worker["rss"])}
+                for worker in report["workers"]
+            ],
+            "total_uss": format_megabytes(report["total_uss"]),
+            "total_rss": format_megabytes(report["total_rss"])
+        })
+
+    def run(self):
+        os.environ[PARENT_PID_ENV] = str(os.getpid())
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        for _ in range(self.args.workers):
+            self.spawn()
+        log_info("Workers started", {"workers": list(self.workers), "bind": f"{self.args.host}:{self.args.port}"})
+
+        # First report once workers have finished starting up
+        next_report = time.monotonic() + min(MEMORY_REPORT_INTERVAL, 15) if MEMORY_REPORT_INTERVAL else None
+        while self.workers:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                time.sleep(0.5)
+                if next_report is not None and time.monotonic() >= next_report:
+                    self.report_memory()
+                    next_report = time.monotonic() + MEMORY_REPORT_INTERVAL
+                continue
+
+            started = self.workers.pop(pid, None)
+            if self.stopping or started is None:
+                continue
+            log_error(f"Worker {pid} exited with status {os.waitstatus_to_exitcode(status)}; restarting")
+            if time.monotonic() - started < MIN_WORKER_UPTIME:
+                time.sleep(MIN_WORKER_UPTIME)
+            self.spawn()
+        flush_logs()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the ML service with pre-forked workers")
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", "2")))
+    parser.add_argument("--backlog", type=int, default=2048)
+    parser.add_argument("--keep-alive", type=int, default=5)
+    parser.add_argument("--log-level", default="warning")
+    args = parser.parse_args(argv)
+
+    if not hasattr(os, "fork"):
+        sys.exit("Pre-fork mode needs os.fork; use uvicorn directly on this platform")
+
+    sock = bind_socket(args.host, args.port, args.backlog)
+    app = preload()
+    Supervisor(app, sock, args).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,20 @@
 import os
 import json
+import random
+import time
 from typing import Dict, Optional
 from dotenv import load_dotenv
+from app.utils.executors import llm_pool
 from app.utils.logger import log_info, log_error
+from app.utils.timing import registry, stage
+from app.utils.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    Deadline,
+    DeadlineExceeded,
+    ResilientCaller,
+    RetryPolicy
+)
 
 try:
     import google.generativeai as genai
@@ -14,6 +26,70 @@ except ImportError:
 # Load environment variables
 load_dotenv()
 
+# Client errors that will not succeed on retry
+NON_RETRYABLE_ERRORS = {
+    "InvalidArgument",
+    "PermissionDenied",
+    "Unauthenticated",
+    "NotFound",
+    "BlockedPromptException",
+    "StopCandidateException"
+}
+
+
+def _is_retryable(error: Exception) -> bool:
+    """Retry transport and server errors, not client mistakes"""
+    return type(error).__name__ not in NON_RETRYABLE_ERRORS
+
+
+# Fake model for load tests: canned answers after a simulated delay, no API key
+LLM_FAKE = os.getenv("LLM_FAKE", "false").lower() == "true"
+
+
+class FakeGenerativeModel:
+    """
+    Stand-in for genai.GenerativeModel with configurable latency and errors
+
+    Calls still go through the retry, breaker and deadline layer, so load
+    tests exercise the same code paths as production.
+    """
+
+    def __init__(self, latency: float, jitter: float, error_rate: float):
+        """
+        Args:
+            latency: Mean response time in seconds
+            jitter: Uniform +/- spread around the mean in seconds
+            error_rate: Fraction of calls that fail with a retryable error
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+
+    def generate_content(self, prompt: str, request_options: Optional[Dict] = None):
+        timeout = (request_options or {}).get("timeout")
+        delay = max(0.0, random.uniform(self.latency - self.jitter, self.latency + self.jitter))
+        if timeout is not None and delay > timeout:
+            time.sleep(timeout)
+            raise TimeoutError("Fake model timed out")
+        time.sleep(delay)
+        if random.random() < self.error_rate:
+            raise ConnectionError("Fake model error")
+        if "interview questions" in prompt:
+            text = json.dumps([f"Fake interview question {i + 1}?" for i in range(5)])
+        else:
+            text = json.dumps({
+                "fit_score": random.randint(40, 95),
+                "summary": "Synthetic analysis from the fake model.",
+                "strengths": ["Relevant experience"],
+                "weaknesses": ["Limited cloud exposure"],
+                "matched_skills": ["python"],
+                "missing_skills": ["kubernetes"],
+                "suggestions": ["Quantify project impact."],
+                "improvement_areas": ["Cloud platforms"],
+                "recommendation": "interview"
+            })
+        return type("FakeResponse", (), {"text": text})()
+
 
 class GeminiService:
     """
@@ -25,7 +101,40 @@ class GeminiService:
         """Initialize Gemini service with API key"""
         self.api_key = os.getenv("GEMINI_API_KEY")
         self.model = None
+        self.resilience = ResilientCaller(
+            name="gemini",
+            breaker=CircuitBreaker(
+                failure_rate_threshold=float(os.getenv("LLM_BREAKER_FAILURE_RATE", "0.5")),
+                minimum_calls=int(os.getenv("LLM_BREAKER_MIN_CALLS", "5")),
+                window_seconds=float(os.getenv("LLM_BREAKER_WINDOW_SECONDS", "60")),
+                open_seconds=float(os.getenv("LLM_BREAKER_OPEN_SECONDS", "30"))
+            ),
+            retry_policy=RetryPolicy(
+                max_retries=int(os.getenv("LLM_MAX_RETRIES", "2")),
+                base_delay=float(os.getenv("LLM_RETRY_BASE_DELAY", "0.5")),
+                max_delay=float(os.getenv("LLM_RETRY_MAX_DELAY", "4")),
+                is_retryable=_is_retryable
+            ),
+            attempt_timeout=float(os.getenv("LLM_TIMEOUT_SECONDS", "20")),
+            hedge=os.getenv("LLM_HEDGE_ENABLED", "false").lower() == "true",
+            # Model calls are made from the llm pool's threads
+            max_callers=llm_pool.max_workers
+        )
         
+        self._configure_model()
+
+    def _configure_model(self):
+        """Create the Gemini client (again after fork: gRPC channels are per process)"""
+        self.model = None
+        if LLM_FAKE:
+            self.model = FakeGenerativeModel(
+                latency=float(os.getenv("LLM_FAKE_LATENCY_MS", "800")) / 1000,
+                jitter=float(os.getenv("LLM_FAKE_JITTER_MS", "400")) / 1000,
+                error_rate=float(os.getenv("LLM_FAKE_ERROR_RATE", "0"))
+            )
+            log_info("Using the fake LLM (LLM_FAKE=true)")
+            return
+
         if not GEMINI_AVAILABLE:
             log_error("Gemini library not installed")
             return
@@ -42,10 +151,48 @@ class GeminiService:
             log_error("Failed to initialize Gemini service", e)
             self.model = None
 
+    def reset_after_fork(self):
+        """Recreate the client in a forked worker process"""
+        self._configure_model()
+
+    def is_available(self) -> bool:
+        """
+        Whether an LLM call could be attempted right now
+
+        Returns:
+            False when the model is not configured or the breaker is open
+        """
+        return self.model is not None and not self.resilience.breaker.is_open()
+
+    def get_stats(self) -> Dict[str, any]:
+        """Breaker state, retry counters and latency estimates for model calls"""
+        return self.resilience.stats()
+
+    def _generate(self, prompt: str, deadline: Optional[Deadline] = None):
+        """
+        Call the model through the resilience layer
+
+        Args:
+            prompt: Prompt text
+            deadline: Optional caller budget
+
+        Returns:
+            Raw Gemini response
+        """
+        with stage("llm"):
+            return self.resilience.call(
+                lambda timeout: self.model.generate_content(
+                    prompt,
+                    request_options={"timeout": timeout}
+                ),
+                deadline=deadline
+            )
+
     def analyze_resume(
         self,
         resume_text: str,
-        job_description: str
+        job_description: str,
+        deadline: Optional[Deadline] = None
     ) -> Dict[str, any]:
         """
         Analyze resume against job description using Gemini AI
@@ -53,6 +200,7 @@ class GeminiService:
         Args:
             resume_text: Full text of the resume
             job_description: Job description or requirements
+            deadline: Optional time budget for the model call, retries included
 
         Returns:
             Dict with fit score, suggestions, and improvement areas
@@ -76,7 +224,7 @@ class GeminiService:
             log_info("Sending analysis request to Gemini AI")
             
             # Generate response from Gemini
-            response = self.model.generate_content(prompt)
+            response = self._generate(prompt, deadline)
             
             # Parse the response
             analysis = self._parse_gemini_response(response.text)
@@ -88,6 +236,19 @@ class GeminiService:
                 "analysis": analysis
             }
 
+        except CircuitOpenError as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "circuit_open": True
+            }
+        except DeadlineExceeded as e:
+            log_error("Gemini analysis exceeded its deadline", e)
+            return {
+                "success": False,
+                "error": str(e),
+                "deadline_exceeded": True
+            }
         except Exception as e:
             log_error("Error in Gemini analysis", e)
             return {
@@ -231,7 +392,8 @@ Focus on:
         self,
         resume_text: str,
         job_description: str,
-        num_questions: int = 5
+        num_questions: int = 5,
+        deadline: Optional[Deadline] = None
     ) -> Dict[str, any]:
         """
         Generate interview questions based on resume and job description
@@ -240,6 +402,7 @@ Focus on:
             resume_text: Resume content
             job_description: Job requirements
             num_questions: Number of questions to generate
+            deadline: Optional time budget for the model call, retries included
 
         Returns:
             Dict with generated questions
@@ -270,7 +433,7 @@ Format as JSON array:
 ["Question 1", "Question 2", ...]
 """
 
-            response = self.model.generate_content(prompt)
+            response = self._generate(prompt, deadline)
             questions = json.loads(response.text.strip())
 
             return {
@@ -278,6 +441,19 @@ Format as JSON array:
                 "questions": questions
             }
 
+        except CircuitOpenError as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "circuit_open": True
+            }
+        except DeadlineExceeded as e:
+            log_error("Interview question generation exceeded its deadline", e)
+            return {
+                "success": False,
+                "error": str(e),
+                "deadline_exceeded": True
+            }
         except Exception as e:
             log_error("Error generating interview questions", e)
             return {
@@ -288,3 +464,28 @@ Format as JSON array:
 
 # Create singleton instance
 gemini_service = GeminiService()
+
+
+def _collect_llm_metrics():
+    """Breaker state and call counters for /metrics"""
+    stats = gemini_service.get_stats()
+    breaker = stats["breaker"]
+    for state in ("closed", "open", "half_open"):
+        yield "hiresight_llm_breaker_state", {"state": state}, 1.0 if breaker["state"] == state else 0.0
+    yield "hiresight_llm_breaker_times_opened_total", {}, breaker["times_opened"]
+    for counter, value in stats["counters"].items():
+        yield "hiresight_llm_calls_total", {"outcome": counter}, value
+
+
+registry.register_collector(
+    _collect_llm_metrics,
+    help_texts={
+        "hiresight_llm_breaker_state": "1 for the current LLM circuit breaker state",
+        "hiresight_llm_breaker_times_opened_total": "Times the LLM breaker has opened",
+        "hiresight_llm_calls_total": "LLM call counters (calls, retries, hedges, timeouts, ...)"
+    },
+    types={
+        "hiresight_llm_breaker_times_opened_total": "counter",
+        "hiresight_llm_calls_total": "counter"
+    }
+)
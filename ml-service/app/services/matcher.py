@@ -1,5 +1,7 @@
-from typing import List, Dict, Set
-from app.utils.logger import log_info, log_error
+from typing import List, Dict, Set, Tuple
+from app.services.skill_extractor import skill_extractor
+from app.utils.logger import log_debug, log_info, log_error
+from app.utils.timing import timed
 
 
 class Matcher:
@@ -11,6 +13,7 @@ class Matcher:
     def __init__(self):
         pass
 
+    @timed("match")
     def calculate_match(
         self,
         resume_skills: List[str],
@@ -25,6 +28,41 @@ class Matcher:
             job_description: Job description text (optional if job_skills provided)
             job_skills: List of required skills (optional if job_description provided)
 
+        Returns:
+            Dict with match score and details
+        """
+        return self._calculate_match(resume_skills, job_description, job_skills)
+
+    def _expand_skills(self, skills: List[str]) -> Tuple[Set[str], Dict[str, List[str]]]:
+        """
+        Canonicalize a resume's skills and add the skills they imply
+
+        Args:
+            skills: Skills as given
+
+        Returns:
+            (canonical skills, implied skill -> skills implying it)
+        """
+        taxonomy = skill_extractor.taxonomy
+        canonical = taxonomy.canonicalize_all(skills)
+        return canonical, taxonomy.implied(canonical)
+
+    def _calculate_match(
+        self,
+        resume_skills: List[str],
+        job_description: str = None,
+        job_skills: List[str] = None,
+        expanded: Tuple[Set[str], Dict[str, List[str]]] = None
+    ) -> Dict[str, any]:
+        """
+        Un-instrumented match calculation shared by calculate_match and batch_match
+
+        Args:
+            resume_skills: List of skills from resume
+            job_description: Job description text (optional if job_skills provided)
+            job_skills: List of required skills (optional if job_description provided)
+            expanded: _expand_skills(resume_skills), when already computed
+
         Returns:
             Dict with match score and details
         """
@@ -45,7 +83,6 @@ class Matcher:
                         "match_score": 0
                     }
                 # Extract skills from job description
-                from app.services.skill_extractor import skill_extractor
                 extraction_result = skill_extractor.extract_skills(job_description)
                 if not extraction_result.get("success"):
                     return {
@@ -55,13 +92,17 @@ class Matcher:
                     }
                 job_skills = extraction_result.get("skills", [])
 
-            # Normalize to lowercase for comparison
-            resume_skills_set = set(skill.lower() for skill in resume_skills)
-            job_skills_set = set(skill.lower() for skill in job_skills)
-
-            # Calculate matches
-            matched_skills = resume_skills_set.intersection(job_skills_set)
-            missing_skills = job_skills_set.difference(resume_skills_set)
+            # Normalize to canonical names for comparison; aliases ("ReactJS",
+            # "Postgres") compare as their canonical skill
+            resume_skills_set, implied = expanded or self._expand_skills(resume_skills)
+            job_skills_set = skill_extractor.taxonomy.canonicalize_all(job_skills)
+
+            # Calculate matches; implied skills ("django" -> "python") count
+            # as held but are not extra skills of the resume
+            matched_skills = job_skills_set.intersection(resume_skills_set)
+            implied_matches = {skill: implied[skill] for skill in job_skills_set if skill in implied}
+            matched_skills.update(implied_matches)
+            missing_skills = job_skills_set.difference(matched_skills)
             extra_skills = resume_skills_set.difference(job_skills_set)
 
             # Calculate match score
@@ -82,19 +123,24 @@ class Matcher:
                 "match_score": round(match_score, 2),
                 "confidence": confidence,
                 "matched_skills": sorted(list(matched_skills)),
+                "implied_matches": dict(sorted(implied_matches.items())),
                 "missing_skills": sorted(list(missing_skills)),
                 "extra_skills": sorted(list(extra_skills)),
                 "statistics": {
                     "total_job_requirements": len(job_skills_set),
                     "total_resume_skills": len(resume_skills_set),
                     "matched_count": len(matched_skills),
+                    "implied_match_count": len(implied_matches),
                     "missing_count": len(missing_skills),
                     "extra_count": len(extra_skills)
                 },
                 "recommendation": self._get_recommendation(match_score)
             }
 
-            log_info(f"Match calculated: {match_score:.2f}% with {len(matched_skills)} matched skills")
+            log_debug("Match calculated", {
+                "match_score": round(match_score, 2),
+                "matched_count": len(matched_skills)
+            })
             return result
 
         except Exception as e:
@@ -105,6 +151,7 @@ class Matcher:
                 "match_score": 0
             }
 
+    @timed("batch_match")
     def batch_match(
         self,
         resume_skills: List[str],
@@ -135,16 +182,19 @@ class Matcher:
                     "matches": []
                 }
 
+            # The resume's skills are expanded once for all listings
+            expanded = self._expand_skills(resume_skills)
             matches = []
             for idx, job in enumerate(job_listings):
                 job_title = job.get("title", f"Job {idx + 1}")
                 job_skills = job.get("skills")
                 job_description = job.get("description")
 
-                match_result = self.calculate_match(
+                match_result = self._calculate_match(
                     resume_skills=resume_skills,
                     job_description=job_description,
-                    job_skills=job_skills
+                    job_skills=job_skills,
+                    expanded=expanded
                 )
 
                 if match_result.get("success"):
@@ -152,6 +202,7 @@ class Matcher:
                         "job_title": job_title,
                         "match_score": match_result["match_score"],
                         "matched_skills": match_result["matched_skills"],
+                        "implied_matches": match_result["implied_matches"],
                         "missing_skills": match_result["missing_skills"],
                         "recommendation": match_result["recommendation"]
                     })
@@ -248,17 +299,20 @@ class Matcher:
             Detailed gap analysis
         """
         try:
-            resume_set = set(skill.lower() for skill in resume_skills)
-            target_set = set(skill.lower() for skill in target_skills)
+            resume_set, implied = self._expand_skills(resume_skills)
+            target_set = skill_extractor.taxonomy.canonicalize_all(target_skills)
 
-            matched = resume_set.intersection(target_set)
-            gaps = target_set.difference(resume_set)
+            matched = target_set.intersection(resume_set)
+            implied_matches = {skill: implied[skill] for skill in target_set if skill in implied}
+            matched.update(implied_matches)
+            gaps = target_set.difference(matched)
 
             return {
                 "success": True,
                 "current_skills": sorted(list(resume_set)),
                 "target_skills": sorted(list(target_set)),
                 "skills_achieved": sorted(list(matched)),
+                "implied_matches": dict(sorted(implied_matches.items())),
                 "skills_to_learn": sorted(list(gaps)),
                 "progress_percentage": round(
                     (len(matched) / len(target_set) * 100) if target_set else 0, 2
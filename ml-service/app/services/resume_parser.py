@@ -1,7 +1,8 @@
 import pdfplumber
 import re
 from typing import Dict, Optional
-from app.utils.logger import log_info, log_error
+from app.utils.logger import log_debug, log_error
+from app.utils.timing import stage
 
 
 class ResumeParser:
@@ -24,9 +25,11 @@ class ResumeParser:
             Dict containing extracted text and metadata
         """
         try:
-            log_info(f"Parsing PDF: {pdf_path}")
-            text = self._extract_text_from_pdf(pdf_path)
-            cleaned_text = self._clean_text(text)
+            log_debug("Parsing PDF", {"path": str(pdf_path)})
+            with stage("pdf_extract"):
+                text = self._extract_text_from_pdf(pdf_path)
+            with stage("clean_text"):
+                cleaned_text = self._clean_text(text)
 
             result = {
                 "success": True,
@@ -36,7 +39,7 @@ class ResumeParser:
                 "word_count": len(cleaned_text.split())
             }
             
-            log_info("PDF parsed successfully", {
+            log_debug("PDF parsed successfully", {
                 "word_count": result["word_count"],
                 "char_count": result["char_count"]
             })
@@ -64,6 +67,9 @@ class ResumeParser:
         with pdfplumber.open(pdf_path) as pdf:
             for page in pdf.pages:
                 page_text = page.extract_text()
+                # Release the page's parsed objects now rather than when the
+                # whole document closes
+                page.close()
                 if page_text:
                     text += page_text + "\n"
         return text
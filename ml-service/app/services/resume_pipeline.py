@@ -0,0 +1,163 @@
+"""
+Resume processing pipelines shared by the HTTP endpoints and the job queue
+
+The synchronous functions are module-level so they can run on thread pools
+as well as in worker processes (they are pickled by reference).
+"""
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Optional, Union
+
+from app.services.resume_parser import resume_parser
+from app.services.skill_extractor import skill_extractor
+from app.services.matcher import matcher
+from app.services.gemini_service import gemini_service
+from app.utils.executors import run_cpu, run_llm
+from app.utils.resilience import Deadline
+
+# Stages of the complete analysis, in order
+ANALYSIS_STAGES = ("parse", "extract_skills", "ai_analysis", "match")
+
+StageCallback = Callable[[str, str], Awaitable[None]]
+
+
+def parse_and_extract_file(pdf_path: Union[str, Path]) -> Dict[str, any]:
+    """
+    Parse a PDF and extract its skills
+
+    Args:
+        pdf_path: Path to the PDF file
+
+    Returns:
+        Dict with success and data (text, counts, skills), or success False and error
+    """
+    parse_result = resume_parser.parse_pdf(str(pdf_path))
+    if not parse_result.get("success"):
+        return {
+            "success": False,
+            "error": f"Failed to parse resume: {parse_result.get('error')}"
+        }
+
+    skill_result = skill_extractor.extract_skills(parse_result["text"])
+    return {
+        "success": True,
+        "data": {
+            "text": parse_result["text"],
+            "char_count": parse_result["char_count"],
+            "word_count": parse_result["word_count"],
+            "skills": skill_result.get("skills", []),
+            "skill_count": skill_result.get("skill_count", 0),
+            "categorized_skills": skill_result.get("categorized_skills", {}),
+            "matched_forms": skill_result.get("matched_forms", {}),
+            "extraction_methods": skill_result.get("extraction_methods", {})
+        }
+    }
+
+
+def llm_failure_reason(result: Dict) -> str:
+    """Short machine-readable reason for a failed LLM step"""
+    if result.get("circuit_open"):
+        return "circuit_open"
+    if result.get("deadline_exceeded"):
+        return "deadline_exceeded"
+    if result.get("not_configured"):
+        return "not_configured"
+    return "error"
+
+
+async def run_complete_analysis(
+    pdf_path: Union[str, Path],
+    job_description: str,
+    deadline: Deadline,
+    on_stage: Optional[StageCallback] = None
+) -> Dict[str, any]:
+    """
+    Parse → extract skills → Gemini analysis → match
+
+    Args:
+        pdf_path: Path to the resume PDF
+        job_description: Job description text
+        deadline: Budget for the LLM step
+        on_stage: Optional coroutine called with (stage, "running" | "done" | "skipped" | "failed")
+
+    Returns:
+        Dict with success and data (resume, skills, match, ai_analysis),
+        or success False and error if the PDF could not be parsed
+    """
+    async def report(stage: str, status: str):
+        if on_stage is not None:
+            await on_stage(stage, status)
+
+    # Step 1: Parse the PDF
+    await report("parse", "running")
+    parse_result = await run_cpu(resume_parser.parse_pdf, str(pdf_path))
+    if not parse_result.get("success"):
+        await report("parse", "failed")
+        return {
+            "success": False,
+            "error": f"Failed to parse resume: {parse_result.get('error')}"
+        }
+    await report("parse", "done")
+    resume_text = parse_result["text"]
+
+    # Step 2: Extract skills
+    await report("extract_skills", "running")
+    skill_result = await run_cpu(skill_extractor.extract_skills, resume_text)
+    await report("extract_skills", "done" if skill_result.get("success") else "failed")
+
+    # Step 3: Get Gemini analysis (skipped outright while the breaker is open)
+    if gemini_service.is_available():
+        await report("ai_analysis", "running")
+        gemini_result = await run_llm(
+            gemini_service.analyze_resume,
+            resume_text=resume_text,
+            job_description=job_description,
+            deadline=deadline
+        )
+        await report("ai_analysis", "done" if gemini_result.get("success") else "failed")
+    else:
+        if gemini_service.model is None:
+            gemini_result = {"success": False, "not_configured": True}
+        else:
+            gemini_result = {"success": False, "circuit_open": True}
+        await report("ai_analysis", "skipped")
+
+    # Step 4: Calculate match score
+    if skill_result.get("success"):
+        await report("match", "running")
+        match_result = await run_cpu(
+            matcher.calculate_match,
+            resume_skills=skill_result.get("skills", []),
+            job_description=job_description
+        )
+        await report("match", "done" if match_result.get("success") else "failed")
+    else:
+        match_result = {"success": False}
+        await report("match", "skipped")
+
+    return {
+        "success": True,
+        "data": {
+            "resume": {
+                "text": resume_text,
+                "char_count": parse_result["char_count"],
+                "word_count": parse_result["word_count"]
+            },
+            "skills": {
+                "extracted": skill_result.get("skills", []),
+                "count": skill_result.get("skill_count", 0),
+                "categorized": skill_result.get("categorized_skills", {}),
+                "matched_forms": skill_result.get("matched_forms", {}),
+                "extraction_methods": skill_result.get("extraction_methods", {})
+            },
+            "match": {
+                "score": match_result.get("match_score", 0) if match_result.get("success") else 0,
+                "matched_skills": match_result.get("matched_skills", []) if match_result.get("success") else [],
+                "implied_matches": match_result.get("implied_matches", {}) if match_result.get("success") else {},
+                "missing_skills": match_result.get("missing_skills", []) if match_result.get("success") else []
+            },
+            "ai_analysis": gemini_result.get("analysis", {}) if gemini_result.get("success") else {
+                "error": "AI analysis unavailable",
+                "reason": llm_failure_reason(gemini_result)
+            }
+        }
+    }
@@ -1,8 +1,12 @@
 import json
-import re
+import os
 from pathlib import Path
-from typing import List, Dict, Set
-from app.utils.logger import log_info, log_error
+from typing import List, Dict, Optional, Set
+from app.utils.degradation import FULL, KEYWORD_ONLY, extraction_policy
+from app.utils.logger import log_debug, log_info, log_error
+from app.utils.nlp_batcher import NLP_BATCH_ENABLED, NlpBatcher, register_batcher_metrics
+from app.utils.skill_taxonomy import SkillTaxonomy
+from app.utils.timing import registry, stage
 
 try:
     import spacy
@@ -16,6 +20,9 @@ class SkillExtractor:
     """
     Skill Extraction Service
     Extracts skills from resume text using spaCy NLP and keyword matching
+
+    Skills are returned by canonical (lowercase) name; aliases from
+    skills.json resolve to their canonical skill during matching.
     """
 
     def __init__(self, skills_json_path: str = None):
@@ -26,11 +33,14 @@ class SkillExtractor:
             skills_json_path: Path to skills.json file
         """
         if skills_json_path is None:
-            # Default path relative to project root
-            skills_json_path = Path(__file__).parent.parent.parent.parent / "data" / "skills.json"
+            # SKILLS_JSON_PATH, else the default path relative to project root
+            skills_json_path = os.getenv("SKILLS_JSON_PATH") or (
+                Path(__file__).parent.parent.parent.parent / "data" / "skills.json"
+            )
         
-        self.skills_data = self._load_skills(skills_json_path)
-        self.all_skills = self._flatten_skills()
+        self.taxonomy = SkillTaxonomy(self._load_skills(skills_json_path))
+        self.skills_data = self.taxonomy.categories
+        self.all_skills = self.taxonomy.canonical
         
         # Load spaCy model if available
         self.nlp = None
@@ -42,6 +52,12 @@ class SkillExtractor:
                 log_error("spaCy model not found. Run: python -m spacy download en_core_web_sm")
                 self.nlp = None
 
+        # Concurrent callers share nlp.pipe runs through the micro-batcher
+        self.batcher = None
+        if self.nlp is not None and NLP_BATCH_ENABLED:
+            self.batcher = NlpBatcher(self.nlp)
+            register_batcher_metrics(self.batcher)
+
     def _load_skills(self, skills_path: Path) -> Dict:
         """
         Load skills from JSON file
@@ -50,7 +66,7 @@ class SkillExtractor:
             skills_path: Path to skills.json
 
         Returns:
-            Dict of skills by category
+            Dict of skills by category (names or {"name", "aliases"} objects)
         """
         try:
             with open(skills_path, 'r', encoding='utf-8') as f:
@@ -61,25 +77,16 @@ class SkillExtractor:
             log_error(f"Error loading skills from {skills_path}", e)
             return {}
 
-    def _flatten_skills(self) -> Set[str]:
-        """
-        Flatten all skills into a single set (lowercase for matching)
-
-        Returns:
-            Set of all skills in lowercase
-        """
-        all_skills = set()
-        for category, skills in self.skills_data.items():
-            for skill in skills:
-                all_skills.add(skill.lower())
-        return all_skills
-
-    def extract_skills(self, text: str) -> Dict[str, any]:
+    def extract_skills(self, text: str, mode: Optional[str] = None) -> Dict[str, any]:
         """
         Extract skills from text using multiple methods
 
+        Under load the spaCy pass is skipped (see app.utils.degradation);
+        extraction_methods reports the mode that ran.
+
         Args:
             text: Resume or job description text
+            mode: Force "full" or "keyword_only" (default: adaptive policy)
 
         Returns:
             Dict with extracted skills and metadata
@@ -93,15 +100,28 @@ class SkillExtractor:
                 }
 
             # Method 1: Keyword matching
-            keyword_skills = self._extract_by_keywords(text)
+            with stage("keyword_scan"):
+                keyword_skills = self._extract_by_keywords(text)
 
-            # Method 2: NLP-based extraction (if spaCy available)
+            # Method 2: NLP-based extraction (if spaCy available and not shed)
             nlp_skills = set()
-            if self.nlp:
-                nlp_skills = self._extract_by_nlp(text)
+            skipped_reason = None
+            if not self.nlp:
+                skipped_reason = "unavailable"
+            elif (mode or extraction_policy.current_mode()) == KEYWORD_ONLY:
+                skipped_reason = "load" if mode is None else "requested"
+            else:
+                with stage("spacy"):
+                    nlp_skills = self._extract_by_nlp(text)
+            ran_mode = FULL if skipped_reason is None else KEYWORD_ONLY
+            registry.inc(
+                "hiresight_extraction_mode_total",
+                (("mode", ran_mode),),
+                help_text="Skill extractions by the methods that ran"
+            )
 
             # Combine results (union of both methods)
-            all_extracted = keyword_skills.union(nlp_skills)
+            all_extracted = set(keyword_skills).union(nlp_skills)
 
             # Categorize extracted skills
             categorized = self._categorize_skills(all_extracted)
@@ -111,13 +131,16 @@ class SkillExtractor:
                 "skills": sorted(list(all_extracted)),
                 "skill_count": len(all_extracted),
                 "categorized_skills": categorized,
+                "matched_forms": keyword_skills,
                 "extraction_methods": {
                     "keyword_matching": len(keyword_skills),
-                    "nlp_extraction": len(nlp_skills) if self.nlp else 0
+                    "nlp_extraction": len(nlp_skills),
+                    "mode": ran_mode,
+                    "nlp_skipped": skipped_reason
                 }
             }
 
-            log_info(f"Extracted {len(all_extracted)} skills from text")
+            log_debug("Skills extracted", {"skill_count": len(all_extracted)})
             return result
 
         except Exception as e:
@@ -128,37 +151,20 @@ class SkillExtractor:
                 "skills": []
             }
 
-    def _extract_by_keywords(self, text: str) -> Set[str]:
+    def _extract_by_keywords(self, text: str) -> Dict[str, List[str]]:
         """
         Extract skills using keyword matching
 
+        One pass over the text's tokens against the compiled taxonomy;
+        aliases resolve to their canonical skill in the same lookup.
+
         Args:
             text: Text to search
 
         Returns:
-            Set of found skills
+            Canonical skill -> surface forms found in the text
         """
-        found_skills = set()
-        text_lower = text.lower()
-
-        # Split text into words and phrases
-        words = re.findall(r'\b\w+\b', text_lower)
-        text_phrases = text_lower
-
-        # Check each skill in our database
-        for skill in self.all_skills:
-            skill_lower = skill.lower()
-            
-            # For single-word skills
-            if ' ' not in skill_lower:
-                if skill_lower in words:
-                    found_skills.add(skill)
-            # For multi-word skills
-            else:
-                if skill_lower in text_phrases:
-                    found_skills.add(skill)
-
-        return found_skills
+        return self.taxonomy.match(text)
 
     def _extract_by_nlp(self, text: str) -> Set[str]:
         """
@@ -174,7 +180,7 @@ class SkillExtractor:
             return set()
 
         found_skills = set()
-        doc = self.nlp(text)
+        doc = self.batcher(text) if self.batcher is not None else self.nlp(text)
 
         # Extract noun phrases and named entities
         candidates = set()
@@ -188,10 +194,11 @@ class SkillExtractor:
             if ent.label_ in ['ORG', 'PRODUCT', 'GPE', 'LANGUAGE']:
                 candidates.add(ent.text.lower())
 
-        # Match candidates against our skills database
+        # Match candidates (names or aliases) against our skills database
         for candidate in candidates:
-            if candidate in self.all_skills:
-                found_skills.add(candidate)
+            skill = self.taxonomy.resolve(candidate)
+            if skill is not None:
+                found_skills.add(skill)
 
         return found_skills
 
@@ -230,22 +237,15 @@ class SkillExtractor:
 
     def search_skills(self, query: str) -> List[str]:
         """
-        Search for skills matching a query
+        Search for skills whose name or an alias contains a query
 
         Args:
             query: Search term
 
         Returns:
-            List of matching skills
+            List of matching canonical skills
         """
-        query_lower = query.lower()
-        matches = []
-        
-        for skill in self.all_skills:
-            if query_lower in skill.lower():
-                matches.append(skill)
-        
-        return sorted(matches)
+        return self.taxonomy.search(query)
 
 
 # Create singleton instance
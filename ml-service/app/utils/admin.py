@@ -0,0 +1,28 @@
+"""
+Access control for the /admin diagnostics endpoints
+
+Admin endpoints expose profiles and memory internals and can change
+runtime behaviour, so they require the shared secret in ADMIN_TOKEN sent
+as the ``X-Admin-Token`` header. Without ADMIN_TOKEN they are disabled.
+"""
+import hmac
+import os
+from typing import Optional
+
+from fastapi import Header, HTTPException
+
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """
+    FastAPI dependency rejecting requests without the admin token
+
+    Raises:
+        HTTPException: 404 if admin endpoints are disabled, 401 on a missing
+            or wrong token
+    """
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Admin endpoints are disabled (set ADMIN_TOKEN)")
+    if not x_admin_token or not hmac.compare_digest(x_admin_token.encode(), ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
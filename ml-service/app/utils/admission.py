@@ -0,0 +1,285 @@
+"""
+Admission control and load shedding per endpoint class
+
+Every request to a limited endpoint must take a slot in its class before
+it runs. A class admits up to ``max_concurrency`` requests, parks up to
+``max_queue`` more in FIFO order and rejects the rest straight away with
+429; a request that waits longer than ``queue_timeout`` gets 503. Both
+carry Retry-After, estimated from the class's recent service time.
+
+Classes are separate, so a saturated upload class does not slow the cheap
+lookups. Time spent waiting for a slot is recorded apart from service time
+(``hiresight_admission_wait_seconds`` vs ``hiresight_admission_service_seconds``)
+and shows up as an ``admission_wait`` stage in Server-Timing.
+"""
+import asyncio
+import math
+import os
+import time
+from collections import deque
+from typing import Dict, Optional, Tuple
+
+from app.utils.logger import log_warning
+from app.utils.responses import FastJSONResponse
+from app.utils.timing import record_stage, registry
+
+ADMISSION_ENABLED = os.getenv("ADMISSION_ENABLED", "true").lower() == "true"
+
+_CPUS = os.cpu_count() or 4
+
+# Defaults per class: (max_concurrency, max_queue, queue_timeout seconds)
+CLASS_DEFAULTS = {
+    # PDF uploads: pdfplumber, plus spaCy and the LLM for complete analysis
+    "upload": (max(2, _CPUS), max(4, _CPUS * 2), 10.0),
+    # spaCy extraction and bulk matching on request text
+    "nlp": (max(2, _CPUS), max(8, _CPUS * 4), 5.0),
+    # LLM calls, bounded by the provider rather than local CPU
+    "llm": (8, 16, 15.0),
+    # Cheap lookups: skill matching, taxonomy and dataset queries
+    "lookup": (256, 512, 1.0)
+}
+
+# Bounds for the Retry-After estimate, in seconds
+MIN_RETRY_AFTER = 1
+MAX_RETRY_AFTER = 60
+
+
+class Rejected(Exception):
+    """Raised when a request is shed instead of admitted"""
+
+    def __init__(self, status_code: int, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.status_code = status_code
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionLimiter:
+    """
+    Concurrency slots with a bounded FIFO wait queue for one endpoint class
+
+    Used from a single event loop, so no locking is needed.
+    """
+
+    def __init__(self, name: str, max_concurrency: int, max_queue: int, queue_timeout: float):
+        """
+        Args:
+            name: Class name used in metrics
+            max_concurrency: Requests served at once
+            max_queue: Requests allowed to wait for a slot (0 = reject when busy)
+            queue_timeout: Longest wait for a slot before 503
+        """
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self._waiters: deque = deque()
+        self.admitted = 0
+        self.rejected = {"queue_full": 0, "queue_timeout": 0}
+        # Smoothed service time, for Retry-After
+        self._service_seconds = 0.0
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def retry_after(self) -> int:
+        """Seconds until a slot is likely free for a new arrival"""
+        backlog = self.queued + 1
+        estimate = self._service_seconds * backlog / self.max_concurrency
+        return int(min(MAX_RETRY_AFTER, max(MIN_RETRY_AFTER, math.ceil(estimate))))
+
+    async def acquire(self) -> float:
+        """
+        Take a slot, waiting in line if all are busy
+
+        Returns:
+            Seconds spent waiting
+
+        Raises:
+            Rejected: Queue full (429) or waited past queue_timeout (503)
+        """
+        if self.active < self.max_concurrency and not self._waiters:
+            self.active += 1
+            self.admitted += 1
+            return 0.0
+
+        if len(self._waiters) >= self.max_queue:
+            self.rejected["queue_full"] += 1
+            raise Rejected(429, "queue_full", self.retry_after())
+
+        started = time.perf_counter()
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.queue_timeout)
+        except asyncio.TimeoutError:
+            if not self._abandon(waiter):
+                # Handed a slot just as the timer fired: take it
+                self.admitted += 1
+                return time.perf_counter() - started
+            self.rejected["queue_timeout"] += 1
+            raise Rejected(503, "queue_timeout", self.retry_after())
+        except asyncio.CancelledError:
+            if not self._abandon(waiter):
+                self.release()
+            raise
+        self.admitted += 1
+        return time.perf_counter() - started
+
+    def release(self, service_seconds: Optional[float] = None):
+        """
+        Free a slot, handing it straight to the longest-waiting request
+
+        Args:
+            service_seconds: How long the finished request held the slot
+        """
+        if service_seconds is not None:
+            self._service_seconds = (
+                service_seconds if self._service_seconds == 0.0
+                else self._service_seconds * 0.8 + service_seconds * 0.2
+            )
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                # The slot passes to the waiter; active stays the same
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    def _abandon(self, waiter: asyncio.Future) -> bool:
+        """Drop a waiter that gave up; False if it was already given a slot"""
+        if waiter.done():
+            return False
+        waiter.cancel()
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+        return True
+
+    def stats(self) -> Dict[str, any]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "queue_timeout_seconds": self.queue_timeout,
+            "active": self.active,
+            "queued": self.queued,
+            "admitted": self.admitted,
+            "rejected": dict(self.rejected),
+            "avg_service_ms": round(self._service_seconds * 1000, 3)
+        }
+
+
+def _limiter_from_env(name: str) -> AdmissionLimiter:
+    concurrency, queue, timeout = CLASS_DEFAULTS[name]
+    prefix = f"ADMISSION_{name.upper()}"
+    return AdmissionLimiter(
+        name,
+        max_concurrency=max(1, int(os.getenv(f"{prefix}_CONCURRENCY", str(concurrency)))),
+        max_queue=max(0, int(os.getenv(f"{prefix}_QUEUE", str(queue)))),
+        queue_timeout=float(os.getenv(f"{prefix}_QUEUE_TIMEOUT", str(timeout)))
+    )
+
+
+limiters: Dict[str, AdmissionLimiter] = {name: _limiter_from_env(name) for name in CLASS_DEFAULTS}
+
+
+class AdmissionMiddleware:
+    """
+    ASGI middleware admitting requests by endpoint class
+
+    Args:
+        app: Wrapped ASGI app
+        routes: (method, path) -> class name for exact paths
+        prefixes: (method, path prefix, class name) for parametrised paths;
+            anything unmatched (health, metrics, docs, CORS preflight) is
+            never limited
+    """
+
+    def __init__(self, app, routes: Dict[Tuple[str, str], str], prefixes: Tuple[Tuple[str, str, str], ...] = ()):
+        self.app = app
+        self.routes = routes
+        self.prefixes = prefixes
+
+    def classify(self, method: str, path: str) -> Optional[str]:
+        endpoint_class = self.routes.get((method, path))
+        if endpoint_class is None:
+            for prefix_method, prefix, prefix_class in self.prefixes:
+                if method == prefix_method and path.startswith(prefix):
+                    return prefix_class
+        return endpoint_class
+
+    async def __call__(self, scope, receive, send):
+        if not ADMISSION_ENABLED or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        endpoint_class = self.classify(scope["method"], scope["path"])
+        if endpoint_class is None:
+            await self.app(scope, receive, send)
+            return
+
+        limiter = limiters[endpoint_class]
+        try:
+            waited = await limiter.acquire()
+        except Rejected as e:
+            registry.inc(
+                "hiresight_admission_rejected_total",
+                (("class", endpoint_class), ("reason", e.reason)),
+                help_text="Requests shed by admission control"
+            )
+            log_warning(f"Shed {scope['method']} {scope['path']}", {
+                "class": endpoint_class, "reason": e.reason, "retry_after": e.retry_after
+            })
+            response = FastJSONResponse(
+                status_code=e.status_code,
+                headers={"Retry-After": str(e.retry_after)},
+                content={"detail": f"Server busy ({endpoint_class} {e.reason.replace('_', ' ')}); retry later"}
+            )
+            await response(scope, receive, send)
+            return
+
+        if waited:
+            record_stage("admission_wait", waited)
+        registry.histogram(
+            "hiresight_admission_wait_seconds",
+            (("class", endpoint_class),),
+            "Time requests waited for an admission slot"
+        ).observe(waited)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            service = time.perf_counter() - started
+            limiter.release(service)
+            registry.histogram(
+                "hiresight_admission_service_seconds",
+                (("class", endpoint_class),),
+                "Time admitted requests held their slot"
+            ).observe(service)
+
+
+def get_admission_stats() -> Dict[str, Dict]:
+    """Slots, queue depth and rejections per endpoint class"""
+    return {name: limiter.stats() for name, limiter in limiters.items()}
+
+
+def _collect_admission_metrics():
+    """Admission gauges for /metrics"""
+    for name, limiter in limiters.items():
+        labels = {"class": name}
+        yield "hiresight_admission_active", labels, limiter.active
+        yield "hiresight_admission_queued", labels, limiter.queued
+        yield "hiresight_admission_max_concurrency", labels, limiter.max_concurrency
+
+
+registry.register_collector(
+    _collect_admission_metrics,
+    help_texts={
+        "hiresight_admission_active": "Requests holding an admission slot per endpoint class",
+        "hiresight_admission_queued": "Requests waiting for an admission slot per endpoint class",
+        "hiresight_admission_max_concurrency": "Configured admission slots per endpoint class"
+    }
+)
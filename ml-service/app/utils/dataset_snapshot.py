@@ -0,0 +1,185 @@
+"""
+Columnar snapshots of the HireSight AI datasets
+
+Converts job_title_des.csv and Resume.csv to Arrow IPC (Feather v2) files
+that can be memory-mapped instead of parsed. Strings are stored as offsets
+plus one data buffer, so opening a snapshot costs a few page faults and the
+pages are shared by every worker process through the OS page cache.
+
+Usage:
+    python -m app.utils.dataset_snapshot
+"""
+
+import os
+from pathlib import Path
+from typing import List, Optional
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+SNAPSHOT_SUFFIX = '.arrow'
+
+# Schema metadata key recording which CSV a snapshot was built from
+SOURCE_SIGNATURE_KEY = b'hiresight.source_signature'
+
+
+def snapshot_path_for(csv_path: Path) -> Path:
+    """
+    Location of the snapshot for a CSV (same directory, .arrow suffix).
+
+    Args:
+        csv_path: CSV file path
+
+    Returns:
+        Snapshot path
+    """
+    return Path(csv_path).with_suffix(SNAPSHOT_SUFFIX)
+
+
+def _source_signature(csv_path: Path) -> Optional[bytes]:
+    try:
+        stat = os.stat(csv_path)
+    except OSError:
+        return None
+    return f"{stat.st_mtime_ns}:{stat.st_size}".encode()
+
+
+def is_snapshot_fresh(snapshot_path: Path, csv_path: Path) -> bool:
+    """
+    Check whether a snapshot can be used in place of its CSV.
+
+    A snapshot is fresh when it exists and either the CSV is gone or the
+    CSV still has the mtime and size recorded at conversion time.
+
+    Args:
+        snapshot_path: Snapshot file
+        csv_path: Source CSV
+
+    Returns:
+        True if the snapshot should be read
+    """
+    if not PYARROW_AVAILABLE or not Path(snapshot_path).exists():
+        return False
+    current = _source_signature(csv_path)
+    if current is None:
+        return True
+    try:
+        with pa.memory_map(str(snapshot_path), 'r') as source:
+            metadata = pa.ipc.open_file(source).schema.metadata or {}
+    except Exception:
+        return False
+    return metadata.get(SOURCE_SIGNATURE_KEY) == current
+
+
+def open_snapshot(snapshot_path: Path, columns: Optional[List[str]] = None) -> 'pa.Table':
+    """
+    Memory-map a snapshot and project the requested columns.
+
+    No column data is copied; buffers of unrequested columns are never read.
+
+    Args:
+        snapshot_path: Snapshot file
+        columns: Column names to keep (None keeps all)
+
+    Returns:
+        pyarrow Table backed by the mapped file
+    """
+    source = pa.memory_map(str(snapshot_path), 'r')
+    table = pa.ipc.open_file(source).read_all()
+    if columns is not None:
+        table = table.select(columns)
+    return table
+
+
+def snapshot_row_count(snapshot_path: Path) -> int:
+    """
+    Count rows from record batch headers only.
+
+    Args:
+        snapshot_path: Snapshot file
+
+    Returns:
+        Number of rows
+    """
+    with pa.memory_map(str(snapshot_path), 'r') as source:
+        reader = pa.ipc.open_file(source)
+        return sum(reader.get_batch(i).num_rows for i in range(reader.num_record_batches))
+
+
+def write_snapshot(
+    csv_path: Path,
+    snapshot_path: Optional[Path] = None,
+    dictionary_columns: Optional[List[str]] = None
+) -> Path:
+    """
+    Convert a CSV to an uncompressed Arrow IPC file.
+
+    Strings become ``large_string`` (int64 offsets + data buffer); columns in
+    ``dictionary_columns`` are dictionary-encoded with int32 indices. The file
+    is written next to the target and renamed into place so readers never
+    see a partial snapshot.
+
+    Args:
+        csv_path: Source CSV
+        snapshot_path: Output path (defaults to snapshot_path_for(csv_path))
+        dictionary_columns: Low-cardinality string columns to dictionary-encode
+
+    Returns:
+        Path of the written snapshot
+    """
+    if not PYARROW_AVAILABLE:
+        raise RuntimeError("pyarrow is required to write snapshots. Install with: pip install pyarrow")
+
+    csv_path = Path(csv_path)
+    snapshot_path = Path(snapshot_path) if snapshot_path else snapshot_path_for(csv_path)
+    signature = _source_signature(csv_path)
+
+    df = pd.read_csv(csv_path, dtype=str, keep_default_na=False)
+    df = df[[column for column in df.columns if column and not column.startswith('Unnamed')]]
+
+    fields, arrays = [], []
+    for column in df.columns:
+        array = pa.array(df[column].tolist(), type=pa.large_string())
+        if dictionary_columns and column in dictionary_columns:
+            array = array.dictionary_encode().cast(pa.dictionary(pa.int32(), pa.large_string()))
+        fields.append(pa.field(column, array.type, nullable=False))
+        arrays.append(array)
+
+    schema = pa.schema(fields, metadata={SOURCE_SIGNATURE_KEY: signature or b''})
+    table = pa.Table.from_arrays(arrays, schema=schema)
+
+    tmp_path = snapshot_path.with_name(snapshot_path.name + '.tmp')
+    with pa.OSFile(str(tmp_path), 'wb') as sink:
+        with pa.ipc.new_file(sink, schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, snapshot_path)
+    return snapshot_path
+
+
+def write_all_snapshots() -> List[Path]:
+    """
+    Convert every known dataset CSV that exists on disk.
+
+    Returns:
+        Paths of written snapshots
+    """
+    from app.utils.dataset_utils import JOB_DESCRIPTIONS_FILE, RESUME_CSV_FILE
+    from app.utils.dataset_store import JOB_TITLE_COLUMN
+
+    written = []
+    if JOB_DESCRIPTIONS_FILE.exists():
+        written.append(write_snapshot(JOB_DESCRIPTIONS_FILE, dictionary_columns=[JOB_TITLE_COLUMN]))
+    if RESUME_CSV_FILE.exists():
+        written.append(write_snapshot(RESUME_CSV_FILE, dictionary_columns=['Category']))
+    return written
+
+
+if __name__ == '__main__':
+    for path in write_all_snapshots():
+        print(f"Wrote {path} ({path.stat().st_size / 1e6:.1f} MB)")
@@ -0,0 +1,404 @@
+"""
+Memory-resident dataset store for HireSight AI
+
+Loads the job and resume CSVs once, keeps them in compact typed columns and
+reloads a file only when its mtime or size changes.
+"""
+
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Generic, Optional, Sequence, TypeVar
+
+import numpy as np
+import pandas as pd
+
+from app.utils.logger import log_error
+from app.utils.timing import stage
+from app.utils.dataset_snapshot import (
+    is_snapshot_fresh,
+    open_snapshot,
+    snapshot_path_for,
+    snapshot_row_count
+)
+
+T = TypeVar('T')
+
+JOB_TITLE_COLUMN = 'Job Title'
+JOB_DESCRIPTION_COLUMN = 'Job Description'
+
+
+class StringColumn:
+    """
+    Immutable column of strings stored as one UTF-8 buffer plus offsets.
+
+    Holds two objects regardless of row count, so it is far smaller than a
+    list of Python strings and its pages are never touched by refcounting.
+    The buffer may be a memory-mapped Arrow buffer.
+    """
+
+    def __init__(self, buffer, offsets: np.ndarray):
+        """
+        Args:
+            buffer: Concatenated UTF-8 bytes of every value (bytes or memoryview)
+            offsets: int64 array of length n + 1 with value boundaries
+        """
+        self._buffer = buffer
+        self._offsets = offsets
+
+    @classmethod
+    def from_strings(cls, values: Sequence[str]) -> 'StringColumn':
+        """
+        Build a column from Python strings.
+
+        Args:
+            values: Strings to store
+
+        Returns:
+            StringColumn
+        """
+        encoded = [value.encode('utf-8') for value in values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        if encoded:
+            np.cumsum([len(item) for item in encoded], out=offsets[1:])
+        return cls(b''.join(encoded), offsets)
+
+    @classmethod
+    def from_arrow(cls, array) -> 'StringColumn':
+        """
+        Wrap a pyarrow large_string array without copying.
+
+        Args:
+            array: pyarrow.LargeStringArray
+
+        Returns:
+            StringColumn sharing the array's buffers
+        """
+        _, offsets_buffer, data_buffer = array.buffers()
+        offsets = np.frombuffer(offsets_buffer, dtype=np.int64)[array.offset:array.offset + len(array) + 1]
+        return cls(memoryview(data_buffer) if data_buffer is not None else b'', offsets)
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        start, end = self._offsets[index], self._offsets[index + 1]
+        return str(self._buffer[start:end], 'utf-8')
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def lengths(self) -> np.ndarray:
+        """Byte length of every value."""
+        return np.diff(self._offsets)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the column."""
+        return len(self._buffer) + self._offsets.nbytes
+
+
+class JobTable:
+    """
+    Job descriptions held as typed columns.
+
+    Titles are dictionary-encoded (int32 codes into the unique titles, in
+    order of first appearance); descriptions are a StringColumn.
+    """
+
+    def __init__(self, title_codes: np.ndarray, unique_titles: StringColumn, descriptions: StringColumn):
+        self.title_codes = title_codes
+        self.unique_titles = unique_titles
+        self.descriptions = descriptions
+        self._title_lookup = None
+        self._derived = {}
+        self._lock = threading.Lock()
+        self._backing = None
+
+    @classmethod
+    def from_csv(cls, path: Path) -> 'JobTable':
+        """
+        Parse the job description CSV.
+
+        Args:
+            path: Path to job_title_des.csv
+
+        Returns:
+            JobTable
+        """
+        df = pd.read_csv(
+            path,
+            usecols=[JOB_TITLE_COLUMN, JOB_DESCRIPTION_COLUMN],
+            dtype=str,
+            keep_default_na=False
+        )
+        return cls.from_values(df[JOB_TITLE_COLUMN].tolist(), df[JOB_DESCRIPTION_COLUMN].tolist())
+
+    @classmethod
+    def from_snapshot(cls, path: Path) -> 'JobTable':
+        """
+        Memory-map an Arrow snapshot written by dataset_snapshot.
+
+        Only the title and description columns are projected, and none of
+        their buffers are copied.
+
+        Args:
+            path: Path to job_title_des.arrow
+
+        Returns:
+            JobTable backed by the mapped file
+        """
+        table = open_snapshot(path, columns=[JOB_TITLE_COLUMN, JOB_DESCRIPTION_COLUMN])
+        titles = table.column(JOB_TITLE_COLUMN).combine_chunks()
+        descriptions = table.column(JOB_DESCRIPTION_COLUMN).combine_chunks()
+        job_table = cls(
+            title_codes=np.frombuffer(titles.indices.buffers()[1], dtype=np.int32)[
+                titles.indices.offset:titles.indices.offset + len(titles)
+            ],
+            unique_titles=StringColumn.from_arrow(titles.dictionary),
+            descriptions=StringColumn.from_arrow(descriptions)
+        )
+        # Keep the mapping alive for as long as the columns reference it
+        job_table._backing = table
+        return job_table
+
+    @classmethod
+    def from_values(cls, titles: Sequence[str], descriptions: Sequence[str]) -> 'JobTable':
+        """
+        Build a table from parallel title and description sequences.
+
+        Returns:
+            JobTable
+        """
+        codes, uniques = pd.factorize(pd.Series(titles, dtype=object), sort=False)
+        return cls(
+            title_codes=codes.astype(np.int32),
+            unique_titles=StringColumn.from_strings(list(uniques)),
+            descriptions=StringColumn.from_strings(descriptions)
+        )
+
+    def __len__(self) -> int:
+        return len(self.title_codes)
+
+    def title(self, row: int) -> str:
+        return self.unique_titles[int(self.title_codes[row])]
+
+    def description(self, row: int) -> str:
+        return self.descriptions[row]
+
+    def row(self, row: int) -> Dict[str, str]:
+        """
+        Get one job as the dict shape the API returns.
+
+        Args:
+            row: Row index
+
+        Returns:
+            Dictionary with job_title and job_description
+        """
+        return {
+            'job_title': self.title(row),
+            'job_description': self.description(row)
+        }
+
+    def first_row_by_code(self) -> np.ndarray:
+        """Row index of the first occurrence of every title code."""
+        _, first_rows = np.unique(self.title_codes, return_index=True)
+        return first_rows
+
+    def find_title(self, title: str) -> Optional[int]:
+        """
+        Find the first row whose title contains ``title`` (case-insensitive).
+
+        Exact matches are a dict lookup; otherwise only the unique titles are
+        scanned, never the rows.
+
+        Args:
+            title: Title or title fragment
+
+        Returns:
+            Row index, or None if nothing matches
+        """
+        lookup = self._get_title_lookup()
+        needle = title.lower()
+        if needle in lookup['exact']:
+            return lookup['exact'][needle]
+        first_rows = lookup['first_rows']
+        # Codes follow first appearance, so the first hit is also the earliest row
+        for code, lowered in enumerate(lookup['lowered']):
+            if needle in lowered:
+                return int(first_rows[code])
+        return None
+
+    def derived(self, key: str, builder: Callable[['JobTable'], T]) -> T:
+        """
+        Get a structure built from this table, building it on first use.
+
+        Derived structures live on the table, so a reload discards them.
+
+        Args:
+            key: Cache key
+            builder: Builds the structure from the table
+
+        Returns:
+            The cached structure
+        """
+        value = self._derived.get(key)
+        if value is None:
+            with self._lock:
+                value = self._derived.get(key)
+                if value is None:
+                    value = builder(self)
+                    self._derived[key] = value
+        return value
+
+    def peek_derived(self, key: str) -> Optional[Any]:
+        """A derived structure if it has been built, without building it."""
+        return self._derived.get(key)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the table."""
+        return self.title_codes.nbytes + self.unique_titles.nbytes + self.descriptions.nbytes
+
+    def _get_title_lookup(self) -> Dict:
+        if self._title_lookup is None:
+            with self._lock:
+                if self._title_lookup is None:
+                    first_rows = self.first_row_by_code()
+                    lowered = [value.lower() for value in self.unique_titles]
+                    exact = {}
+                    for code, value in enumerate(lowered):
+                        exact.setdefault(value, int(first_rows[code]))
+                    self._title_lookup = {
+                        'first_rows': first_rows,
+                        'lowered': lowered,
+                        'exact': exact
+                    }
+        return self._title_lookup
+
+
+class FileBackedCache(Generic[T]):
+    """
+    Value derived from files, rebuilt only when a file's mtime or size changes.
+    """
+
+    def __init__(self, paths: Sequence[Path], loader: Callable[[], T]):
+        """
+        Args:
+            paths: Files to watch (the value is None only if all are missing)
+            loader: Builds the cached value
+        """
+        self.paths = [Path(path) for path in paths]
+        self.loader = loader
+        self.loads = 0
+        self._signature = None
+        self._value = None
+        self._lock = threading.Lock()
+
+    def get(self) -> Optional[T]:
+        """
+        Get the cached value, reloading if the file changed.
+
+        Returns:
+            Loaded value, or None if the file is missing or failed to load
+        """
+        signature = self._stat()
+        if signature is not None and signature == self._signature:
+            return self._value
+
+        with self._lock:
+            signature = self._stat()
+            if signature is None:
+                self._signature, self._value = None, None
+            elif signature != self._signature:
+                try:
+                    with stage("dataset_load"):
+                        self._value = self.loader()
+                    self.loads += 1
+                except Exception as e:
+                    log_error(f"Error loading dataset {self.paths[-1]}", e)
+                    self._value = None
+                self._signature = signature
+            return self._value
+
+    def peek(self) -> Optional[T]:
+        """Cached value without checking the files or loading."""
+        return self._value
+
+    def invalidate(self):
+        """Force a reload on the next access."""
+        with self._lock:
+            self._signature = None
+
+    def _stat(self):
+        signature = []
+        for path in self.paths:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                signature.append(None)
+                continue
+            signature.append((stat.st_mtime_ns, stat.st_size))
+        if all(item is None for item in signature):
+            return None
+        return tuple(signature)
+
+
+def count_csv_rows(path: Path) -> int:
+    """
+    Count records in a CSV, honouring quoted multi-line fields.
+
+    Args:
+        path: CSV file path
+
+    Returns:
+        Number of data rows
+    """
+    return len(pd.read_csv(path, usecols=[0]))
+
+
+class DatasetManager:
+    """
+    Owns the memory-resident copies of the job and resume datasets.
+
+    Each dataset is read from its Arrow snapshot when one is fresh and from
+    the CSV otherwise; either file changing triggers a reload.
+    """
+
+    def __init__(self, job_descriptions_file: Path, resume_csv_file: Path):
+        self.job_descriptions_file = Path(job_descriptions_file)
+        self.resume_csv_file = Path(resume_csv_file)
+        self.jobs = FileBackedCache(
+            [snapshot_path_for(self.job_descriptions_file), self.job_descriptions_file],
+            self._load_jobs
+        )
+        self.resume_rows = FileBackedCache(
+            [snapshot_path_for(self.resume_csv_file), self.resume_csv_file],
+            self._count_resumes
+        )
+
+    def _load_jobs(self) -> JobTable:
+        snapshot = snapshot_path_for(self.job_descriptions_file)
+        if is_snapshot_fresh(snapshot, self.job_descriptions_file):
+            return JobTable.from_snapshot(snapshot)
+        return JobTable.from_csv(self.job_descriptions_file)
+
+    def _count_resumes(self) -> int:
+        snapshot = snapshot_path_for(self.resume_csv_file)
+        if is_snapshot_fresh(snapshot, self.resume_csv_file):
+            return snapshot_row_count(snapshot)
+        return count_csv_rows(self.resume_csv_file)
+
+    def get_jobs(self) -> Optional[JobTable]:
+        """Current job table, or None if the CSV is unavailable."""
+        return self.jobs.get()
+
+    def job_count(self) -> int:
+        jobs = self.get_jobs()
+        return len(jobs) if jobs is not None else 0
+
+    def resume_count(self) -> int:
+        count = self.resume_rows.get()
+        return count or 0
@@ -10,9 +10,17 @@ import random
 from pathlib import Path
 from typing import Dict, List, Optional
 
+from app.utils.dataset_store import DatasetManager
+from app.utils.dataset_snapshot import is_snapshot_fresh, open_snapshot, snapshot_path_for
+from app.utils.search_index import BM25Index
+from app.utils.title_index import TitleIndex
+from app.utils.resume_manifest import ResumeManifest
+from app.utils.timing import stage
+
 # Base paths
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
-DATA_DIR = BASE_DIR / 'data'
+# DATA_DIR overrides the data directory, e.g. with benchmarks/generate_data.py output
+DATA_DIR = Path(os.getenv('DATA_DIR', str(BASE_DIR / 'data')))
 SAMPLE_RESUMES_DIR = DATA_DIR / 'sample_resumes'
 JOB_DESCRIPTIONS_FILE = DATA_DIR / 'job_descriptions' / 'job_title_des.csv'
 RESUME_CSV_FILE = DATA_DIR / 'Resume.csv'
@@ -26,19 +34,43 @@ JOB_CATEGORIES = [
     'INFORMATION-TECHNOLOGY', 'PUBLIC-RELATIONS', 'SALES', 'TEACHER'
 ]
 
+# Memory-resident copies of the CSVs, reloaded when a file changes on disk
+dataset_manager = DatasetManager(JOB_DESCRIPTIONS_FILE, RESUME_CSV_FILE)
+
+# Sample resume listing, rescanned only when a category directory changes
+resume_manifest = ResumeManifest(SAMPLE_RESUMES_DIR, JOB_CATEGORIES)
+
 
-def load_job_descriptions(limit: Optional[int] = None) -> pd.DataFrame:
+def _read_dataset(csv_path: Path, columns: Optional[List[str]] = None) -> pd.DataFrame:
     """
-    Load job descriptions from CSV file.
+    Read a dataset from its Arrow snapshot if fresh, else from the CSV.
+    
+    Args:
+        csv_path: Source CSV path
+        columns: Optional column projection
+        
+    Returns:
+        DataFrame with the requested columns
+    """
+    snapshot = snapshot_path_for(csv_path)
+    if is_snapshot_fresh(snapshot, csv_path):
+        return open_snapshot(snapshot, columns=columns).to_pandas()
+    return pd.read_csv(csv_path, usecols=columns)
+
+
+def load_job_descriptions(limit: Optional[int] = None, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Load job descriptions from the snapshot or CSV file.
     
     Args:
         limit: Optional limit on number of records to return
+        columns: Optional list of columns to load
         
     Returns:
         DataFrame with job descriptions
     """
     try:
-        df = pd.read_csv(JOB_DESCRIPTIONS_FILE)
+        df = _read_dataset(JOB_DESCRIPTIONS_FILE, columns)
         if limit:
             df = df.head(limit)
         return df
@@ -54,19 +86,38 @@ def get_random_job_description() -> Dict[str, str]:
     Returns:
         Dictionary with job_title and job_description
     """
-    df = load_job_descriptions(limit=1000)  # Load first 1000 for performance
-    if not df.empty:
-        random_row = df.sample(n=1).iloc[0]
-        return {
-            'job_title': str(random_row['Job Title']),
-            'job_description': str(random_row['Job Description'])
-        }
+    jobs = dataset_manager.get_jobs()
+    if jobs is not None and len(jobs):
+        return jobs.row(random.randrange(len(jobs)))
     return {'job_title': '', 'job_description': ''}
 
 
+def _build_title_index(jobs) -> TitleIndex:
+    with stage("title_index_build"):
+        return TitleIndex.build(jobs.title_codes, jobs.unique_titles, jobs.descriptions.lengths())
+
+
+def get_title_index() -> Optional[TitleIndex]:
+    """
+    Get the normalized title index for the current job dataset.
+    
+    Returns:
+        TitleIndex, or None if the dataset is unavailable
+    """
+    jobs = dataset_manager.get_jobs()
+    if jobs is None:
+        return None
+    return jobs.derived('titles', _build_title_index)
+
+
 def get_job_description_by_title(title: str) -> Dict[str, str]:
     """
-    Search for job descriptions matching the given title.
+    Find the best job description for a title.
+    
+    Tries an exact match on the normalized title (seniority words and
+    punctuation ignored), then a prefix match, then a case-insensitive
+    substring match. Among rows with the same title the longest
+    description wins.
     
     Args:
         title: Job title to search for
@@ -74,31 +125,52 @@ def get_job_description_by_title(title: str) -> Dict[str, str]:
     Returns:
         Dictionary with job_title and job_description
     """
-    df = load_job_descriptions()
-    if not df.empty:
-        # Case-insensitive search
-        matches = df[df['Job Title'].str.contains(title, case=False, na=False)]
-        if not matches.empty:
-            row = matches.iloc[0]
-            return {
-                'job_title': str(row['Job Title']),
-                'job_description': str(row['Job Description'])
-            }
+    jobs = dataset_manager.get_jobs()
+    if jobs is not None:
+        index = get_title_index()
+        with stage("title_lookup"):
+            rows = index.lookup(title)
+        if rows is not None and len(rows):
+            return jobs.row(int(rows[0]))
+        
+        row = index.best_prefix_row(title)
+        if row is None:
+            row = jobs.find_title(title)
+        if row is not None:
+            return jobs.row(row)
     return {'job_title': '', 'job_description': ''}
 
 
-def load_resume_dataset(limit: Optional[int] = None) -> pd.DataFrame:
+def autocomplete_job_titles(prefix: str, limit: int = 10) -> List[Dict]:
+    """
+    Suggest job titles starting with a prefix.
+    
+    Args:
+        prefix: Beginning of a title (seniority words are ignored)
+        limit: Maximum number of suggestions
+        
+    Returns:
+        List of suggestions with title, normalized_title and count
+    """
+    index = get_title_index()
+    if index is None:
+        return []
+    return index.autocomplete(prefix, limit)
+
+
+def load_resume_dataset(limit: Optional[int] = None, columns: Optional[List[str]] = None) -> pd.DataFrame:
     """
-    Load resume dataset from CSV file.
+    Load resume dataset from the snapshot or CSV file.
     
     Args:
         limit: Optional limit on number of records to return
+        columns: Optional list of columns to load
         
     Returns:
         DataFrame with resume data
     """
     try:
-        df = pd.read_csv(RESUME_CSV_FILE)
+        df = _read_dataset(RESUME_CSV_FILE, columns)
         if limit:
             df = df.head(limit)
         return df
@@ -117,10 +189,20 @@ def get_sample_resumes_by_category(category: str) -> List[str]:
     Returns:
         List of file paths
     """
-    category_path = SAMPLE_RESUMES_DIR / category
-    if category_path.exists():
-        return [str(f) for f in category_path.glob('*.pdf')]
-    return []
+    return list(resume_manifest.get_paths(category))
+
+
+def get_sample_resume_files(category: str) -> List[Dict]:
+    """
+    Get manifest records for the resumes in a category.
+    
+    Args:
+        category: Job category
+        
+    Returns:
+        List of dicts with path, name, size, mtime_ns and sha256
+    """
+    return resume_manifest.get_files(category)
 
 
 def get_random_resume_path(category: Optional[str] = None) -> Optional[str]:
@@ -169,62 +251,79 @@ def get_dataset_stats() -> Dict[str, int]:
         'resumes_by_category': {}
     }
     
-    # Count job descriptions
-    try:
-        df = load_job_descriptions()
-        stats['total_job_descriptions'] = len(df)
-    except:
-        pass
-    
-    # Count resume data
-    try:
-        df = load_resume_dataset()
-        stats['total_resume_data'] = len(df)
-    except:
-        pass
+    # Count job descriptions and resume data from the memory-resident copies
+    stats['total_job_descriptions'] = dataset_manager.job_count()
+    stats['total_resume_data'] = dataset_manager.resume_count()
     
-    # Count resumes by category
-    for category in JOB_CATEGORIES:
-        resumes = get_sample_resumes_by_category(category)
-        stats['resumes_by_category'][category] = len(resumes)
+    # Count resumes by category from the manifest
+    stats['resumes_by_category'] = resume_manifest.counts()
     
     return stats
 
 
-def search_jobs_by_keywords(keywords: List[str], limit: int = 10) -> List[Dict[str, str]]:
+def _build_search_index(jobs) -> BM25Index:
+    with stage("search_index_build"):
+        return BM25Index.build(jobs.title_codes, jobs.unique_titles, jobs.descriptions)
+
+
+def get_search_index() -> Optional[BM25Index]:
+    """
+    Get the BM25 index for the current job dataset, building it on first use.
+    
+    Returns:
+        BM25Index, or None if the dataset is unavailable
+    """
+    jobs = dataset_manager.get_jobs()
+    if jobs is None:
+        return None
+    return jobs.derived('bm25', _build_search_index)
+
+
+def search_jobs_page(keywords: List[str], limit: int = 10, offset: int = 0) -> Dict:
     """
-    Search job descriptions by keywords.
+    Rank job descriptions against keywords with BM25 and return one page.
+    
+    Titles count more than descriptions. Keywords are tokenized, so regex
+    metacharacters are treated as plain text.
     
     Args:
         keywords: List of keywords to search for
-        limit: Maximum number of results to return
+        limit: Page size
+        offset: Number of ranked results to skip
         
     Returns:
-        List of matching job descriptions
+        Dictionary with jobs (each with a relevance score) and has_more
     """
-    df = load_job_descriptions()
-    if df.empty:
-        return []
-    
-    # Create search pattern
-    pattern = '|'.join(keywords)
-    
-    # Search in both title and description
-    matches = df[
-        df['Job Title'].str.contains(pattern, case=False, na=False) |
-        df['Job Description'].str.contains(pattern, case=False, na=False)
-    ]
+    jobs = dataset_manager.get_jobs()
+    if jobs is None or not keywords:
+        return {'jobs': [], 'has_more': False}
     
+    index = get_search_index()
+    with stage("job_search"):
+        hits, has_more = index.search(keywords, limit=limit, offset=offset)
     results = []
-    for _, row in matches.head(limit).iterrows():
-        results.append({
-            'job_title': str(row['Job Title']),
-            'job_description': str(row['Job Description'])
-        })
+    for row, score in hits:
+        job = jobs.row(row)
+        job['score'] = round(score, 4)
+        results.append(job)
     
-    return results
+    return {'jobs': results, 'has_more': has_more}
 
 
+def search_jobs_by_keywords(keywords: List[str], limit: int = 10, offset: int = 0) -> List[Dict[str, str]]:
+    """
+    Search job descriptions by keywords, best matches first.
+    
+    Args:
+        keywords: List of keywords to search for
+        limit: Maximum number of results to return
+        offset: Number of ranked results to skip
+        
+    Returns:
+        List of matching job descriptions
+    """
+    return search_jobs_page(keywords, limit, offset)['jobs']
+
 if __name__ == '__main__':
     # Example usage
     print("Dataset Statistics:")
@@ -0,0 +1,150 @@
+"""
+Adaptive degradation of skill extraction under load
+
+The spaCy pass of ``SkillExtractor.extract_skills`` costs far more CPU than
+the keyword scan but only adds skills whose exact noun chunk or entity is
+already in the taxonomy. When the CPU backlog grows, extraction switches to
+keyword-only and switches back once the load has stayed low for a while.
+
+Signals, sampled at most every CHECK_INTERVAL seconds:
+    - queue depth: tasks waiting on the CPU pool plus requests waiting for
+      an upload or nlp admission slot
+    - recent latency: mean CPU pool queue wait over the last window (wait
+      time does not depend on the extraction mode, so shedding spaCy does
+      not by itself make the signal look healthy)
+
+Measure what keyword-only costs in recall with
+``python -m benchmarks.extraction_recall``.
+"""
+import os
+import threading
+import time
+from typing import Dict
+
+from app.utils.admission import limiters
+from app.utils.executors import cpu_pool
+from app.utils.logger import log_warning
+from app.utils.timing import registry
+
+FULL = "full"
+KEYWORD_ONLY = "keyword_only"
+
+# auto (adaptive), full (never degrade) or keyword_only (always degrade)
+DEGRADATION_MODE = os.getenv("DEGRADATION_MODE", "auto").lower()
+DEGRADE_QUEUE_DEPTH = int(os.getenv("DEGRADE_QUEUE_DEPTH", str(max(4, (os.cpu_count() or 4) * 2))))
+DEGRADE_WAIT_MS = float(os.getenv("DEGRADE_WAIT_MS", "250"))
+DEGRADE_RECOVERY_SECONDS = float(os.getenv("DEGRADE_RECOVERY_SECONDS", "10"))
+
+# Both signals must fall below this fraction of their thresholds to recover
+RECOVERY_RATIO = 0.5
+CHECK_INTERVAL = 0.25
+
+# Admission classes whose waiting requests will need extraction
+_QUEUE_CLASSES = ("upload", "nlp")
+
+
+class DegradationPolicy:
+    """
+    Decides between full and keyword-only extraction with hysteresis
+    """
+
+    def __init__(
+        self,
+        mode: str = DEGRADATION_MODE,
+        queue_depth: int = DEGRADE_QUEUE_DEPTH,
+        wait_ms: float = DEGRADE_WAIT_MS,
+        recovery_seconds: float = DEGRADE_RECOVERY_SECONDS
+    ):
+        """
+        Args:
+            mode: auto, full or keyword_only
+            queue_depth: Backlog at which extraction degrades
+            wait_ms: Mean CPU queue wait (ms) at which extraction degrades
+            recovery_seconds: How long both signals must stay low before
+                full extraction resumes
+        """
+        self.mode = mode if mode in ("auto", FULL, KEYWORD_ONLY) else "auto"
+        self.queue_depth = queue_depth
+        self.wait_ms = wait_ms
+        self.recovery_seconds = recovery_seconds
+        self.degraded = self.mode == KEYWORD_ONLY
+        self.transitions = 0
+        self.last_queue_depth = 0
+        self.last_wait_ms = 0.0
+        self._next_check = 0.0
+        self._calm_since = None
+        self._last_wait_totals = cpu_pool.wait_totals()
+        self._lock = threading.Lock()
+
+    def current_mode(self) -> str:
+        """Extraction mode to use for the next request"""
+        if self.mode != "auto":
+            return self.mode
+        now = time.monotonic()
+        if now >= self._next_check and self._lock.acquire(blocking=False):
+            try:
+                self._next_check = now + CHECK_INTERVAL
+                self._evaluate(now)
+            finally:
+                self._lock.release()
+        return KEYWORD_ONLY if self.degraded else FULL
+
+    def _evaluate(self, now: float):
+        depth = cpu_pool.stats()["queued"] + sum(limiters[name].queued for name in _QUEUE_CLASSES)
+        wait_seconds, finished = cpu_pool.wait_totals()
+        last_wait, last_finished = self._last_wait_totals
+        if finished > last_finished:
+            self.last_wait_ms = (wait_seconds - last_wait) / (finished - last_finished) * 1000
+            self._last_wait_totals = (wait_seconds, finished)
+        elif depth == 0:
+            self.last_wait_ms = 0.0
+        self.last_queue_depth = depth
+
+        overloaded = depth >= self.queue_depth or self.last_wait_ms >= self.wait_ms
+        calm = (
+            depth < self.queue_depth * RECOVERY_RATIO
+            and self.last_wait_ms < self.wait_ms * RECOVERY_RATIO
+        )
+        if not self.degraded:
+            if overloaded:
+                self._switch(True)
+            return
+        if not calm:
+            self._calm_since = None
+        elif self._calm_since is None:
+            self._calm_since = now
+        elif now - self._calm_since >= self.recovery_seconds:
+            self._switch(False)
+
+    def _switch(self, degraded: bool):
+        self.degraded = degraded
+        self._calm_since = None
+        self.transitions += 1
+        log_warning(
+            "Skill extraction degraded to keyword-only" if degraded else "Skill extraction back to full",
+            {"queue_depth": self.last_queue_depth, "cpu_wait_ms": round(self.last_wait_ms, 1)}
+        )
+
+    def stats(self) -> Dict[str, any]:
+        return {
+            "mode": self.mode,
+            "current": KEYWORD_ONLY if self.degraded else FULL,
+            "queue_depth": self.last_queue_depth,
+            "cpu_wait_ms": round(self.last_wait_ms, 3),
+            "thresholds": {"queue_depth": self.queue_depth, "wait_ms": self.wait_ms},
+            "recovery_seconds": self.recovery_seconds,
+            "transitions": self.transitions
+        }
+
+    def collect_metrics(self):
+        """Degradation gauge for /metrics"""
+        yield "hiresight_extraction_degraded", {}, 1.0 if self.degraded else 0.0
+
+
+# Process-wide policy used by the skill extractor
+extraction_policy = DegradationPolicy()
+
+registry.register_collector(
+    extraction_policy.collect_metrics,
+    help_texts={"hiresight_extraction_degraded": "1 while skill extraction runs keyword-only"}
+)
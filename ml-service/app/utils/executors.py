@@ -0,0 +1,252 @@
+"""
+Managed executor pools for the ML service
+
+Route handlers are async, but parsing, NLP, dataset access and LLM calls are
+blocking. They are submitted to separate, sized thread pools so a slow class
+of work cannot starve the others, and each pool reports its saturation.
+"""
+import asyncio
+import contextvars
+import functools
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Tuple
+
+from app.utils.profiling import profiled_call
+from app.utils.timing import registry
+
+
+class ManagedPool:
+    """
+    Thread (or process) pool with queue and utilisation accounting
+    """
+
+    def __init__(self, name: str, max_workers: int, processes: bool = False):
+        """
+        Args:
+            name: Pool name used in metrics and thread names
+            max_workers: Number of worker threads or processes
+            processes: Use worker processes (callables and results must pickle)
+        """
+        self.name = name
+        self.max_workers = max_workers
+        self.processes = processes
+        self._executor: Optional[ProcessPoolExecutor] = None
+        if not processes:
+            self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"{name}-pool")
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._peak_queued = 0
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._wait_seconds = 0.0
+        self._run_seconds = 0.0
+
+    async def run(self, fn: Callable, *args, **kwargs):
+        """
+        Run a blocking callable on the pool and await its result
+
+        The caller's context variables are carried into the worker thread.
+
+        Args:
+            fn: Blocking callable
+            *args, **kwargs: Arguments for ``fn``
+
+        Returns:
+            Whatever ``fn`` returns
+        """
+        if self.processes:
+            return await self._run_in_process(fn, *args, **kwargs)
+
+        context = contextvars.copy_context()
+        call = functools.partial(context.run, profiled_call, fn, *args, **kwargs)
+        enqueued = time.perf_counter()
+        with self._lock:
+            self._submitted += 1
+            self._queued += 1
+            self._peak_queued = max(self._peak_queued, self._queued)
+
+        def tracked():
+            started = time.perf_counter()
+            with self._lock:
+                self._queued -= 1
+                self._active += 1
+                self._wait_seconds += started - enqueued
+            failed = False
+            try:
+                return call()
+            except BaseException:
+                failed = True
+                raise
+            finally:
+                with self._lock:
+                    self._active -= 1
+                    self._run_seconds += time.perf_counter() - started
+                    if failed:
+                        self._failed += 1
+                    else:
+                        self._completed += 1
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, tracked)
+
+    async def _run_in_process(self, fn: Callable, *args, **kwargs):
+        # Worker start times are not visible here, so in-flight calls beyond
+        # max_workers are counted as queued and wait time is not tracked
+        started = time.perf_counter()
+        with self._lock:
+            self._submitted += 1
+            self._active += 1
+            self._queued = max(0, self._active - self.max_workers)
+            self._peak_queued = max(self._peak_queued, self._queued)
+        failed = False
+        try:
+            return await asyncio.wrap_future(self._process_executor().submit(fn, *args, **kwargs))
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._queued = max(0, self._active - self.max_workers)
+                self._run_seconds += time.perf_counter() - started
+                if failed:
+                    self._failed += 1
+                else:
+                    self._completed += 1
+
+    def _process_executor(self) -> ProcessPoolExecutor:
+        # Created on first use; spawn avoids forking the server's threads
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=multiprocessing.get_context("spawn")
+                    )
+        return self._executor
+
+    def submit(self, fn: Callable, *args, **kwargs):
+        """
+        Submit from synchronous code
+
+        Returns:
+            concurrent.futures.Future
+        """
+        if self.processes:
+            return self._process_executor().submit(fn, *args, **kwargs)
+        return self._executor.submit(contextvars.copy_context().run, profiled_call, fn, *args, **kwargs)
+
+    def wait_totals(self) -> Tuple[float, int]:
+        """Cumulative (queue wait seconds, finished tasks), for windowed averages"""
+        with self._lock:
+            return self._wait_seconds, self._completed + self._failed
+
+    def stats(self) -> Dict[str, any]:
+        """Current saturation and cumulative counters"""
+        with self._lock:
+            finished = self._completed + self._failed
+            active = min(self._active, self.max_workers) if self.processes else self._active
+            return {
+                "kind": "process" if self.processes else "thread",
+                "max_workers": self.max_workers,
+                "active": active,
+                "queued": self._queued,
+                "peak_queued": self._peak_queued,
+                "utilization": round(active / self.max_workers, 3),
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failed": self._failed,
+                "avg_wait_ms": round(self._wait_seconds / finished * 1000, 3) if finished else 0.0,
+                "avg_run_ms": round(self._run_seconds / finished * 1000, 3) if finished else 0.0
+            }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _workers_from_env(key: str, default: int) -> int:
+    return max(1, int(os.getenv(key, str(default))))
+
+
+# CPU-heavy work: pdfplumber, spaCy, matching
+cpu_pool = ManagedPool("cpu", _workers_from_env("CPU_POOL_WORKERS", os.cpu_count() or 4))
+
+# Cheap per-request matching, kept off the CPU pool so it never queues
+# behind parsing and spaCy work
+lookup_pool = ManagedPool("lookup", _workers_from_env("LOOKUP_POOL_WORKERS", 4))
+
+# Blocking disk/network I/O: upload spooling, dataset loads and lookups
+io_pool = ManagedPool("io", _workers_from_env("IO_POOL_WORKERS", 16))
+
+# Outbound LLM calls, which mostly wait on the network
+llm_pool = ManagedPool("llm", _workers_from_env("LLM_POOL_WORKERS", 8))
+
+# Optional worker processes for batch PDF parsing, which is pure Python and
+# GIL-bound; 0 keeps batch parsing on the CPU thread pool
+PARSE_POOL_PROCESSES = int(os.getenv("PARSE_POOL_PROCESSES", "0"))
+parse_pool = ManagedPool("parse", PARSE_POOL_PROCESSES, processes=True) if PARSE_POOL_PROCESSES > 0 else None
+
+POOLS = {pool.name: pool for pool in (cpu_pool, lookup_pool, io_pool, llm_pool, parse_pool) if pool is not None}
+
+
+async def run_cpu(fn: Callable, *args, **kwargs):
+    """Run CPU-bound work on the CPU pool"""
+    return await cpu_pool.run(fn, *args, **kwargs)
+
+
+async def run_lookup(fn: Callable, *args, **kwargs):
+    """Run short CPU work for latency-sensitive endpoints on the lookup pool"""
+    return await lookup_pool.run(fn, *args, **kwargs)
+
+
+async def run_io(fn: Callable, *args, **kwargs):
+    """Run blocking I/O on the I/O pool"""
+    return await io_pool.run(fn, *args, **kwargs)
+
+
+async def run_llm(fn: Callable, *args, **kwargs):
+    """Run an LLM call on the LLM pool"""
+    return await llm_pool.run(fn, *args, **kwargs)
+
+
+async def run_parse(fn: Callable, *args, **kwargs):
+    """Run batch parsing on the process pool when configured, else the CPU pool"""
+    if parse_pool is not None:
+        return await parse_pool.run(fn, *args, **kwargs)
+    return await cpu_pool.run(fn, *args, **kwargs)
+
+
+def get_executor_stats() -> Dict[str, Dict]:
+    """Saturation metrics for every pool"""
+    return {name: pool.stats() for name, pool in POOLS.items()}
+
+
+def _collect_executor_metrics():
+    """Pool saturation gauges for /metrics"""
+    for name, stats in get_executor_stats().items():
+        for key in ("max_workers", "active", "queued", "utilization"):
+            yield f"hiresight_executor_{key}", {"pool": name}, stats[key]
+
+
+registry.register_collector(
+    _collect_executor_metrics,
+    help_texts={
+        "hiresight_executor_max_workers": "Configured worker threads per pool",
+        "hiresight_executor_active": "Tasks currently running per pool",
+        "hiresight_executor_queued": "Tasks waiting for a worker per pool",
+        "hiresight_executor_utilization": "Active tasks divided by workers per pool"
+    }
+)
+
+
+def shutdown_executors():
+    """Stop accepting work on every pool"""
+    for pool in POOLS.values():
+        pool.shutdown()
@@ -0,0 +1,563 @@
+"""
+Persistent job queue for long-running analyses
+
+Jobs are stored in a local SQLite database (WAL mode) so queued work and
+finished results survive restarts. Async worker tasks claim jobs by
+priority, report progress per stage and store the result, which is kept
+for a retention TTL. Idempotency keys make client retries return the
+original job instead of enqueuing the work again.
+
+Several processes may share the database (``uvicorn --workers N``, the
+pre-fork launcher). A claimed job records its owner and a lease that the
+owner's heartbeat renews; only jobs whose lease has expired, because their
+process died, are requeued, so no process takes over a sibling's job.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.utils.executors import run_io
+from app.utils.logger import log_error, log_info, set_request_id
+
+JOB_DB_PATH = Path(os.getenv("JOB_DB_PATH", "job_data/jobs.sqlite3"))
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_RESULT_TTL_SECONDS = float(os.getenv("JOB_RESULT_TTL_SECONDS", "86400"))
+JOB_MAX_QUEUED = int(os.getenv("JOB_MAX_QUEUED", "1000"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+# Seconds a running job stays owned without a heartbeat
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "30"))
+
+# Seconds between queue polls when no submission wakes the workers
+POLL_INTERVAL_SECONDS = 1.0
+
+# Seconds between purges of expired jobs and recovery of expired leases
+PURGE_INTERVAL_SECONDS = 60.0
+
+# Lease renewals per lease period
+HEARTBEATS_PER_LEASE = 3
+
+QUEUED, RUNNING, SUCCEEDED, FAILED = "queued", "running", "succeeded", "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    idempotency_key TEXT UNIQUE,
+    fingerprint TEXT,
+    payload TEXT NOT NULL,
+    progress TEXT NOT NULL DEFAULT '{}',
+    result TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    expires_at REAL,
+    owner TEXT,
+    lease_expires_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_claim ON jobs (status, priority DESC, created_at);
+CREATE INDEX IF NOT EXISTS jobs_expiry ON jobs (expires_at);
+"""
+
+Handler = Callable[[Dict, "ProgressReporter"], Awaitable[Dict]]
+
+
+class IdempotencyConflict(Exception):
+    """An idempotency key was reused with a different request"""
+
+
+class QueueFull(Exception):
+    """Too many jobs are waiting"""
+
+
+def fingerprint(*parts) -> str:
+    """
+    Stable hash of a job request, used to detect idempotency key reuse
+
+    Args:
+        *parts: str or bytes components of the request
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        data = part if isinstance(part, bytes) else str(part).encode("utf-8")
+        digest.update(len(data).to_bytes(8, "big"))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+class JobStore:
+    """
+    SQLite-backed job table
+    """
+
+    def __init__(self, db_path: Path = JOB_DB_PATH):
+        """
+        Args:
+            db_path: SQLite database file (created if missing)
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        # SQLite allows one writer; serialise writes instead of hitting SQLITE_BUSY
+        self._write_lock = threading.Lock()
+        with self._write_lock:
+            connection = self._connection()
+            connection.executescript(_SCHEMA)
+            # Databases created before leases existed
+            columns = {row["name"] for row in connection.execute("PRAGMA table_info(jobs)")}
+            for column in ("owner TEXT", "lease_expires_at REAL"):
+                if column.split()[0] not in columns:
+                    connection.execute(f"ALTER TABLE jobs ADD COLUMN {column}")
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        # SQLite connections must not cross fork; reopen in a forked worker
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def create(
+        self,
+        kind: str,
+        payload: Dict,
+        priority: int = 0,
+        idempotency_key: Optional[str] = None,
+        request_fingerprint: Optional[str] = None,
+        max_queued: int = JOB_MAX_QUEUED
+    ) -> Tuple[Dict, bool]:
+        """
+        Enqueue a job, or return the existing job for a known idempotency key
+
+        Args:
+            kind: Handler name
+            payload: JSON-serializable handler input
+            priority: Higher runs first
+            idempotency_key: Client-chosen key for safe retries
+            request_fingerprint: Hash of the request, compared on key reuse
+            max_queued: Reject new jobs beyond this many queued
+
+        Returns:
+            (job, created) where created is False for an idempotent replay
+
+        Raises:
+            IdempotencyConflict: Key reused with a different request
+            QueueFull: Too many queued jobs
+        """
+        connection = self._connection()
+        now = time.time()
+        with self._write_lock:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                if idempotency_key:
+                    row = connection.execute(
+                        "SELECT * FROM jobs WHERE idempotency_key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                        (idempotency_key, now)
+                    ).fetchone()
+                    if row is not None:
+                        connection.execute("COMMIT")
+                        if request_fingerprint and row["fingerprint"] not in (None, request_fingerprint):
+                            raise IdempotencyConflict(
+                                "Idempotency-Key was already used for a different request"
+                            )
+                        return self._to_dict(row), False
+                    # A key whose job expired may be reused
+                    connection.execute("DELETE FROM jobs WHERE idempotency_key = ?", (idempotency_key,))
+
+                queued = connection.execute("SELECT COUNT(*) FROM jobs WHERE status = ?", (QUEUED,)).fetchone()[0]
+                if queued >= max_queued:
+                    connection.execute("ROLLBACK")
+                    raise QueueFull(f"{queued} jobs are already queued")
+
+                job_id = uuid.uuid4().hex
+                connection.execute(
+                    "INSERT INTO jobs (id, kind, status, priority, idempotency_key, fingerprint, payload, created_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (job_id, kind, QUEUED, priority, idempotency_key, request_fingerprint,
+                     json.dumps(payload), now)
+                )
+                connection.execute("COMMIT")
+            except (IdempotencyConflict, QueueFull):
+                raise
+            except BaseException:
+                if connection.in_transaction:
+                    connection.execute("ROLLBACK")
+                raise
+        return self.get(job_id), True
+
+    def claim(self, owner: str, lease: float = JOB_LEASE_SECONDS) -> Optional[Dict]:
+        """
+        Mark the highest-priority, oldest queued job as running
+
+        Args:
+            owner: Id of the claiming process
+            lease: Seconds the job stays owned without a renewal
+
+        Returns:
+            Claimed job (with payload), or None if the queue is empty
+        """
+        connection = self._connection()
+        now = time.time()
+        with self._write_lock:
+            row = connection.execute(
+                "UPDATE jobs SET status = ?, started_at = ?, attempts = attempts + 1, owner = ?, lease_expires_at = ?"
+                " WHERE id = (SELECT id FROM jobs WHERE status = ? ORDER BY priority DESC, created_at LIMIT 1)"
+                " RETURNING *",
+                (RUNNING, now, owner, now + lease, QUEUED)
+            ).fetchone()
+        return self._to_dict(row, include_payload=True) if row is not None else None
+
+    def renew_leases(self, owner: str, lease: float = JOB_LEASE_SECONDS) -> int:
+        """
+        Extend the leases of every job an owner is running
+
+        Returns:
+            Number of leases renewed
+        """
+        with self._write_lock:
+            return self._connection().execute(
+                "UPDATE jobs SET lease_expires_at = ? WHERE status = ? AND owner = ?",
+                (time.time() + lease, RUNNING, owner)
+            ).rowcount
+
+    def set_progress(self, job_id: str, progress: Dict):
+        """Replace the per-stage progress of a job"""
+        with self._write_lock:
+            self._connection().execute(
+                "UPDATE jobs SET progress = ? WHERE id = ?",
+                (json.dumps(progress), job_id)
+            )
+
+    def release(self, owner: str) -> int:
+        """
+        Return an owner's running jobs to the queue (clean shutdown)
+
+        Returns:
+            Number of jobs requeued
+        """
+        with self._write_lock:
+            return self._connection().execute(
+                "UPDATE jobs SET status = ?, started_at = NULL, owner = NULL, lease_expires_at = NULL"
+                " WHERE status = ? AND owner = ?",
+                (QUEUED, RUNNING, owner)
+            ).rowcount
+
+    def finish(self, job_id: str, result: Optional[Dict] = None, error: Optional[str] = None,
+               ttl: float = JOB_RESULT_TTL_SECONDS, owner: Optional[str] = None) -> bool:
+        """
+        Store the outcome of a job and start its retention period
+
+        Args:
+            job_id: Job id
+            result: Result on success
+            error: Error message on failure
+            ttl: Seconds to keep the job after it finishes
+            owner: Only finish the job while this owner still holds it
+
+        Returns:
+            False if the job is no longer running under ``owner``
+        """
+        now = time.time()
+        query = (
+            "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ?, expires_at = ?,"
+            " owner = NULL, lease_expires_at = NULL WHERE id = ?"
+        )
+        params = [FAILED if error is not None else SUCCEEDED,
+                  json.dumps(result) if result is not None else None,
+                  error, now, now + ttl, job_id]
+        if owner is not None:
+            query += " AND status = ? AND owner = ?"
+            params += [RUNNING, owner]
+        with self._write_lock:
+            return self._connection().execute(query, params).rowcount > 0
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """
+        Fetch a job that has not expired
+
+        Args:
+            job_id: Job id
+
+        Returns:
+            Job dict, or None
+        """
+        row = self._connection().execute(
+            "SELECT * FROM jobs WHERE id = ? AND (expires_at IS NULL OR expires_at > ?)",
+            (job_id, time.time())
+        ).fetchone()
+        return self._to_dict(row) if row is not None else None
+
+    def requeue_interrupted(self, max_attempts: int = JOB_MAX_ATTEMPTS,
+                            ttl: float = JOB_RESULT_TTL_SECONDS) -> Tuple[int, List[Dict]]:
+        """
+        Recover running jobs whose lease expired (their process died)
+
+        Jobs with attempts left go back to the queue; the rest fail. Jobs
+        under a live lease belong to another process and are left alone.
+
+        Returns:
+            (number requeued, jobs that were failed)
+        """
+        connection = self._connection()
+        now = time.time()
+        expired = "status = ? AND (lease_expires_at IS NULL OR lease_expires_at <= ?)"
+        with self._write_lock:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                requeued = connection.execute(
+                    "UPDATE jobs SET status = ?, started_at = NULL, owner = NULL, lease_expires_at = NULL"
+                    f" WHERE {expired} AND attempts < ?",
+                    (QUEUED, RUNNING, now, max_attempts)
+                ).rowcount
+                exhausted = connection.execute(
+                    "UPDATE jobs SET status = ?, error = ?, finished_at = ?, expires_at = ?,"
+                    f" owner = NULL, lease_expires_at = NULL WHERE {expired} RETURNING *",
+                    (FAILED, "Interrupted too many times", now, now + ttl, RUNNING, now)
+                ).fetchall()
+                connection.execute("COMMIT")
+            except BaseException:
+                if connection.in_transaction:
+                    connection.execute("ROLLBACK")
+                raise
+        return requeued, [self._to_dict(row, include_payload=True) for row in exhausted]
+
+    def purge_expired(self) -> List[Dict]:
+        """
+        Delete jobs past their retention period
+
+        Returns:
+            Deleted jobs (with payload, so callers can remove attached files)
+        """
+        with self._write_lock:
+            rows = self._connection().execute(
+                "DELETE FROM jobs WHERE expires_at IS NOT NULL AND expires_at <= ? RETURNING *",
+                (time.time(),)
+            ).fetchall()
+        return [self._to_dict(row, include_payload=True) for row in rows]
+
+    def counts(self) -> Dict[str, int]:
+        """Number of retained jobs per status"""
+        rows = self._connection().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        counts = {QUEUED: 0, RUNNING: 0, SUCCEEDED: 0, FAILED: 0}
+        counts.update({status: count for status, count in rows})
+        return counts
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row, include_payload: bool = False) -> Dict:
+        job = {
+            "id": row["id"],
+            "kind": row["kind"],
+            "status": row["status"],
+            "priority": row["priority"],
+            "progress": json.loads(row["progress"]),
+            "result": json.loads(row["result"]) if row["result"] is not None else None,
+            "error": row["error"],
+            "attempts": row["attempts"],
+            "created_at": row["created_at"],
+            "started_at": row["started_at"],
+            "finished_at": row["finished_at"],
+            "expires_at": row["expires_at"]
+        }
+        if include_payload:
+            job["payload"] = json.loads(row["payload"])
+        return job
+
+
+class ProgressReporter:
+    """
+    Per-stage progress of one running job, persisted on every change
+    """
+
+    def __init__(self, store: JobStore, job_id: str, stages):
+        self.store = store
+        self.job_id = job_id
+        self.progress = {
+            "stages": {stage: "pending" for stage in stages},
+            "current": None
+        }
+
+    async def __call__(self, stage: str, status: str):
+        """
+        Record a stage transition
+
+        Args:
+            stage: Stage name
+            status: "running", "done", "skipped" or "failed"
+        """
+        self.progress["stages"][stage] = status
+        self.progress["current"] = stage if status == "running" else None
+        await run_io(self.store.set_progress, self.job_id, self.progress)
+
+
+class JobQueue:
+    """
+    Async workers draining a JobStore
+
+    Handlers are registered per job kind and awaited with the job payload
+    and a ProgressReporter; they return the job result or raise.
+    """
+
+    def __init__(self, store: JobStore, workers: int = JOB_WORKERS, lease: float = JOB_LEASE_SECONDS):
+        """
+        Args:
+            store: Job storage
+            workers: Number of concurrent worker tasks
+            lease: Seconds a claimed job stays owned without a heartbeat
+        """
+        self.store = store
+        self.workers = workers
+        self.lease = lease
+        # Set per process in start(), after any fork
+        self.owner: Optional[str] = None
+        self._handlers: Dict[str, Tuple[Handler, Tuple[str, ...]]] = {}
+        self._cleanup: Dict[str, Callable[[Dict], None]] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def register(self, kind: str, handler: Handler, stages: Tuple[str, ...] = (),
+                 cleanup: Optional[Callable[[Dict], None]] = None):
+        """
+        Register the handler for a job kind
+
+        Args:
+            kind: Job kind
+            handler: Coroutine function (payload, progress) -> result dict
+            stages: Stage names reported by the handler, in order
+            cleanup: Called with the payload once the job is finished or purged
+        """
+        self._handlers[kind] = (handler, tuple(stages))
+        if cleanup is not None:
+            self._cleanup[kind] = cleanup
+
+    async def submit(self, kind: str, payload: Dict, priority: int = 0,
+                     idempotency_key: Optional[str] = None,
+                     request_fingerprint: Optional[str] = None) -> Tuple[Dict, bool]:
+        """
+        Enqueue a job and wake a worker
+
+        Returns:
+            (job, created); see JobStore.create
+        """
+        if kind not in self._handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        job, created = await run_io(
+            self.store.create, kind, payload, priority, idempotency_key, request_fingerprint
+        )
+        if created and self._wakeup is not None:
+            self._wakeup.set()
+        return job, created
+
+    async def get(self, job_id: str) -> Optional[Dict]:
+        """Fetch a job by id"""
+        return await run_io(self.store.get, job_id)
+
+    def recover(self):
+        """Requeue jobs whose owning process died (their lease expired)"""
+        requeued, exhausted = self.store.requeue_interrupted()
+        for job in exhausted:
+            self._run_cleanup(job)
+        if requeued:
+            log_info("Requeued interrupted jobs", {"count": requeued})
+
+    def start(self):
+        """Recover interrupted jobs and start the worker, heartbeat and purge tasks"""
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.recover()
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._heartbeat_loop()))
+        self._tasks.append(asyncio.create_task(self._purge_loop()))
+
+    async def stop(self):
+        """Cancel the worker tasks and requeue the jobs they were running"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self.owner is not None:
+            released = self.store.release(self.owner)
+            if released:
+                log_info("Requeued running jobs at shutdown", {"count": released})
+
+    def stats(self) -> Dict[str, any]:
+        """Job counts per status and worker configuration"""
+        return {"workers": self.workers, "jobs": self.store.counts()}
+
+    async def _worker(self, number: int):
+        while True:
+            job = await run_io(self.store.claim, self.owner, self.lease)
+            if job is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), POLL_INTERVAL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._run(job)
+
+    async def _run(self, job: Dict):
+        handler, stages = self._handlers.get(job["kind"], (None, ()))
+        set_request_id(f"job-{job['id']}")
+        try:
+            if handler is None:
+                raise ValueError(f"Unknown job kind: {job['kind']}")
+            progress = ProgressReporter(self.store, job["id"], stages)
+            result = await handler(job["payload"], progress)
+            finished = await run_io(self.store.finish, job["id"], result, None, JOB_RESULT_TTL_SECONDS, self.owner)
+        except asyncio.CancelledError:
+            # Shutting down: stop() requeues the job
+            raise
+        except Exception as e:
+            log_error(f"Job {job['id']} failed", e)
+            finished = await run_io(
+                self.store.finish, job["id"], None, str(e) or type(e).__name__, JOB_RESULT_TTL_SECONDS, self.owner
+            )
+        if not finished:
+            # The lease lapsed and the job was requeued; its new run owns the files
+            log_error(f"Job {job['id']} lost its lease; result discarded")
+            return
+        self._run_cleanup(job)
+
+    async def _heartbeat_loop(self):
+        while True:
+            await asyncio.sleep(self.lease / HEARTBEATS_PER_LEASE)
+            try:
+                await run_io(self.store.renew_leases, self.owner, self.lease)
+            except Exception as e:
+                log_error("Error renewing job leases", e)
+
+    async def _purge_loop(self):
+        while True:
+            await asyncio.sleep(PURGE_INTERVAL_SECONDS)
+            try:
+                for job in await run_io(self.store.purge_expired):
+                    self._run_cleanup(job)
+                # Jobs of a sibling process that died since this one started
+                await run_io(self.recover)
+            except Exception as e:
+                log_error("Error purging expired jobs", e)
+
+    def _run_cleanup(self, job: Dict):
+        cleanup = self._cleanup.get(job["kind"])
+        if cleanup is not None:
+            try:
+                cleanup(job["payload"])
+            except Exception as e:
+                log_error(f"Error cleaning up job {job['id']}", e)
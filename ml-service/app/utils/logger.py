@@ -1,28 +1,285 @@
 """
-Utility functions for ML service
+Structured logging for ML service
+
+Log calls build a small record and put it on a bounded queue; a background
+thread formats records as JSON lines and writes them in batches. Request
+handlers therefore never block on stdout, and lines from concurrent
+requests never interleave. Every record carries the request ID of the
+request it was logged under. A logged exception that was raised also
+carries its traceback, formatted on the writer thread.
+
+Environment:
+    LOG_LEVEL: DEBUG, INFO, WARNING or ERROR (default INFO)
+    LOG_FORMAT: json or text (default json)
+    LOG_DEBUG_SAMPLE_RATE: Fraction of debug records kept (default 1.0)
+    LOG_QUEUE_SIZE: Records buffered before new ones are dropped (default 10000)
 """
-from datetime import datetime
+import atexit
+import contextvars
+import json
+import os
+import queue
+import random
+import re
+import sys
+import threading
+import time
+import traceback
+import uuid
+from datetime import datetime, timezone
+from typing import Optional
+
+from app.utils.timing import registry
+
+LEVELS = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40}
+
+LOG_LEVEL = LEVELS.get(os.getenv("LOG_LEVEL", "INFO").upper(), LEVELS["INFO"])
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json").lower()
+LOG_DEBUG_SAMPLE_RATE = float(os.getenv("LOG_DEBUG_SAMPLE_RATE", "1.0"))
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+
+# Records written per stdout write
+WRITE_BATCH_SIZE = 256
+
+REQUEST_ID_HEADER = b"x-request-id"
+_VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._:-]{1,128}$")
+
+_request_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("request_id", default=None)
+
+
+def get_request_id() -> Optional[str]:
+    """Request ID of the current request, if any"""
+    return _request_id.get()
+
+
+def set_request_id(request_id: Optional[str]) -> contextvars.Token:
+    """
+    Bind a request ID to the current context
+
+    Args:
+        request_id: Correlation ID
+
+    Returns:
+        Token for contextvars reset
+    """
+    return _request_id.set(request_id)
+
+
+class _LogWriter:
+    """
+    Background thread draining the record queue to a stream
+    """
+
+    def __init__(self, stream=None, maxsize: int = LOG_QUEUE_SIZE):
+        self.stream = stream
+        self.maxsize = maxsize
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def put(self, record: tuple):
+        """Queue a record, dropping it if the buffer is full"""
+        if self._pid != os.getpid():
+            self._start()
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self, timeout: float = 2.0):
+        """Wait until queued records have been written"""
+        if self._thread is None or not self._thread.is_alive():
+            return
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.005)
+
+    def _start(self):
+        # (Re)start after import or fork; the parent's thread does not survive fork
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._queue = queue.Queue(maxsize=self.maxsize)
+            self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+            self._thread.start()
+            self._pid = os.getpid()
+
+    def _run(self):
+        records = self._queue
+        while True:
+            batch = [records.get()]
+            while len(batch) < WRITE_BATCH_SIZE:
+                try:
+                    batch.append(records.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                stream = self.stream or sys.stdout
+                stream.write("".join(_format(record) + "\n" for record in batch))
+                stream.flush()
+            except Exception:
+                pass
+            finally:
+                for _ in batch:
+                    records.task_done()
+
+
+def _format(record: tuple) -> str:
+    created, level, message, request_id, thread, data, error = record
+    timestamp = datetime.fromtimestamp(created, timezone.utc).isoformat(timespec="milliseconds")
+    if LOG_FORMAT == "text":
+        line = f"[{level}] [{timestamp}]"
+        if request_id:
+            line += f" [{request_id}]"
+        line += f" {message}"
+        if data:
+            line += f" {data}"
+        if error:
+            line += f" error={error[1]}"
+            if error[2]:
+                line += "\n" + _format_traceback(error[2]).rstrip("\n")
+        return line
+
+    entry = {"ts": timestamp, "level": level, "message": message, "thread": thread}
+    if request_id:
+        entry["request_id"] = request_id
+    if data:
+        entry["data"] = data
+    if error:
+        entry["error_type"], entry["error"], exc = error
+        if exc:
+            entry["traceback"] = _format_traceback(exc)
+    return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+_writer = _LogWriter()
+atexit.register(_writer.flush)
+
+
+def _format_traceback(error: BaseException) -> str:
+    return "".join(traceback.format_exception(type(error), error, error.__traceback__))
+
+
+def _emit(level: str, message: str, data: dict = None, error: Exception = None):
+    _writer.put((
+        time.time(),
+        level,
+        message,
+        _request_id.get(),
+        threading.current_thread().name,
+        data,
+        (
+            type(error).__name__,
+            str(error),
+            # Only raised exceptions have a traceback worth writing
+            error if error.__traceback__ is not None else None
+        ) if error is not None else None
+    ))
+
+
+def log_debug(message: str, data: dict = None, sample_rate: float = None):
+    """
+    Log debug message
+
+    Meant for per-call hot-path events; only a sampled fraction is written.
+
+    Args:
+        message: Log message
+        data: Structured fields
+        sample_rate: Fraction kept (default LOG_DEBUG_SAMPLE_RATE)
+    """
+    if LOG_LEVEL > LEVELS["DEBUG"]:
+        return
+    rate = LOG_DEBUG_SAMPLE_RATE if sample_rate is None else sample_rate
+    if rate < 1.0 and random.random() >= rate:
+        return
+    _emit("DEBUG", message, data)
 
 
 def log_info(message: str, data: dict = None):
     """Log info message"""
-    timestamp = datetime.now().isoformat()
-    print(f"[INFO] [{timestamp}] {message}")
-    if data:
-        print(f"  Data: {data}")
+    if LOG_LEVEL <= LEVELS["INFO"]:
+        _emit("INFO", message, data)
 
 
 def log_error(message: str, error: Exception = None):
     """Log error message"""
-    timestamp = datetime.now().isoformat()
-    print(f"[ERROR] [{timestamp}] {message}")
-    if error:
-        print(f"  Error: {str(error)}")
+    _emit("ERROR", message, error=error)
 
 
 def log_warning(message: str, data: dict = None):
     """Log warning message"""
-    timestamp = datetime.now().isoformat()
-    print(f"[WARNING] [{timestamp}] {message}")
-    if data:
-        print(f"  Data: {data}")
+    if LOG_LEVEL <= LEVELS["WARNING"]:
+        _emit("WARNING", message, data)
+
+
+def flush_logs(timeout: float = 2.0):
+    """Block until buffered records are written (e.g. on shutdown)"""
+    _writer.flush(timeout)
+
+
+def get_logger_stats() -> dict:
+    """Queue depth and records dropped because the buffer was full"""
+    return {
+        "level": next(name for name, value in LEVELS.items() if value == LOG_LEVEL),
+        "queued": _writer._queue.qsize(),
+        "capacity": _writer.maxsize,
+        "dropped": _writer.dropped
+    }
+
+
+def _collect_logger_metrics():
+    stats = get_logger_stats()
+    yield "hiresight_log_queue_depth", {}, stats["queued"]
+    yield "hiresight_log_dropped_total", {}, stats["dropped"]
+
+
+registry.register_collector(
+    _collect_logger_metrics,
+    help_texts={
+        "hiresight_log_queue_depth": "Log records waiting for the writer thread",
+        "hiresight_log_dropped_total": "Log records dropped because the queue was full"
+    },
+    types={"hiresight_log_dropped_total": "counter"}
+)
+
+
+class RequestIdMiddleware:
+    """
+    ASGI middleware binding a correlation ID to each request
+
+    Uses the caller's X-Request-ID when it is well formed, otherwise
+    generates one, and echoes it on the response.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope.get("headers", []):
+            if name == REQUEST_ID_HEADER:
+                candidate = value.decode("latin-1")
+                if _VALID_REQUEST_ID.match(candidate):
+                    request_id = candidate
+                break
+        if request_id is None:
+            request_id = uuid.uuid4().hex
+        header = (REQUEST_ID_HEADER, request_id.encode("latin-1"))
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": list(message.get("headers", [])) + [header]}
+            await send(message)
+
+        token = _request_id.set(request_id)
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            _request_id.reset(token)
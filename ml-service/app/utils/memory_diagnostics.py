@@ -0,0 +1,324 @@
+"""
+Memory introspection for long-running workers
+
+Two views for tracking down RSS growth:
+
+    - tracemalloc: started and stopped at runtime, snapshots kept in memory,
+      top allocation sites per snapshot and the diff between two snapshots
+    - structure sizes: approximate bytes and entry counts of the long-lived
+      structures (taxonomy, indexes, caches, spaCy vocab), registered by
+      name and exported as gauges
+
+Structure sizes are walked object by object, so they are cached for
+MEMORY_SIZE_INTERVAL seconds. /metrics scrapes only read the cache; a stale
+cache is re-measured on a background thread, so a scrape never waits for a
+walk. Setting PYTHONTRACEMALLOC=<frames> traces from
+interpreter start instead, which also covers import-time allocations.
+"""
+import gc
+import os
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.utils.logger import log_error, log_info
+from app.utils.timing import registry
+
+MEMORY_SIZE_INTERVAL = float(os.getenv("MEMORY_SIZE_INTERVAL", "60"))
+MEMORY_MAX_SNAPSHOTS = int(os.getenv("MEMORY_MAX_SNAPSHOTS", "4"))
+TRACEMALLOC_DEFAULT_FRAMES = int(os.getenv("TRACEMALLOC_FRAMES", "10"))
+
+# Objects visited per structure before a size walk gives up (the size is
+# then a lower bound)
+DEEP_SIZE_LIMIT = 5_000_000
+
+# Allocation sites excluded from snapshots: the tracer itself and imports
+_SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+GROUP_BY = ("lineno", "filename", "traceback")
+
+SizeFn = Callable[[], Optional[Tuple[int, int]]]
+
+
+def deep_sizeof(obj: Any, limit: int = DEEP_SIZE_LIMIT) -> Tuple[int, bool]:
+    """
+    Approximate bytes reachable from an object
+
+    Follows containers, instance ``__dict__`` and ``__slots__``; numpy arrays
+    count their buffers. Shared objects are counted once.
+
+    Args:
+        obj: Root object
+        limit: Most objects to visit
+
+    Returns:
+        (bytes, complete) where complete is False if the limit was hit
+    """
+    seen = set()
+    stack = [obj]
+    total = 0
+    while stack:
+        if len(seen) >= limit:
+            return total, False
+        item = stack.pop()
+        if id(item) in seen or isinstance(item, type):
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        if isinstance(item, np.ndarray):
+            # getsizeof already includes the buffer of an owning array
+            if item.base is not None:
+                total += item.nbytes
+            continue
+        if isinstance(item, (str, bytes, bytearray, int, float, bool)) or item is None:
+            continue
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset, deque)):
+            stack.extend(item)
+        if hasattr(item, "__dict__"):
+            stack.append(item.__dict__)
+        for slot in getattr(type(item), "__slots__", ()):
+            if isinstance(slot, str) and hasattr(item, slot):
+                stack.append(getattr(item, slot))
+    return total, True
+
+
+class Snapshot:
+    """
+    A tracemalloc snapshot and when it was taken
+    """
+
+    def __init__(self, snapshot: tracemalloc.Snapshot):
+        self.id = uuid.uuid4().hex[:12]
+        self.taken_at = time.time()
+        self.snapshot = snapshot.filter_traces(_SNAPSHOT_FILTERS)
+        self.traced_bytes = sum(trace.size for trace in self.snapshot.traces)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "taken_at": round(self.taken_at, 3),
+            "traced_bytes": self.traced_bytes,
+            "traceback_limit": self.snapshot.traceback_limit
+        }
+
+
+def _format_stat(stat, diff: bool) -> Dict[str, Any]:
+    entry = {
+        "site": str(stat.traceback[0]),
+        "size_bytes": stat.size,
+        "count": stat.count
+    }
+    if len(stat.traceback) > 1:
+        entry["traceback"] = stat.traceback.format()
+    if diff:
+        entry["size_diff_bytes"] = stat.size_diff
+        entry["count_diff"] = stat.count_diff
+    return entry
+
+
+class MemoryDiagnostics:
+    """
+    tracemalloc control, snapshot storage and structure size accounting
+    """
+
+    def __init__(self, size_interval: float = MEMORY_SIZE_INTERVAL, max_snapshots: int = MEMORY_MAX_SNAPSHOTS):
+        """
+        Args:
+            size_interval: Seconds a structure size measurement is reused
+            max_snapshots: Snapshots kept (oldest dropped first)
+        """
+        self.size_interval = size_interval
+        self.snapshots: "deque[Snapshot]" = deque(maxlen=max_snapshots)
+        self._structures: Dict[str, SizeFn] = {}
+        self._sizes: Dict[str, Dict[str, Any]] = {}
+        self._sized_at = 0.0
+        self._refreshing = False
+        self._lock = threading.Lock()
+        self._size_lock = threading.Lock()
+
+    # tracemalloc
+
+    def start_tracing(self, frames: int = TRACEMALLOC_DEFAULT_FRAMES) -> Dict[str, Any]:
+        """Start tracemalloc (a no-op if it is already tracing)"""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(max(1, frames))
+            log_info("tracemalloc started", {"frames": frames})
+        return self.tracing_status()
+
+    def stop_tracing(self) -> Dict[str, Any]:
+        """Stop tracemalloc and drop its traces; stored snapshots are kept"""
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+            log_info("tracemalloc stopped")
+        return self.tracing_status()
+
+    def tracing_status(self) -> Dict[str, Any]:
+        tracing = tracemalloc.is_tracing()
+        current, peak = tracemalloc.get_traced_memory() if tracing else (0, 0)
+        with self._lock:
+            snapshots = [snapshot.summary() for snapshot in self.snapshots]
+        return {
+            "tracing": tracing,
+            "frames": tracemalloc.get_traceback_limit() if tracing else None,
+            "traced_bytes": current,
+            "traced_peak_bytes": peak,
+            "tracemalloc_overhead_bytes": tracemalloc.get_tracemalloc_memory() if tracing else 0,
+            "snapshots": snapshots
+        }
+
+    def take_snapshot(self) -> Snapshot:
+        """
+        Snapshot the traced allocations
+
+        Raises:
+            RuntimeError: tracemalloc is not tracing
+        """
+        if not tracemalloc.is_tracing():
+            raise RuntimeError("tracemalloc is not tracing; start it first")
+        snapshot = Snapshot(tracemalloc.take_snapshot())
+        with self._lock:
+            self.snapshots.append(snapshot)
+        return snapshot
+
+    def get_snapshot(self, snapshot_id: str) -> Optional[Snapshot]:
+        with self._lock:
+            return next((snapshot for snapshot in self.snapshots if snapshot.id == snapshot_id), None)
+
+    def previous_snapshot(self, snapshot_id: str) -> Optional[Snapshot]:
+        """Snapshot taken just before the given one"""
+        with self._lock:
+            snapshots = list(self.snapshots)
+        for earlier, later in zip(snapshots, snapshots[1:]):
+            if later.id == snapshot_id:
+                return earlier
+        return None
+
+    def top(self, snapshot: Snapshot, group_by: str = "lineno", limit: int = 25) -> List[Dict[str, Any]]:
+        """Largest allocation sites of a snapshot"""
+        stats = snapshot.snapshot.statistics(group_by)
+        return [_format_stat(stat, diff=False) for stat in stats[:limit]]
+
+    def diff(self, snapshot: Snapshot, base: Snapshot, group_by: str = "lineno",
+             limit: int = 25) -> List[Dict[str, Any]]:
+        """Allocation sites that grew the most between two snapshots"""
+        stats = snapshot.snapshot.compare_to(base.snapshot, group_by)
+        return [_format_stat(stat, diff=True) for stat in stats[:limit]]
+
+    # Structure sizes
+
+    def register(self, name: str, size_fn: SizeFn):
+        """
+        Track a long-lived structure
+
+        Args:
+            name: Label in reports and the ``structure`` label of the gauges
+            size_fn: Returns (bytes, entries), or None while the structure
+                does not exist
+        """
+        with self._size_lock:
+            self._structures[name] = size_fn
+            self._sized_at = 0.0
+
+    def structure_sizes(self, refresh: bool = False) -> Dict[str, Dict[str, Any]]:
+        """
+        Approximate size of every registered structure
+
+        Args:
+            refresh: Measure now instead of reusing a recent measurement
+
+        Returns:
+            {name: {"bytes", "entries", "measure_ms"}} (or {"error"})
+        """
+        with self._size_lock:
+            if refresh or time.monotonic() - self._sized_at >= self.size_interval:
+                sizes = {}
+                for name, size_fn in self._structures.items():
+                    started = time.perf_counter()
+                    try:
+                        measured = size_fn()
+                    except Exception as e:
+                        log_error(f"Sizing {name} failed", e)
+                        sizes[name] = {"error": str(e)}
+                        continue
+                    if measured is None:
+                        continue
+                    nbytes, entries = measured
+                    sizes[name] = {
+                        "bytes": int(nbytes),
+                        "entries": int(entries),
+                        "measure_ms": round((time.perf_counter() - started) * 1000, 3)
+                    }
+                self._sizes = sizes
+                self._sized_at = time.monotonic()
+            return dict(self._sizes)
+
+    def cached_structure_sizes(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Last measured structure sizes, without measuring
+
+        A stale measurement is refreshed on a background thread; until that
+        finishes the previous sizes are returned (none before the first).
+        """
+        if time.monotonic() - self._sized_at >= self.size_interval:
+            with self._lock:
+                start = not self._refreshing
+                self._refreshing = True
+            if start:
+                threading.Thread(target=self._refresh_in_background, name="structure-sizes", daemon=True).start()
+        return dict(self._sizes)
+
+    def _refresh_in_background(self):
+        try:
+            self.structure_sizes()
+        except Exception as e:
+            log_error("Measuring structure sizes failed", e)
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def report(self, refresh: bool = False) -> Dict[str, Any]:
+        return {
+            "structures": self.structure_sizes(refresh),
+            "gc": {
+                "counts": list(gc.get_count()),
+                "objects": len(gc.get_objects()) if refresh else None,
+                "garbage": len(gc.garbage)
+            },
+            "tracemalloc": self.tracing_status()
+        }
+
+    def collect_metrics(self) -> Iterable[Tuple[str, Dict[str, str], float]]:
+        """Structure size gauges for /metrics (never walks on the caller's thread)"""
+        for name, size in self.cached_structure_sizes().items():
+            if "bytes" in size:
+                yield "hiresight_structure_bytes", {"structure": name}, size["bytes"]
+                yield "hiresight_structure_entries", {"structure": name}, size["entries"]
+        if tracemalloc.is_tracing():
+            yield "hiresight_tracemalloc_traced_bytes", {}, tracemalloc.get_traced_memory()[0]
+
+
+# Process-wide diagnostics
+memory_diagnostics = MemoryDiagnostics()
+
+registry.register_collector(
+    memory_diagnostics.collect_metrics,
+    help_texts={
+        "hiresight_structure_bytes": "Approximate bytes held by a long-lived structure",
+        "hiresight_structure_entries": "Entries in a long-lived structure",
+        "hiresight_tracemalloc_traced_bytes": "Bytes currently traced by tracemalloc"
+    }
+)
@@ -0,0 +1,169 @@
+"""
+Micro-batching of concurrent spaCy calls
+
+Many small concurrent extractions each calling ``nlp(text)`` leave most of
+spaCy's batching unused. Callers here hand their text to a single batcher
+thread and block; the thread collects texts for up to ``max_wait`` seconds
+or ``max_batch`` documents, runs one ``nlp.pipe`` over them and hands every
+caller its own Doc. The wait only applies while the previous batch had
+company, so a lone caller is not delayed; time spent queued for the batcher
+is recorded as the ``nlp_batch_wait`` stage.
+"""
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Tuple
+
+from app.utils.logger import log_error
+from app.utils.timing import record_stage, registry
+
+NLP_BATCH_ENABLED = os.getenv("NLP_BATCH_ENABLED", "true").lower() == "true"
+NLP_BATCH_MAX_WAIT_MS = float(os.getenv("NLP_BATCH_MAX_WAIT_MS", "2"))
+NLP_BATCH_MAX_SIZE = max(1, int(os.getenv("NLP_BATCH_MAX_SIZE", "32")))
+
+# Upper bounds for the batch size histogram
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+
+
+class NlpBatcher:
+    """
+    Collects concurrent ``nlp(text)`` calls into shared ``nlp.pipe`` runs
+    """
+
+    def __init__(
+        self,
+        nlp: Callable,
+        max_wait: float = NLP_BATCH_MAX_WAIT_MS / 1000,
+        max_batch: int = NLP_BATCH_MAX_SIZE
+    ):
+        """
+        Args:
+            nlp: Loaded spaCy Language
+            max_wait: Longest time (seconds) to hold the first text of a batch
+            max_batch: Most texts per nlp.pipe call
+        """
+        self.nlp = nlp
+        self.max_wait = max_wait
+        self.max_batch = max_batch
+        self.batches = 0
+        self.docs = 0
+        self.failures = 0
+        self.size_counts = [0] * (len(BATCH_SIZE_BUCKETS) + 1)
+        self._queue: "queue.Queue[Tuple[str, float, Future]]" = queue.Queue()
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def __call__(self, text: str) -> Any:
+        """
+        Process one text as part of the next batch (blocking)
+
+        Args:
+            text: Text to analyze
+
+        Returns:
+            spaCy Doc
+        """
+        self._ensure_thread()
+        future: Future = Future()
+        self._queue.put((text, time.perf_counter(), future))
+        doc, waited = future.result()
+        record_stage("nlp_batch_wait", waited)
+        return doc
+
+    def _ensure_thread(self):
+        # Started lazily and again after a fork: the parent's thread does
+        # not exist in a pre-forked worker
+        if self._pid == os.getpid() and self._thread is not None:
+            return
+        with self._lock:
+            if self._pid != os.getpid() or self._thread is None:
+                self._queue = queue.Queue()
+                self._thread = threading.Thread(target=self._run, name="nlp-batcher", daemon=True)
+                self._thread.start()
+                self._pid = os.getpid()
+
+    def _collect(self, pending: "queue.Queue", wait: bool) -> List[Tuple[str, float, Future]]:
+        batch = [pending.get()]
+        deadline = time.perf_counter() + (self.max_wait if wait else 0.0)
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            try:
+                batch.append(pending.get(timeout=remaining) if remaining > 0 else pending.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        pending = self._queue
+        last_size = 1
+        while True:
+            # Hold the batch open only while requests are arriving
+            # concurrently; a lone caller is processed straight away
+            batch = self._collect(pending, wait=last_size > 1)
+            last_size = len(batch)
+            started = time.perf_counter()
+            try:
+                docs = list(self.nlp.pipe([text for text, _, _ in batch], batch_size=len(batch)))
+            except Exception as e:
+                # One bad text must not fail the others: retry one by one
+                log_error("nlp.pipe batch failed; processing texts individually", e)
+                self.failures += 1
+                docs = []
+                for text, _, _ in batch:
+                    try:
+                        docs.append(self.nlp(text))
+                    except Exception as item_error:
+                        docs.append(item_error)
+            self._record(len(batch), time.perf_counter() - started)
+            for (_, enqueued, future), doc in zip(batch, docs):
+                if isinstance(doc, Exception):
+                    future.set_exception(doc)
+                else:
+                    future.set_result((doc, started - enqueued))
+
+    def _record(self, size: int, seconds: float):
+        self.batches += 1
+        self.docs += size
+        index = next((i for i, bound in enumerate(BATCH_SIZE_BUCKETS) if size <= bound), len(BATCH_SIZE_BUCKETS))
+        self.size_counts[index] += 1
+        registry.histogram(
+            "hiresight_nlp_batch_seconds", (), "Duration of each shared nlp.pipe call"
+        ).observe(seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_wait_ms": round(self.max_wait * 1000, 3),
+            "max_batch": self.max_batch,
+            "batches": self.batches,
+            "docs": self.docs,
+            "avg_batch_size": round(self.docs / self.batches, 2) if self.batches else 0.0,
+            "batch_sizes": {
+                label: count
+                for label, count in zip([f"<={bound}" for bound in BATCH_SIZE_BUCKETS] + ["more"], self.size_counts)
+                if count
+            },
+            "failed_batches": self.failures
+        }
+
+    def collect_metrics(self):
+        """Batch counters for /metrics"""
+        yield "hiresight_nlp_batches_total", {}, self.batches
+        yield "hiresight_nlp_batched_docs_total", {}, self.docs
+
+
+def register_batcher_metrics(batcher: NlpBatcher):
+    """Export a batcher's counters in /metrics"""
+    registry.register_collector(
+        batcher.collect_metrics,
+        help_texts={
+            "hiresight_nlp_batches_total": "nlp.pipe calls made by the micro-batcher",
+            "hiresight_nlp_batched_docs_total": "Documents processed through the micro-batcher"
+        },
+        types={
+            "hiresight_nlp_batches_total": "counter",
+            "hiresight_nlp_batched_docs_total": "counter"
+        }
+    )
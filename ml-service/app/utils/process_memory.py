@@ -0,0 +1,178 @@
+"""
+Per-process memory accounting from /proc
+
+USS (unique set size: private clean + private dirty pages) is the memory
+a worker would free if it exited, which is what matters when sizing a
+pre-forked worker fleet. RSS counts pages shared copy-on-write with the
+parent once per worker and overstates the total.
+"""
+import os
+from typing import Dict, List, Optional
+
+# Set by the pre-fork launcher (app.server) in every worker
+PARENT_PID_ENV = "HIRESIGHT_PREFORK_PARENT"
+
+_ROLLUP_FIELDS = {
+    "Rss": "rss",
+    "Pss": "pss",
+    "Shared_Clean": "shared_clean",
+    "Shared_Dirty": "shared_dirty",
+    "Private_Clean": "private_clean",
+    "Private_Dirty": "private_dirty",
+    "Swap": "swap"
+}
+
+
+def read_memory(pid: int) -> Optional[Dict[str, int]]:
+    """
+    Memory of one process in bytes
+
+    Args:
+        pid: Process id
+
+    Returns:
+        Dict with rss, pss, uss, shared and swap, or None if the process is gone
+        (pss/uss are None on kernels without smaps_rollup)
+    """
+    try:
+        with open(f"/proc/{pid}/smaps_rollup", "r") as f:
+            values = {}
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 2 and parts[0].rstrip(":") in _ROLLUP_FIELDS:
+                    values[_ROLLUP_FIELDS[parts[0].rstrip(":")]] = int(parts[1]) * 1024
+        return {
+            "pid": pid,
+            "rss": values.get("rss", 0),
+            "pss": values.get("pss", 0),
+            "uss": values.get("private_clean", 0) + values.get("private_dirty", 0),
+            "shared": values.get("shared_clean", 0) + values.get("shared_dirty", 0),
+            "swap": values.get("swap", 0),
+            "open_fds": count_open_fds(pid)
+        }
+    except FileNotFoundError:
+        if not os.path.exists(f"/proc/{pid}"):
+            return None
+    except (PermissionError, ProcessLookupError):
+        return None
+
+    # Older kernels: RSS only
+    try:
+        with open(f"/proc/{pid}/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    rss = int(line.split()[1]) * 1024
+                    return {"pid": pid, "rss": rss, "pss": None, "uss": None, "shared": None, "swap": None,
+                            "open_fds": count_open_fds(pid)}
+    except OSError:
+        pass
+    return None
+
+
+def count_open_fds(pid: int) -> Optional[int]:
+    """
+    Open file descriptors of a process
+
+    Args:
+        pid: Process id
+
+    Returns:
+        Descriptor count, or None if /proc/<pid>/fd is not readable
+    """
+    try:
+        return len(os.listdir(f"/proc/{pid}/fd"))
+    except OSError:
+        return None
+
+
+def directory_usage(path) -> Dict[str, int]:
+    """
+    Files and bytes under a directory (recursive; 0 if it does not exist)
+
+    Args:
+        path: Directory path
+
+    Returns:
+        Dict with files and bytes
+    """
+    files = 0
+    total = 0
+    for root, _, names in os.walk(path):
+        for name in names:
+            try:
+                total += os.stat(os.path.join(root, name)).st_size
+                files += 1
+            except OSError:
+                continue
+    return {"files": files, "bytes": total}
+
+
+def child_pids(pid: int) -> List[int]:
+    """
+    Direct children of a process
+
+    Args:
+        pid: Parent process id
+
+    Returns:
+        Child process ids
+    """
+    children = []
+    try:
+        for task in os.listdir(f"/proc/{pid}/task"):
+            with open(f"/proc/{pid}/task/{task}/children", "r") as f:
+                children.extend(int(child) for child in f.read().split())
+    except OSError:
+        pass
+    return sorted(set(children))
+
+
+def memory_report(parent_pid: int, worker_pids: Optional[List[int]] = None) -> Dict[str, any]:
+    """
+    Memory of a pre-fork parent and its workers
+
+    Args:
+        parent_pid: Launcher process id
+        worker_pids: Worker ids (default: the parent's children)
+
+    Returns:
+        Dict with parent, workers and totals; total_uss + parent rss
+        approximates the fleet's real footprint
+    """
+    pids = worker_pids if worker_pids is not None else child_pids(parent_pid)
+    workers = [usage for usage in (read_memory(pid) for pid in pids) if usage is not None]
+    return {
+        "parent": read_memory(parent_pid),
+        "workers": workers,
+        "total_uss": sum(worker["uss"] or 0 for worker in workers),
+        "total_pss": sum(worker["pss"] or 0 for worker in workers),
+        "total_rss": sum(worker["rss"] for worker in workers),
+        "total_open_fds": sum(worker["open_fds"] or 0 for worker in workers)
+    }
+
+
+def format_megabytes(value: Optional[int]) -> str:
+    """Bytes as a short MB string"""
+    return "n/a" if value is None else f"{value / (1024 * 1024):.1f} MB"
+
+
+def current_report() -> Dict[str, any]:
+    """
+    Memory report for the fleet this process belongs to
+
+    Returns:
+        memory_report of the pre-fork parent, or of this process alone
+        when not running under the launcher
+    """
+    parent = os.getenv(PARENT_PID_ENV)
+    if parent and parent.isdigit() and int(parent) == os.getppid():
+        return memory_report(int(parent))
+    own = read_memory(os.getpid())
+    return {
+        "parent": None,
+        "workers": [own] if own else [],
+        "total_uss": (own or {}).get("uss") or 0,
+        "total_pss": (own or {}).get("pss") or 0,
+        "total_rss": (own or {}).get("rss") or 0,
+        "total_open_fds": (own or {}).get("open_fds") or 0
+    }
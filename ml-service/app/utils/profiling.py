@@ -0,0 +1,391 @@
+"""
+On-demand request profiling
+
+When enabled (PROFILING_ENABLED or POST /admin/profiling), a fraction of
+requests, plus requests sent with ``X-Profile: 1``, are profiled. A
+profiled request's work on the executor pools (where parse_pdf, spaCy and
+the matcher run) is recorded two ways:
+
+    - cProfile, merged across the request's worker calls and served as a
+      pstats file (``python -m pstats``, snakeviz)
+    - a stack sampler every PROFILE_SAMPLE_INTERVAL_MS, served as collapsed
+      stacks (``flamegraph.pl``, speedscope)
+
+Profiles are stored in memory with the endpoint, status and stage timings
+of the request. The event loop thread is shared with other requests and is
+not profiled, nor are the spaCy batcher thread and the parse process pool;
+their time shows up as waits in the profile and in the stage timings.
+
+When disabled the middleware costs one attribute check per request and the
+executor pools one context variable read per call.
+"""
+import contextvars
+import cProfile
+import io
+import marshal
+import os
+import pstats
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from typing import Any, Callable, Dict, List, Optional
+
+from app.utils.logger import get_request_id
+from app.utils.timing import registry, request_stages
+
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0.01"))
+PROFILE_SAMPLE_INTERVAL_MS = float(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", "5"))
+PROFILE_MAX_STORED = int(os.getenv("PROFILE_MAX_STORED", "50"))
+# Profiled requests in flight at once; further requests run unprofiled
+PROFILE_MAX_CONCURRENT = int(os.getenv("PROFILE_MAX_CONCURRENT", "4"))
+
+PROFILE_HEADER = b"x-profile"
+_TRUTHY = (b"1", b"true", b"yes")
+
+# Deepest stack kept by the sampler
+MAX_STACK_DEPTH = 128
+
+# Profile of the request being served
+_current: contextvars.ContextVar[Optional["RequestProfile"]] = contextvars.ContextVar(
+    "request_profile", default=None
+)
+
+
+class RequestProfile:
+    """
+    Profiling data of one request
+    """
+
+    def __init__(self, method: str, path: str, trigger: str):
+        self.id = uuid.uuid4().hex[:16]
+        self.method = method
+        self.path = path
+        self.trigger = trigger
+        self.request_id = get_request_id()
+        self.started_at = time.time()
+        self.duration = 0.0
+        self.status = None
+        self.endpoint = None
+        self.stages: List = []
+        self.profiled_seconds = 0.0
+        self.sampled_only_segments = 0
+        self.samples: Counter = Counter()
+        self.finished = False
+        self._profiles: List[cProfile.Profile] = []
+        self._stats: Optional[pstats.Stats] = None
+        self._lock = threading.Lock()
+
+    def add_segment(self, profile: Optional[cProfile.Profile], seconds: float):
+        """Record a worker call; profile is None when only the sampler saw it"""
+        with self._lock:
+            if not self.finished:
+                if profile is not None:
+                    self._profiles.append(profile)
+                else:
+                    self.sampled_only_segments += 1
+                self.profiled_seconds += seconds
+
+    def add_sample(self, stack: str):
+        with self._lock:
+            if not self.finished:
+                self.samples[stack] += 1
+
+    def finish(self, status: Optional[int], endpoint: Optional[str], stages: List, duration: float):
+        with self._lock:
+            self.finished = True
+            self.status = status
+            self.endpoint = endpoint
+            self.stages = list(stages)
+            self.duration = duration
+            profiles, self._profiles = self._profiles, []
+        if profiles:
+            stats = pstats.Stats(profiles[0])
+            for profile in profiles[1:]:
+                stats.add(profile)
+            self._stats = stats
+
+    def pstats_bytes(self) -> Optional[bytes]:
+        """Stats in the marshal format written by ``pstats.Stats.dump_stats``"""
+        return marshal.dumps(self._stats.stats) if self._stats is not None else None
+
+    def collapsed(self) -> str:
+        """Sampled stacks as 'frame;frame;frame count' lines"""
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+    def top_functions(self, limit: int = 25, sort: str = "cumulative") -> str:
+        """pstats table of the most expensive functions"""
+        if self._stats is None:
+            return ""
+        out = io.StringIO()
+        stats = pstats.Stats(stream=out)
+        stats.add(self._stats)
+        stats.sort_stats(sort).print_stats(limit)
+        return out.getvalue()
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "endpoint": self.endpoint,
+            "status": self.status,
+            "trigger": self.trigger,
+            "request_id": self.request_id,
+            "started_at": round(self.started_at, 3),
+            "duration_ms": round(self.duration * 1000, 3),
+            "profiled_ms": round(self.profiled_seconds * 1000, 3),
+            "sampled_only_segments": self.sampled_only_segments,
+            "samples": sum(self.samples.values()),
+            "stages": [{"stage": name, "ms": round(seconds * 1000, 3)} for name, seconds in self.stages]
+        }
+
+
+class Profiler:
+    """
+    Chooses requests to profile, samples worker threads and keeps results
+    """
+
+    def __init__(
+        self,
+        enabled: bool = PROFILING_ENABLED,
+        sample_rate: float = PROFILE_SAMPLE_RATE,
+        interval: float = PROFILE_SAMPLE_INTERVAL_MS / 1000,
+        max_stored: int = PROFILE_MAX_STORED,
+        max_concurrent: int = PROFILE_MAX_CONCURRENT
+    ):
+        """
+        Args:
+            enabled: Profile anything at all
+            sample_rate: Fraction of requests profiled without the header
+            interval: Seconds between stack samples
+            max_stored: Finished profiles kept (oldest dropped first)
+            max_concurrent: Profiled requests in flight at once
+        """
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.interval = interval
+        self.max_concurrent = max_concurrent
+        self.profiles: "deque[RequestProfile]" = deque(maxlen=max_stored)
+        self.active = 0
+        self.skipped = 0
+        # Segments that could not get cProfile (held by another segment)
+        self.sampled_only = 0
+        # Worker thread ident -> profile it is running for
+        self._threads: Dict[int, RequestProfile] = {}
+        self._wake = threading.Event()
+        self._sampler = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def configure(self, enabled: Optional[bool] = None, sample_rate: Optional[float] = None):
+        if enabled is not None:
+            self.enabled = enabled
+        if sample_rate is not None:
+            self.sample_rate = min(1.0, max(0.0, sample_rate))
+
+    def start(self, method: str, path: str, forced: bool) -> Optional[RequestProfile]:
+        """
+        Begin profiling a request if it is selected
+
+        Args:
+            method: HTTP method
+            path: Request path
+            forced: The request asked for profiling with the header
+
+        Returns:
+            The profile, or None if the request is not profiled
+        """
+        if not forced and random.random() >= self.sample_rate:
+            return None
+        with self._lock:
+            if self.active >= self.max_concurrent:
+                self.skipped += 1
+                return None
+            self.active += 1
+        return RequestProfile(method, path, "header" if forced else "sample")
+
+    def finish(self, profile: RequestProfile, status: Optional[int], endpoint: Optional[str],
+               stages: List, duration: float):
+        profile.finish(status, endpoint, stages, duration)
+        with self._lock:
+            self.active -= 1
+            self.profiles.append(profile)
+        registry.inc(
+            "hiresight_profiles_captured_total",
+            (("trigger", profile.trigger),),
+            help_text="Requests profiled, by what selected them"
+        )
+
+    def get(self, profile_id: str) -> Optional[RequestProfile]:
+        with self._lock:
+            return next((profile for profile in self.profiles if profile.id == profile_id), None)
+
+    def clear(self) -> int:
+        with self._lock:
+            count = len(self.profiles)
+            self.profiles.clear()
+            return count
+
+    def run_segment(self, profile: RequestProfile, fn: Callable, *args, **kwargs):
+        """
+        Run a worker-thread call under cProfile and the stack sampler
+
+        From Python 3.12 cProfile is one interpreter-wide tool, so only one
+        segment can hold it at a time; concurrent segments run under the
+        sampler alone.
+        """
+        ident = threading.get_ident()
+        self._ensure_sampler()
+        segment = cProfile.Profile()
+        enabled = False
+        started = time.perf_counter()
+        try:
+            with self._lock:
+                self._threads[ident] = profile
+            self._wake.set()
+            try:
+                segment.enable()
+                enabled = True
+            except ValueError:
+                # "Another profiling tool is already active"
+                with self._lock:
+                    self.sampled_only += 1
+            return fn(*args, **kwargs)
+        finally:
+            if enabled:
+                segment.disable()
+            with self._lock:
+                self._threads.pop(ident, None)
+            profile.add_segment(segment if enabled else None, time.perf_counter() - started)
+
+    def _ensure_sampler(self):
+        # Started on first use and again after a fork
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                self._threads = {}
+                self._wake = threading.Event()
+                self._sampler = threading.Thread(target=self._sample_loop, name="profile-sampler", daemon=True)
+                self._sampler.start()
+                self._pid = os.getpid()
+
+    def _sample_loop(self):
+        while True:
+            with self._lock:
+                threads = dict(self._threads)
+                if not threads:
+                    self._wake.clear()
+            if not threads:
+                self._wake.wait()
+                continue
+            frames = sys._current_frames()
+            for ident, profile in threads.items():
+                frame = frames.get(ident)
+                stack = _collapse(frame) if frame is not None else ""
+                if stack:
+                    profile.add_sample(stack)
+            time.sleep(self.interval)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            profiles = [profile.summary() for profile in reversed(self.profiles)]
+        return {
+            "enabled": self.enabled,
+            "sample_rate": self.sample_rate,
+            "sample_interval_ms": round(self.interval * 1000, 3),
+            "max_stored": self.profiles.maxlen,
+            "max_concurrent": self.max_concurrent,
+            "active": self.active,
+            "skipped": self.skipped,
+            "sampled_only_segments": self.sampled_only,
+            "profiles": profiles
+        }
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(";", ":")
+
+
+def _collapse(frame) -> str:
+    # Stacks start at the profiled call; the executor frames above it are noise
+    names = []
+    while frame is not None and frame.f_code is not _SEGMENT_CODE and len(names) < MAX_STACK_DEPTH:
+        names.append(_frame_name(frame))
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+_SEGMENT_CODE = Profiler.run_segment.__code__
+
+# Process-wide profiler
+profiler = Profiler()
+
+
+def profiled_call(fn: Callable, *args, **kwargs):
+    """
+    Call ``fn``, profiling it if the current request is being profiled
+
+    Used by the executor pools inside the caller's copied context.
+    """
+    profile = _current.get()
+    if profile is None or profile.finished:
+        return fn(*args, **kwargs)
+    return profiler.run_segment(profile, fn, *args, **kwargs)
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware selecting requests to profile and recording the result
+
+    Profiled responses carry an ``X-Profile-ID`` header naming the stored
+    profile.
+    """
+
+    def __init__(self, app, profiler: Profiler = profiler):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send):
+        if not self.profiler.enabled or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        forced = any(
+            key == PROFILE_HEADER and value.lower() in _TRUTHY
+            for key, value in scope.get("headers", ())
+        )
+        profile = self.profiler.start(scope.get("method", ""), scope.get("path", ""), forced)
+        if profile is None:
+            await self.app(scope, receive, send)
+            return
+
+        token = _current.set(profile)
+        started = time.perf_counter()
+        status = {"code": None}
+
+        async def send_with_profile(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"x-profile-id", profile.id.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_profile)
+        finally:
+            _current.reset(token)
+            route = scope.get("route")
+            self.profiler.finish(
+                profile,
+                status["code"],
+                getattr(route, "path", None),
+                request_stages() or [],
+                time.perf_counter() - started
+            )
@@ -0,0 +1,424 @@
+"""
+Resilience primitives for outbound model calls
+
+Provides a rolling-window circuit breaker, capped exponential retries with
+jitter, optional hedged requests and deadline budgets.
+"""
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Optional
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the breaker is open"""
+
+
+class DeadlineExceeded(Exception):
+    """Raised when the caller's time budget runs out"""
+
+
+class Deadline:
+    """
+    Absolute time budget shared by every attempt of one logical call
+    """
+
+    def __init__(self, timeout: Optional[float] = None):
+        """
+        Args:
+            timeout: Seconds available from now (None means unbounded)
+        """
+        self.expires_at = time.monotonic() + timeout if timeout is not None else None
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left, or None when unbounded"""
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        """Whether the budget is used up"""
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
+
+    def cap(self, timeout: float) -> float:
+        """Clamp a per-attempt timeout to what is left of the budget"""
+        remaining = self.remaining()
+        return timeout if remaining is None else min(timeout, remaining)
+
+
+class CircuitBreaker:
+    """
+    Rolling-window circuit breaker
+
+    Opens when the failure rate over the last ``window_seconds`` exceeds
+    ``failure_rate_threshold`` (given at least ``minimum_calls`` outcomes),
+    stays open for ``open_seconds`` and then lets a limited number of
+    probe calls through in the half-open state.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_rate_threshold: float = 0.5,
+        minimum_calls: int = 5,
+        window_seconds: float = 60.0,
+        open_seconds: float = 30.0,
+        half_open_max_calls: int = 1
+    ):
+        self.failure_rate_threshold = failure_rate_threshold
+        self.minimum_calls = minimum_calls
+        self.window_seconds = window_seconds
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+
+        self._lock = threading.Lock()
+        self._outcomes = deque()  # (timestamp, succeeded)
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._half_open_in_flight = 0
+        self._times_opened = 0
+
+    @property
+    def state(self) -> str:
+        """Current state, promoting open to half-open once the cool-down passed"""
+        with self._lock:
+            self._maybe_half_open(time.monotonic())
+            return self._state
+
+    def is_open(self) -> bool:
+        """True while calls would be rejected without consuming a probe slot"""
+        return self.state == self.OPEN
+
+    def allow_request(self) -> bool:
+        """
+        Check whether a call may proceed
+
+        Returns:
+            False when the breaker is open or all half-open probes are in flight
+        """
+        with self._lock:
+            self._maybe_half_open(time.monotonic())
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN and self._half_open_in_flight < self.half_open_max_calls:
+                self._half_open_in_flight += 1
+                return True
+            return False
+
+    def record_success(self):
+        """Record a successful call"""
+        with self._lock:
+            now = time.monotonic()
+            if self._state == self.HALF_OPEN:
+                self._state = self.CLOSED
+                self._half_open_in_flight = 0
+                self._outcomes.clear()
+            self._outcomes.append((now, True))
+            self._trim(now)
+
+    def record_ignored(self):
+        """
+        Record a call whose outcome says nothing about the dependency's health
+
+        Counts toward neither success nor failure; only frees the half-open
+        probe slot the call held.
+        """
+        with self._lock:
+            if self._state == self.HALF_OPEN and self._half_open_in_flight > 0:
+                self._half_open_in_flight -= 1
+
+    def record_failure(self):
+        """Record a failed call and open the breaker if the window warrants it"""
+        with self._lock:
+            now = time.monotonic()
+            if self._state == self.HALF_OPEN:
+                self._open(now)
+                return
+            self._outcomes.append((now, False))
+            self._trim(now)
+            total = len(self._outcomes)
+            if self._state == self.CLOSED and total >= self.minimum_calls:
+                failures = sum(1 for _, ok in self._outcomes if not ok)
+                if failures / total >= self.failure_rate_threshold:
+                    self._open(now)
+
+    def stats(self) -> Dict[str, any]:
+        """Snapshot of breaker state and window counts"""
+        with self._lock:
+            now = time.monotonic()
+            self._maybe_half_open(now)
+            self._trim(now)
+            failures = sum(1 for _, ok in self._outcomes if not ok)
+            return {
+                "state": self._state,
+                "window_calls": len(self._outcomes),
+                "window_failures": failures,
+                "times_opened": self._times_opened
+            }
+
+    def _open(self, now: float):
+        self._state = self.OPEN
+        self._opened_at = now
+        self._half_open_in_flight = 0
+        self._times_opened += 1
+
+    def _maybe_half_open(self, now: float):
+        if self._state == self.OPEN and now - self._opened_at >= self.open_seconds:
+            self._state = self.HALF_OPEN
+            self._half_open_in_flight = 0
+
+    def _trim(self, now: float):
+        cutoff = now - self.window_seconds
+        while self._outcomes and self._outcomes[0][0] < cutoff:
+            self._outcomes.popleft()
+
+
+class RetryPolicy:
+    """
+    Capped exponential backoff with full jitter
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 2,
+        base_delay: float = 0.5,
+        max_delay: float = 4.0,
+        is_retryable: Optional[Callable[[Exception], bool]] = None
+    ):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.is_retryable = is_retryable or (lambda e: True)
+
+    def delay(self, retry_number: int) -> float:
+        """
+        Sleep before the given retry (1-based)
+
+        Returns:
+            Random delay in [0, min(max_delay, base_delay * 2^(n-1))]
+        """
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (retry_number - 1)))
+        return random.uniform(0, ceiling)
+
+
+class LatencyTracker:
+    """
+    Ring buffer of recent successful latencies for percentile estimates
+    """
+
+    def __init__(self, size: int = 200):
+        self._samples = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """
+        Args:
+            pct: Percentile in [0, 100]
+
+        Returns:
+            Latency in seconds, or None without enough samples
+        """
+        with self._lock:
+            if len(self._samples) < 10:
+                return None
+            ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+
+class ResilientCaller:
+    """
+    Wraps a blocking call with breaker, retries, hedging and deadlines
+
+    The wrapped function receives the per-attempt timeout in seconds so it
+    can hand it to the underlying client. Without hedging, attempts run on
+    the caller's thread and the client enforces that timeout; with hedging,
+    attempts run on a private executor so a hedge can race the primary.
+    """
+
+    # Extra attempts a hedged attempt may start
+    HEDGES_PER_ATTEMPT = 1
+
+    def __init__(
+        self,
+        name: str,
+        breaker: Optional[CircuitBreaker] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        attempt_timeout: float = 20.0,
+        hedge: bool = False,
+        hedge_percentile: float = 95.0,
+        max_callers: int = 8
+    ):
+        """
+        Args:
+            name: Name used in errors, stats and thread names
+            breaker: Circuit breaker (default settings if omitted)
+            retry_policy: Retry policy (default settings if omitted)
+            attempt_timeout: Seconds per attempt, capped by the deadline
+            hedge: Race a second attempt once the observed latency percentile passes
+            hedge_percentile: Latency percentile that triggers a hedge
+            max_callers: Threads that may call at once (the calling pool's
+                size); the hedging executor gets one thread per attempt each
+                of them can have running
+        """
+        self.name = name
+        self.breaker = breaker or CircuitBreaker()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.attempt_timeout = attempt_timeout
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.latency = LatencyTracker()
+
+        self._executor = None
+        if hedge:
+            self._executor = ThreadPoolExecutor(
+                max_workers=max(1, max_callers) * (1 + self.HEDGES_PER_ATTEMPT),
+                thread_name_prefix=f"{name}-call"
+            )
+        self._lock = threading.Lock()
+        self._counters = {
+            "calls": 0,
+            "successes": 0,
+            "failures": 0,
+            "retries": 0,
+            "timeouts": 0,
+            "hedges": 0,
+            "hedge_wins": 0,
+            "short_circuited": 0,
+            "deadline_exceeded": 0
+        }
+
+    def call(self, fn: Callable[[float], any], deadline: Optional[Deadline] = None) -> any:
+        """
+        Run ``fn`` under the resilience policy
+
+        Args:
+            fn: Callable taking the per-attempt timeout in seconds
+            deadline: Optional caller budget shared by all attempts
+
+        Returns:
+            Result of the first successful attempt
+
+        Raises:
+            CircuitOpenError: Breaker rejected the call
+            DeadlineExceeded: Budget ran out before a successful attempt
+            Exception: Last error once retries are exhausted
+        """
+        deadline = deadline or Deadline()
+        self._count("calls")
+        last_error = None
+
+        for attempt in range(self.retry_policy.max_retries + 1):
+            if attempt > 0:
+                self._count("retries")
+                pause = self.retry_policy.delay(attempt)
+                remaining = deadline.remaining()
+                if remaining is not None and pause >= remaining:
+                    break
+                time.sleep(pause)
+
+            if deadline.expired():
+                break
+
+            if not self.breaker.allow_request():
+                self._count("short_circuited")
+                raise CircuitOpenError(f"{self.name} circuit is open")
+
+            try:
+                result = self._attempt(fn, deadline)
+            except Exception as e:
+                last_error = e
+                if not self.retry_policy.is_retryable(e):
+                    # Client errors (bad arguments, bad key) are not outages
+                    self.breaker.record_ignored()
+                    break
+                self.breaker.record_failure()
+                continue
+
+            self.breaker.record_success()
+            self._count("successes")
+            return result
+
+        self._count("failures")
+        if last_error is None or deadline.expired():
+            self._count("deadline_exceeded")
+            raise DeadlineExceeded(f"{self.name} deadline exceeded") from last_error
+        raise last_error
+
+    def stats(self) -> Dict[str, any]:
+        """Breaker state, counters and latency estimates"""
+        with self._lock:
+            counters = dict(self._counters)
+        p50 = self.latency.percentile(50)
+        p95 = self.latency.percentile(95)
+        return {
+            "name": self.name,
+            "breaker": self.breaker.stats(),
+            "counters": counters,
+            "latency_p50_seconds": round(p50, 4) if p50 is not None else None,
+            "latency_p95_seconds": round(p95, 4) if p95 is not None else None,
+            "hedging_enabled": self.hedge
+        }
+
+    def _attempt(self, fn: Callable[[float], any], deadline: Deadline) -> any:
+        timeout = deadline.cap(self.attempt_timeout)
+        if timeout <= 0:
+            raise DeadlineExceeded(f"{self.name} deadline exceeded")
+
+        started = time.monotonic()
+        if self._executor is None:
+            # Inline: the client enforces the timeout it is handed
+            try:
+                result = fn(timeout)
+            except TimeoutError:
+                self._count("timeouts")
+                raise
+            self.latency.record(time.monotonic() - started)
+            return result
+
+        primary = self._executor.submit(fn, timeout)
+        pending = {primary}
+
+        hedge_after = self.latency.percentile(self.hedge_percentile) if self.hedge else None
+        if hedge_after is not None and hedge_after < timeout:
+            done, _ = wait(pending, timeout=hedge_after)
+            if not done:
+                self._count("hedges")
+                pending.add(self._executor.submit(fn, max(0.0, timeout - hedge_after)))
+
+        first_error = None
+        while pending:
+            remaining = timeout - (time.monotonic() - started)
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                error = future.exception()
+                if error is None:
+                    if future is not primary:
+                        self._count("hedge_wins")
+                    self.latency.record(time.monotonic() - started)
+                    return future.result()
+                first_error = first_error or error
+
+        if first_error is not None and not pending:
+            raise first_error
+        # Attempts still queued for a thread would run after the caller gave up
+        for future in pending:
+            future.cancel()
+        self._count("timeouts")
+        raise TimeoutError(f"{self.name} call timed out after {timeout:.2f}s")
+
+    def _count(self, key: str, amount: int = 1):
+        with self._lock:
+            self._counters[key] += amount
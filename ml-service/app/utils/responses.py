@@ -0,0 +1,147 @@
+"""
+Response serialization for the ML service
+
+FastJSONResponse serializes with orjson when it is installed and falls
+back to the standard library otherwise. project() implements sparse
+fieldsets: ``?fields=skills,match.score`` keeps only those paths of a
+response's ``data`` object. CleanupStreamingResponse runs its background
+task even when the client goes away mid-stream.
+"""
+import json
+import re
+from typing import Any, Dict, Optional
+
+from fastapi.responses import JSONResponse, StreamingResponse
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+_FIELD_PATH = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z_][A-Za-z0-9_]*)*$")
+
+# Upper bound on paths accepted in one fields= parameter
+MAX_FIELDS = 64
+
+FieldTree = Dict[str, Optional["FieldTree"]]
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Serialize to compact UTF-8 JSON
+
+    Args:
+        content: JSON-compatible value (numpy scalars and arrays allowed with orjson)
+
+    Returns:
+        Encoded JSON
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":")
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with orjson when available
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class CleanupStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse whose background task always runs
+
+    Starlette skips the background task when sending fails because the
+    client disconnected, and a body generator that never started never
+    reaches its ``finally``. Resources the stream owns (e.g. spooled
+    uploads) are released here instead.
+    """
+
+    async def __call__(self, scope, receive, send):
+        background, self.background = self.background, None
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            if background is not None:
+                await background()
+
+
+def parse_fields(fields: Optional[str]) -> Optional[FieldTree]:
+    """
+    Parse a comma-separated list of dotted field paths
+
+    Args:
+        fields: e.g. "skills,match.score,matches.job_title"
+
+    Returns:
+        Nested dict of selected keys (None marks a whole subtree),
+        or None when no projection was requested
+
+    Raises:
+        ValueError: If a path is malformed or too many are given
+    """
+    if fields is None or not fields.strip():
+        return None
+
+    paths = [path.strip() for path in fields.split(",") if path.strip()]
+    if len(paths) > MAX_FIELDS:
+        raise ValueError(f"At most {MAX_FIELDS} fields may be requested")
+
+    tree: FieldTree = {}
+    for path in paths:
+        if not _FIELD_PATH.match(path):
+            raise ValueError(f"Invalid field path: {path}")
+        node = tree
+        parts = path.split(".")
+        for part in parts[:-1]:
+            child = node.get(part, {})
+            if child is None:
+                # A shorter path already selects the whole subtree
+                break
+            node = node.setdefault(part, child)
+        else:
+            node[parts[-1]] = None
+    return tree
+
+
+def project(value: Any, tree: Optional[FieldTree]) -> Any:
+    """
+    Keep only the selected fields of a response payload
+
+    Lists are projected element-wise, so "matches.job_title" selects the
+    title of every match. Unknown fields are ignored.
+
+    Args:
+        value: Payload (dicts, lists and scalars)
+        tree: Result of parse_fields (None keeps everything)
+
+    Returns:
+        Projected payload
+    """
+    if tree is None:
+        return value
+    if isinstance(value, dict):
+        return {
+            key: project(value[key], subtree)
+            for key, subtree in tree.items()
+            if key in value
+        }
+    if isinstance(value, list):
+        if all(subtree is None for subtree in tree.values()):
+            # Leaf selection over a list of records (e.g. matches.job_title)
+            keys = tuple(tree)
+            return [
+                {key: item[key] for key in keys if key in item} if isinstance(item, dict) else item
+                for item in value
+            ]
+        return [project(item, tree) for item in value]
+    return value
@@ -0,0 +1,165 @@
+"""
+Manifest of the sample resume PDFs for HireSight AI
+
+Built once with os.scandir and refreshed per category only when that
+category directory's mtime changes. Stores each file's size, mtime and
+SHA-256 so listings and statistics are served from memory.
+
+Other subdirectories can still be listed by name. They are cached apart
+from the configured categories, so they never show up in counts().
+"""
+
+import hashlib
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+# Minimum seconds between directory mtime checks
+DEFAULT_CHECK_INTERVAL = float(os.getenv("RESUME_MANIFEST_CHECK_INTERVAL", "5"))
+
+HASH_CHUNK_SIZE = 1 << 20
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class _CategoryEntry:
+    """Files of one category directory plus the mtime they were read at."""
+
+    __slots__ = ('mtime_ns', 'files', 'paths')
+
+    def __init__(self, mtime_ns: Optional[int], files: List[Dict]):
+        self.mtime_ns = mtime_ns
+        self.files = files
+        self.paths = [item['path'] for item in files]
+
+
+class ResumeManifest:
+    """
+    In-memory listing of sample resumes per category.
+    """
+
+    def __init__(self, root: Path, categories: Sequence[str], check_interval: float = DEFAULT_CHECK_INTERVAL):
+        """
+        Args:
+            root: sample_resumes directory
+            categories: Category directory names
+            check_interval: Minimum seconds between mtime checks
+        """
+        self.root = Path(root)
+        self.categories = list(categories)
+        self.check_interval = check_interval
+        self.scans = 0
+        self._entries: Dict[str, _CategoryEntry] = {}
+        # Subdirectories listed on request that are not configured categories
+        self._other_entries: Dict[str, _CategoryEntry] = {}
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def get_paths(self, category: str) -> List[str]:
+        """
+        Get resume file paths for a category.
+
+        Args:
+            category: Category name
+
+        Returns:
+            List of file paths (empty for unknown categories)
+        """
+        entry = self._get_entry(category)
+        return entry.paths if entry else []
+
+    def get_files(self, category: str) -> List[Dict]:
+        """
+        Get file records (path, name, size, mtime_ns, sha256) for a category.
+
+        Args:
+            category: Category name
+
+        Returns:
+            List of file records
+        """
+        entry = self._get_entry(category)
+        return entry.files if entry else []
+
+    def counts(self) -> Dict[str, int]:
+        """Number of resumes per configured category."""
+        self.refresh()
+        with self._lock:
+            return {category: len(self._entries[category].files) for category in self.categories}
+
+    def scanned_files(self) -> int:
+        """Files listed so far, without rescanning."""
+        entries = list(self._entries.values()) + list(self._other_entries.values())
+        return sum(len(entry.files) for entry in entries)
+
+    def refresh(self, force: bool = False):
+        """
+        Rescan categories whose directory mtime changed.
+
+        Checks are throttled to one per ``check_interval`` unless forced.
+
+        Args:
+            force: Check every directory now
+        """
+        now = time.monotonic()
+        if not force and self._entries and now - self._checked_at < self.check_interval:
+            return
+        with self._lock:
+            if not force and self._entries and now - self._checked_at < self.check_interval:
+                return
+            for category in self.categories:
+                self._entries[category] = self._scan(category, self._entries.get(category))
+            self._checked_at = time.monotonic()
+
+    def _get_entry(self, category: str) -> Optional[_CategoryEntry]:
+        if category in self.categories:
+            self.refresh()
+            return self._entries.get(category)
+        if not category or category.startswith('.') or os.sep in category or not (self.root / category).is_dir():
+            return None
+        # Checked on every request (one stat) and rescanned on mtime change
+        with self._lock:
+            entry = self._scan(category, self._other_entries.get(category))
+            self._other_entries[category] = entry
+            return entry
+
+    def _scan(self, category: str, previous: Optional[_CategoryEntry]) -> _CategoryEntry:
+        """Entry for a category directory, reusing ``previous`` if its mtime is unchanged."""
+        directory = self.root / category
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+        except OSError:
+            return _CategoryEntry(None, [])
+
+        if previous is not None and previous.mtime_ns == mtime_ns:
+            return previous
+
+        known = {item['name']: item for item in previous.files} if previous else {}
+        files = []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if not entry.name.endswith('.pdf') or not entry.is_file():
+                    continue
+                stat = entry.stat()
+                old = known.get(entry.name)
+                if old and old['size'] == stat.st_size and old['mtime_ns'] == stat.st_mtime_ns:
+                    files.append(old)
+                    continue
+                files.append({
+                    'name': entry.name,
+                    'path': str(directory / entry.name),
+                    'size': stat.st_size,
+                    'mtime_ns': stat.st_mtime_ns,
+                    'sha256': _sha256(entry.path)
+                })
+        files.sort(key=lambda item: item['name'])
+        self.scans += 1
+        return _CategoryEntry(mtime_ns, files)
@@ -0,0 +1,254 @@
+"""
+BM25 inverted index over job titles and descriptions
+
+Postings are stored in CSR form (one offsets array, one doc-id array, one
+impact array) with each term's postings sorted by precomputed BM25 impact,
+so a query is a handful of vectorized accumulations plus a partial sort.
+"""
+
+import re
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+[+#]*")
+
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have in is it its of on or our that the this
+to was we will with you your
+""".split())
+
+# BM25F parameters
+K1 = 1.2
+B_TITLE = 0.5
+B_DESCRIPTION = 0.75
+TITLE_BOOST = 3.0
+
+# Documents tokenized per chunk while building (bounds peak memory)
+BUILD_CHUNK_SIZE = 5000
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase search tokens.
+
+    Args:
+        text: Raw text
+
+    Returns:
+        Tokens with stopwords removed ("c++" and "c#" are kept whole)
+    """
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+
+
+class _TermCounts:
+    """Accumulates (term, doc, tf) triples with a shared vocabulary."""
+
+    def __init__(self):
+        self.vocabulary: Dict[str, int] = {}
+        self.terms: List[np.ndarray] = []
+        self.docs: List[np.ndarray] = []
+        self.tfs: List[np.ndarray] = []
+
+    def add(self, token_lists: Sequence[List[str]], first_doc: int) -> np.ndarray:
+        """
+        Count tokens for consecutive documents.
+
+        Args:
+            token_lists: Tokens per document
+            first_doc: Id of the first document in the batch
+
+        Returns:
+            Token count (field length) per document
+        """
+        lengths = np.fromiter((len(tokens) for tokens in token_lists), dtype=np.int64, count=len(token_lists))
+        if not lengths.sum():
+            return lengths
+
+        flat = [token for tokens in token_lists for token in tokens]
+        local_ids, local_vocab = pd.factorize(pd.Series(flat, dtype=object), sort=False)
+        vocabulary = self.vocabulary
+        global_ids = np.fromiter(
+            (vocabulary.setdefault(token, len(vocabulary)) for token in local_vocab),
+            dtype=np.int64,
+            count=len(local_vocab)
+        )
+        terms = global_ids[local_ids]
+        docs = np.repeat(np.arange(first_doc, first_doc + len(token_lists), dtype=np.int64), lengths)
+
+        span = len(token_lists)
+        keys, tfs = np.unique(terms * span + (docs - first_doc), return_counts=True)
+        self.terms.append(keys // span)
+        self.docs.append(keys % span + first_doc)
+        self.tfs.append(tfs)
+        return lengths
+
+    def arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        if not self.terms:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty, empty
+        return np.concatenate(self.terms), np.concatenate(self.docs), np.concatenate(self.tfs)
+
+
+class BM25Index:
+    """
+    Inverted index with BM25F scoring over a title and a description field.
+    """
+
+    def __init__(self, vocabulary: Dict[str, int], offsets: np.ndarray, doc_ids: np.ndarray,
+                 impacts: np.ndarray, max_impacts: np.ndarray, num_docs: int):
+        self.vocabulary = vocabulary
+        self.offsets = offsets
+        self.doc_ids = doc_ids
+        self.impacts = impacts
+        self.max_impacts = max_impacts
+        self.num_docs = num_docs
+
+    @classmethod
+    def build(cls, title_codes: np.ndarray, unique_titles: Sequence[str],
+              descriptions: Sequence[str]) -> 'BM25Index':
+        """
+        Build the index from dictionary-encoded titles and descriptions.
+
+        Titles are tokenized once per distinct title and fanned out to the
+        rows that share it.
+
+        Args:
+            title_codes: Title code per document
+            unique_titles: Distinct titles indexed by code
+            descriptions: Description per document
+
+        Returns:
+            BM25Index
+        """
+        num_docs = len(title_codes)
+        counts = _TermCounts()
+
+        # Description field, tokenized in bounded chunks
+        description_lengths = np.zeros(num_docs, dtype=np.int64)
+        for start in range(0, num_docs, BUILD_CHUNK_SIZE):
+            stop = min(num_docs, start + BUILD_CHUNK_SIZE)
+            description_lengths[start:stop] = counts.add(
+                [tokenize(descriptions[doc]) for doc in range(start, stop)], start
+            )
+        body_terms, body_docs, body_tfs = counts.arrays()
+
+        # Title field: count per distinct title, then expand to documents
+        title_counts = _TermCounts()
+        title_counts.vocabulary = counts.vocabulary
+        code_lengths = title_counts.add([tokenize(title) for title in unique_titles], 0)
+        code_terms, code_ids, code_tfs = title_counts.arrays()
+        title_lengths = code_lengths[title_codes] if len(code_lengths) else np.zeros(num_docs, dtype=np.int64)
+
+        rows_by_code = np.argsort(title_codes, kind='stable')
+        code_starts = np.zeros(len(unique_titles) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(title_codes, minlength=len(unique_titles)), out=code_starts[1:])
+        fanout = code_starts[code_ids + 1] - code_starts[code_ids]
+        title_terms = np.repeat(code_terms, fanout)
+        title_tfs = np.repeat(code_tfs, fanout)
+        run_starts = np.repeat(code_starts[code_ids], fanout)
+        within_run = np.arange(len(title_terms)) - np.repeat(np.cumsum(fanout) - fanout, fanout)
+        title_docs = rows_by_code[run_starts + within_run]
+
+        # BM25F: length-normalised, boosted pseudo term frequency per (term, doc)
+        avg_title = max(title_lengths.mean(), 1.0) if num_docs else 1.0
+        avg_body = max(description_lengths.mean(), 1.0) if num_docs else 1.0
+        title_norm = 1 - B_TITLE + B_TITLE * title_lengths / avg_title
+        body_norm = 1 - B_DESCRIPTION + B_DESCRIPTION * description_lengths / avg_body
+
+        all_terms = np.concatenate([title_terms, body_terms])
+        all_docs = np.concatenate([title_docs, body_docs])
+        weights = np.concatenate([
+            TITLE_BOOST * title_tfs / title_norm[title_docs],
+            body_tfs / body_norm[body_docs]
+        ])
+        keys, inverse = np.unique(all_terms * num_docs + all_docs, return_inverse=True)
+        pseudo_tf = np.bincount(inverse, weights=weights)
+        terms = keys // num_docs if num_docs else keys
+        docs = keys % num_docs if num_docs else keys
+
+        num_terms = len(counts.vocabulary)
+        doc_freq = np.bincount(terms, minlength=num_terms)
+        idf = np.log(1 + (num_docs - doc_freq + 0.5) / (doc_freq + 0.5))
+        impacts = (idf[terms] * pseudo_tf * (K1 + 1) / (pseudo_tf + K1)).astype(np.float32)
+
+        # Group by term, highest impact first inside each posting list
+        order = np.lexsort((-impacts, terms))
+        offsets = np.zeros(num_terms + 1, dtype=np.int64)
+        np.cumsum(doc_freq, out=offsets[1:])
+        impacts = impacts[order]
+        max_impacts = np.zeros(num_terms, dtype=np.float32)
+        nonempty = doc_freq > 0
+        max_impacts[nonempty] = impacts[offsets[:-1][nonempty]]
+
+        return cls(
+            vocabulary=counts.vocabulary,
+            offsets=offsets,
+            doc_ids=docs[order].astype(np.int32),
+            impacts=impacts,
+            max_impacts=max_impacts,
+            num_docs=num_docs
+        )
+
+    def search(self, query: Sequence[str], limit: int = 10, offset: int = 0) -> Tuple[List[Tuple[int, float]], bool]:
+        """
+        Top-k BM25 retrieval.
+
+        Terms are processed in descending order of their best impact. Once
+        the remaining terms cannot lift an unseen document above the current
+        k-th score (MaxScore), they only update documents already seen.
+
+        Args:
+            query: Keywords or phrases
+            limit: Page size
+            offset: Number of ranked hits to skip
+
+        Returns:
+            (list of (doc_id, score) for the page, whether more hits exist)
+        """
+        term_ids = sorted(
+            {self.vocabulary[token] for text in query for token in tokenize(text) if token in self.vocabulary},
+            key=lambda term: -self.max_impacts[term]
+        )
+        if not term_ids or limit <= 0:
+            return [], False
+
+        k = offset + limit
+        scores = np.zeros(self.num_docs, dtype=np.float32)
+        seen = np.zeros(self.num_docs, dtype=bool)
+        candidates = np.zeros(0, dtype=np.int32)
+        remaining_bound = float(sum(self.max_impacts[term] for term in term_ids))
+        essential = True
+
+        for term in term_ids:
+            docs = self.doc_ids[self.offsets[term]:self.offsets[term + 1]]
+            impacts = self.impacts[self.offsets[term]:self.offsets[term + 1]]
+            remaining_bound -= float(self.max_impacts[term])
+
+            if essential:
+                scores[docs] += impacts
+                fresh = docs[~seen[docs]]
+                seen[fresh] = True
+                candidates = np.concatenate([candidates, fresh])
+                if len(candidates) > k:
+                    threshold = np.partition(scores[candidates], len(candidates) - k)[len(candidates) - k]
+                    essential = remaining_bound >= threshold
+            else:
+                known = seen[docs]
+                scores[docs[known]] += impacts[known]
+
+        candidate_scores = scores[candidates]
+        if len(candidates) > k:
+            top = np.argpartition(-candidate_scores, k - 1)[:k]
+        else:
+            top = np.arange(len(candidates))
+        ranked = top[np.lexsort((candidates[top], -candidate_scores[top]))]
+        page = ranked[offset:offset + limit]
+        hits = [(int(candidates[i]), float(candidate_scores[i])) for i in page]
+        return hits, len(candidates) > k
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the posting arrays."""
+        return self.offsets.nbytes + self.doc_ids.nbytes + self.impacts.nbytes + self.max_impacts.nbytes
@@ -0,0 +1,343 @@
+"""
+Skill taxonomy compiled for single-pass matching
+
+skills.json maps each category to a list of skills. An entry is either a
+canonical name or an object listing the other ways the skill is written:
+
+    {"name": "JavaScript", "aliases": ["JS", "ECMAScript"]}
+
+A skill may appear in several categories; its aliases are merged.
+
+An object may also name the skills it implies (its parents), by canonical
+name or alias:
+
+    {"name": "Django", "implies": ["Python"]}
+
+Implications are transitive. At load the closure is computed once over the
+strongly connected components of the implication graph and stored as one
+packed bitset row per implying skill, with a column per implied skill, so
+expanding a skill set is a single OR over its rows. Cycles (skills implying
+each other) are logged; their members imply one another.
+
+Canonical names and aliases (surface forms) are tokenized the same way as
+input text and compiled into one dict from token sequence to canonical
+skill. Matching walks the text's tokens once and, at each token that starts
+some surface form, looks up the n-grams of the lengths that can start
+there, longest first; a hit consumes its tokens. An alias is just another
+dict entry, so resolving it to its canonical skill costs nothing extra, and
+the cost of a match does not grow with the taxonomy.
+
+Tokens are runs of letters and digits plus trailing ``+``/``#`` (``c++``,
+``c#``); other punctuation separates tokens, so "Node.js", "node js" and
+"node-js" are the same surface form.
+"""
+import re
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from app.utils.logger import log_warning
+
+TOKEN_PATTERN = re.compile(r"[^\W_]+[+#]*")
+
+# Entries kept in the canonicalize() cache before it is cleared
+CANONICAL_CACHE_SIZE = 65536
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase tokens of a text"""
+    return [token.lower() for token in TOKEN_PATTERN.findall(text)]
+
+
+def surface_key(text: str) -> str:
+    """Lookup key of a surface form: its tokens joined by single spaces"""
+    return " ".join(tokenize(text))
+
+
+def skill_name(entry) -> str:
+    """Canonical name of a skills.json entry (string or object)"""
+    return entry if isinstance(entry, str) else entry["name"]
+
+
+class SkillTaxonomy:
+    """
+    Canonical skills, their categories and the compiled surface-form matcher
+
+    Canonical skills are identified by their lowercase name, which is what
+    extraction and matching return.
+    """
+
+    def __init__(self, data: Dict[str, list]):
+        """
+        Args:
+            data: Parsed skills.json (category -> names or {"name", "aliases"} objects)
+        """
+        # category -> display names; canonical -> display aliases
+        self.categories: Dict[str, List[str]] = {}
+        self.aliases: Dict[str, List[str]] = {}
+        self.declared_implications: Dict[str, List[str]] = {}
+        self.canonical: Set[str] = set()
+        self.conflicts: List[Tuple[str, str, str]] = []
+
+        for category, entries in data.items():
+            names = self.categories.setdefault(category, [])
+            for entry in entries:
+                name = skill_name(entry).strip()
+                if not name:
+                    continue
+                names.append(name)
+                canonical = name.lower()
+                self.canonical.add(canonical)
+                if not isinstance(entry, str):
+                    aliases = self.aliases.setdefault(canonical, [])
+                    for alias in entry.get("aliases", []):
+                        if alias not in aliases:
+                            aliases.append(alias)
+                    implied = self.declared_implications.setdefault(canonical, [])
+                    for parent in entry.get("implies", []):
+                        if parent not in implied:
+                            implied.append(parent)
+
+        # Surface key -> canonical skill; canonical names are compiled first,
+        # so an alias never shadows another skill's name
+        self.surfaces: Dict[str, str] = {}
+        for canonical in sorted(self.canonical):
+            self._add_surface(canonical, canonical)
+        for canonical, aliases in self.aliases.items():
+            for alias in aliases:
+                self._add_surface(alias, canonical)
+
+        # First token -> longest surface form (in tokens) starting with it
+        self.max_lengths: Dict[str, int] = {}
+        for key in self.surfaces:
+            tokens = key.split(" ")
+            self.max_lengths[tokens[0]] = max(self.max_lengths.get(tokens[0], 0), len(tokens))
+
+        self._canonical_cache: Dict[str, str] = {}
+        self._build_closure()
+
+    def _add_surface(self, surface: str, canonical: str):
+        key = surface_key(surface)
+        if not key:
+            log_warning("Skill surface form has no tokens; ignored", {"surface": surface})
+            return
+        existing = self.surfaces.get(key)
+        if existing is None:
+            self.surfaces[key] = canonical
+        elif existing != canonical:
+            self.conflicts.append((surface, existing, canonical))
+            log_warning(
+                "Skill surface form claimed by two skills; keeping the first",
+                {"surface": surface, "kept": existing, "ignored": canonical}
+            )
+
+    def _build_closure(self):
+        # Direct edges between canonical skills
+        self.implications: Dict[str, List[str]] = {}
+        for skill, parents in self.declared_implications.items():
+            edges = []
+            for parent in parents:
+                target = self.resolve(parent)
+                if target is None:
+                    log_warning("Implied skill is not in the taxonomy; ignored", {"skill": skill, "implies": parent})
+                elif target not in edges:
+                    edges.append(target)
+            if edges:
+                self.implications[skill] = edges
+
+        # Rows: skills that imply something; columns: skills that are implied
+        self.implied_columns: List[str] = sorted({t for edges in self.implications.values() for t in edges})
+        column = {skill: i for i, skill in enumerate(self.implied_columns)}
+        self.closure_rows: Dict[str, int] = {skill: i for i, skill in enumerate(sorted(self.implications))}
+        width = (len(self.implied_columns) + 7) // 8
+        self.closure = np.zeros((len(self.closure_rows), width), dtype=np.uint8)
+
+        # Components come out successors first, so each one ORs in the
+        # finished bits of the components it points to
+        self.cycles: List[List[str]] = []
+        component_of: Dict[str, int] = {}
+        component_bits: List[np.ndarray] = []
+        for component in _strongly_connected(self.implications):
+            cid = len(component_bits)
+            for member in component:
+                component_of[member] = cid
+            bits = np.zeros(width, dtype=np.uint8)
+            for member in component:
+                for target in self.implications.get(member, ()):
+                    col = column[target]
+                    bits[col >> 3] |= 0x80 >> (col & 7)
+                    if component_of[target] != cid:
+                        bits |= component_bits[component_of[target]]
+            component_bits.append(bits)
+            if len(component) > 1 or component[0] in self.implications.get(component[0], ()):
+                self.cycles.append(sorted(component))
+                log_warning("Skill implication cycle", {"skills": sorted(component)})
+        for skill, row in self.closure_rows.items():
+            self.closure[row] = component_bits[component_of[skill]]
+
+    def implied(self, skills: Iterable[str]) -> Dict[str, List[str]]:
+        """
+        Skills implied by a set of canonical skills
+
+        Args:
+            skills: Canonical skills (e.g. a resume's)
+
+        Returns:
+            Implied skill -> skills in ``skills`` that imply it, for implied
+            skills not already in ``skills``
+        """
+        skills = skills if isinstance(skills, (set, frozenset, dict)) else set(skills)
+        sources = [skill for skill in skills if skill in self.closure_rows]
+        if not sources:
+            return {}
+        rows = self.closure[[self.closure_rows[skill] for skill in sources]]
+        count = len(self.implied_columns)
+        columns = np.flatnonzero(np.unpackbits(np.bitwise_or.reduce(rows, axis=0), count=count))
+        if not len(columns):
+            return {}
+        # Which sources set each implied column
+        hits = np.unpackbits(rows, axis=1, count=count)[:, columns]
+        implied = {}
+        for j, col in enumerate(columns.tolist()):
+            skill = self.implied_columns[col]
+            if skill not in skills:
+                implied[skill] = sorted(sources[i] for i in np.flatnonzero(hits[:, j]).tolist())
+        return implied
+
+    def match(self, text: str) -> Dict[str, List[str]]:
+        """
+        Find skills in a text in one pass over its tokens
+
+        Args:
+            text: Resume or job description text
+
+        Returns:
+            Canonical skill -> surface forms as written in the text, in
+            order of first appearance
+        """
+        tokens = []
+        spans = []
+        for match in TOKEN_PATTERN.finditer(text):
+            tokens.append(match.group().lower())
+            spans.append(match.span())
+
+        surfaces = self.surfaces
+        max_lengths = self.max_lengths
+        found: Dict[str, List[str]] = {}
+        count = len(tokens)
+        i = 0
+        while i < count:
+            longest = max_lengths.get(tokens[i])
+            if longest:
+                for n in range(min(longest, count - i), 0, -1):
+                    skill = surfaces.get(tokens[i] if n == 1 else " ".join(tokens[i:i + n]))
+                    if skill is not None:
+                        form = text[spans[i][0]:spans[i + n - 1][1]]
+                        forms = found.setdefault(skill, [])
+                        if form not in forms:
+                            forms.append(form)
+                        i += n
+                        break
+                else:
+                    i += 1
+            else:
+                i += 1
+        return found
+
+    def resolve(self, surface: str) -> Optional[str]:
+        """Canonical skill written as ``surface``, or None if it is not a skill"""
+        return self.surfaces.get(surface_key(surface))
+
+    def canonicalize(self, name: str) -> str:
+        """
+        Canonical form of a skill name from any input
+
+        Known names and aliases map to their canonical skill; anything else
+        is only lowercased and stripped, so unknown skills still compare.
+
+        Args:
+            name: Skill as given (e.g. "ReactJS", "Postgres", "react")
+
+        Returns:
+            Lowercase canonical skill
+        """
+        cached = self._canonical_cache.get(name)
+        if cached is not None:
+            return cached
+        canonical = self.resolve(name) or name.strip().lower()
+        if len(self._canonical_cache) >= CANONICAL_CACHE_SIZE:
+            self._canonical_cache.clear()
+        self._canonical_cache[name] = canonical
+        return canonical
+
+    def canonicalize_all(self, names: Iterable[str]) -> Set[str]:
+        """Canonical forms of several skill names"""
+        canonicalize = self.canonicalize
+        return {canonicalize(name) for name in names}
+
+    def search(self, query: str) -> List[str]:
+        """Canonical skills whose name or an alias contains ``query`` (case-insensitive)"""
+        query = query.lower()
+        return sorted(
+            canonical for canonical in self.canonical
+            if query in canonical or any(query in alias.lower() for alias in self.aliases.get(canonical, ()))
+        )
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "skills": len(self.canonical),
+            "aliases": sum(len(aliases) for aliases in self.aliases.values()),
+            "surface_forms": len(self.surfaces),
+            "max_surface_tokens": max(self.max_lengths.values(), default=0),
+            "conflicts": len(self.conflicts),
+            "implying_skills": len(self.closure_rows),
+            "implied_skills": len(self.implied_columns),
+            "implication_cycles": len(self.cycles)
+        }
+
+
+def _strongly_connected(graph: Dict[str, List[str]]) -> List[List[str]]:
+    """
+    Strongly connected components of a directed graph (iterative Tarjan)
+
+    Components are returned successors first: every component a node points
+    to comes before the node's own component.
+    """
+    index: Dict[str, int] = {}
+    low: Dict[str, int] = {}
+    stack: List[str] = []
+    on_stack: Set[str] = set()
+    components: List[List[str]] = []
+    for root in graph:
+        if root in index:
+            continue
+        index[root] = low[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(graph.get(root, ())))]
+        while work:
+            node, children = work[-1]
+            for child in children:
+                if child not in index:
+                    index[child] = low[child] = len(index)
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(graph.get(child, ()))))
+                    break
+                if child in on_stack:
+                    low[node] = min(low[node], index[child])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+    return components
@@ -0,0 +1,320 @@
+"""
+Timing instrumentation for the ML service
+
+Records per-stage and per-endpoint latency histograms, attaches the stages
+of each request as a Server-Timing header and renders everything in the
+Prometheus text format for /metrics.
+
+Usage:
+    with stage("spacy"):
+        doc = nlp(text)
+
+    @timed("match")
+    def calculate_match(...): ...
+"""
+import contextvars
+import functools
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Histogram bucket upper bounds in seconds
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+    0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0
+)
+
+# Stage timings of the request being served (list of (stage, seconds))
+_request_stages: contextvars.ContextVar[Optional[List[Tuple[str, float]]]] = contextvars.ContextVar(
+    "request_stages", default=None
+)
+
+Labels = Tuple[Tuple[str, str], ...]
+Sample = Tuple[str, Dict[str, str], float]
+
+
+class Histogram:
+    """
+    Cumulative-bucket latency histogram
+    """
+
+    __slots__ = ("buckets", "counts", "sum", "count", "_lock")
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def snapshot(self) -> Tuple[List[int], float, int]:
+        with self._lock:
+            return list(self.counts), self.sum, self.count
+
+
+class MetricsRegistry:
+    """
+    Holds histograms, counters and gauge collectors and renders them
+    """
+
+    def __init__(self):
+        self._histograms: Dict[str, Dict[Labels, Histogram]] = {}
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._help: Dict[str, str] = {}
+        self._types: Dict[str, str] = {}
+        self._collectors: List[Callable[[], Iterable[Sample]]] = []
+        self._lock = threading.Lock()
+
+    def histogram(self, name: str, labels: Labels, help_text: str = "") -> Histogram:
+        """
+        Get or create the histogram for a metric name and label set
+
+        Args:
+            name: Metric name
+            labels: Sorted (key, value) label pairs
+            help_text: HELP line for the metric
+
+        Returns:
+            Histogram
+        """
+        family = self._histograms.get(name)
+        if family is not None:
+            histogram = family.get(labels)
+            if histogram is not None:
+                return histogram
+        with self._lock:
+            family = self._histograms.setdefault(name, {})
+            if help_text:
+                self._help.setdefault(name, help_text)
+            return family.setdefault(labels, Histogram())
+
+    def inc(self, name: str, labels: Labels = (), amount: float = 1.0, help_text: str = ""):
+        """Increment a counter"""
+        with self._lock:
+            family = self._counters.setdefault(name, {})
+            family[labels] = family.get(labels, 0.0) + amount
+            if help_text:
+                self._help.setdefault(name, help_text)
+
+    def register_collector(
+        self,
+        collector: Callable[[], Iterable[Sample]],
+        help_texts: Optional[Dict[str, str]] = None,
+        types: Optional[Dict[str, str]] = None
+    ):
+        """
+        Register a callable producing samples at scrape time
+
+        Args:
+            collector: Returns (name, labels, value) tuples
+            help_texts: Optional HELP lines per metric name
+            types: Optional metric types per name (default "gauge")
+        """
+        with self._lock:
+            self._collectors.append(collector)
+            for name, text in (help_texts or {}).items():
+                self._help.setdefault(name, text)
+            self._types.update(types or {})
+
+    def stage_summary(self) -> Dict[str, Dict[str, float]]:
+        """Count and mean latency (ms) per stage"""
+        summary = {}
+        for labels, histogram in self._histograms.get("hiresight_stage_duration_seconds", {}).items():
+            _, total, count = histogram.snapshot()
+            summary[dict(labels)["stage"]] = {
+                "count": count,
+                "mean_ms": round(total / count * 1000, 3) if count else 0.0
+            }
+        return summary
+
+    def render_prometheus(self) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format
+
+        Returns:
+            Exposition text
+        """
+        lines = []
+        with self._lock:
+            histograms = {name: dict(family) for name, family in self._histograms.items()}
+            counters = {name: dict(family) for name, family in self._counters.items()}
+            collectors = list(self._collectors)
+
+        for name, family in sorted(histograms.items()):
+            self._header(lines, name, "histogram")
+            for labels, histogram in sorted(family.items()):
+                counts, total, count = histogram.snapshot()
+                cumulative = 0
+                for bound, bucket_count in zip(histogram.buckets, counts):
+                    cumulative += bucket_count
+                    lines.append(f"{name}_bucket{_format_labels(labels + (('le', repr(bound)),))} {cumulative}")
+                lines.append(f"{name}_bucket{_format_labels(labels + (('le', '+Inf'),))} {count}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {total}")
+                lines.append(f"{name}_count{_format_labels(labels)} {count}")
+
+        for name, family in sorted(counters.items()):
+            self._header(lines, name, "counter")
+            for labels, value in sorted(family.items()):
+                lines.append(f"{name}{_format_labels(labels)} {value}")
+
+        collected: Dict[str, List[str]] = {}
+        for collector in collectors:
+            try:
+                samples = list(collector())
+            except Exception:
+                continue
+            for name, labels, value in samples:
+                collected.setdefault(name, []).append(
+                    f"{name}{_format_labels(tuple(sorted(labels.items())))} {float(value)}"
+                )
+        for name, samples in sorted(collected.items()):
+            self._header(lines, name, self._types.get(name, "gauge"))
+            lines.extend(samples)
+
+        return "\n".join(lines) + "\n"
+
+    def _header(self, lines: List[str], name: str, kind: str):
+        if name in self._help:
+            lines.append(f"# HELP {name} {self._help[name]}")
+        lines.append(f"# TYPE {name} {kind}")
+
+
+def _escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape_label(value)}"' for key, value in labels) + "}"
+
+
+# Process-wide registry
+registry = MetricsRegistry()
+
+
+def record_stage(name: str, seconds: float):
+    """
+    Record a stage duration in the histogram and the current request
+
+    Args:
+        name: Stage name
+        seconds: Duration
+    """
+    registry.histogram(
+        "hiresight_stage_duration_seconds",
+        (("stage", name),),
+        "Latency of internal processing stages"
+    ).observe(seconds)
+    stages = _request_stages.get()
+    if stages is not None:
+        stages.append((name, seconds))
+
+
+def request_stages() -> Optional[List[Tuple[str, float]]]:
+    """Stages recorded so far for the request being served, if any"""
+    return _request_stages.get()
+
+
+@contextmanager
+def stage(name: str):
+    """Time the enclosed block as a named stage"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(name, time.perf_counter() - started)
+
+
+def timed(name: str):
+    """Decorator timing every call of a function as a named stage"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record_stage(name, time.perf_counter() - started)
+        return wrapper
+    return decorator
+
+
+def server_timing_header(stages: List[Tuple[str, float]], total: float) -> str:
+    """
+    Build a Server-Timing header value, summing repeated stages
+
+    Args:
+        stages: (stage, seconds) pairs in completion order
+        total: Whole request duration in seconds
+
+    Returns:
+        Header value, e.g. 'pdf_extract;dur=120.4, spacy;dur=35.1, total;dur=160.2'
+    """
+    totals: Dict[str, float] = {}
+    counts: Dict[str, int] = {}
+    for name, seconds in stages:
+        totals[name] = totals.get(name, 0.0) + seconds
+        counts[name] = counts.get(name, 0) + 1
+    parts = []
+    for name, seconds in totals.items():
+        entry = f"{name};dur={seconds * 1000:.2f}"
+        if counts[name] > 1:
+            entry += f';desc="x{counts[name]}"'
+        parts.append(entry)
+    parts.append(f"total;dur={total * 1000:.2f}")
+    return ", ".join(parts)
+
+
+class TimingMiddleware:
+    """
+    ASGI middleware recording per-endpoint latency and emitting Server-Timing
+
+    Implemented at the raw ASGI level to keep per-request overhead to a
+    context variable, two clock reads and one histogram update.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stages: List[Tuple[str, float]] = []
+        token = _request_stages.set(stages)
+        started = time.perf_counter()
+        status = {"code": 500}
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((
+                    b"server-timing",
+                    server_timing_header(stages, time.perf_counter() - started).encode("latin-1")
+                ))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_stages.reset(token)
+            route = scope.get("route")
+            endpoint = getattr(route, "path", None) or "unmatched"
+            registry.histogram(
+                "hiresight_request_duration_seconds",
+                (("endpoint", endpoint), ("method", scope.get("method", "")), ("status", str(status["code"]))),
+                "End-to-end request latency per endpoint"
+            ).observe(time.perf_counter() - started)
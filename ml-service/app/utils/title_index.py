@@ -0,0 +1,178 @@
+"""
+Normalized job-title index for HireSight AI
+
+Titles are normalized (lowercase, punctuation and seniority words removed)
+and kept in a sorted array, so exact and prefix lookups are binary searches.
+Rows sharing a normalized title are ranked by description length.
+"""
+
+import re
+from bisect import bisect_left
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+SENIORITY_WORDS = frozenset("""
+senior sr junior jr lead principal staff entry level mid intern internship trainee
+experienced i ii iii iv v
+""".split())
+
+_NON_ALNUM = re.compile(r"[^a-z0-9+#]+")
+
+# Prefix matches examined when ranking autocomplete suggestions
+AUTOCOMPLETE_SCAN_LIMIT = 500
+
+
+def normalize_title(title: str) -> str:
+    """
+    Normalize a job title for indexing and lookup.
+
+    Args:
+        title: Raw title, e.g. "Sr. Python Developer (Remote)"
+
+    Returns:
+        Normalized title, e.g. "python developer remote"
+    """
+    tokens = _NON_ALNUM.sub(' ', title.lower()).split()
+    return ' '.join(token for token in tokens if token not in SENIORITY_WORDS)
+
+
+class TitleIndex:
+    """
+    Sorted array of normalized titles with their rows ranked best first.
+    """
+
+    def __init__(self, keys: List[str], display_titles: List[str], offsets: np.ndarray, rows: np.ndarray):
+        """
+        Args:
+            keys: Sorted normalized titles
+            display_titles: Most common original title for each key
+            offsets: int64 CSR offsets into ``rows`` (len(keys) + 1)
+            rows: Row ids grouped by key, longest description first
+        """
+        self.keys = keys
+        self.display_titles = display_titles
+        self.offsets = offsets
+        self.rows = rows
+
+    @classmethod
+    def build(cls, title_codes: np.ndarray, unique_titles: Sequence[str],
+              description_lengths: np.ndarray) -> 'TitleIndex':
+        """
+        Build the index from dictionary-encoded titles.
+
+        Args:
+            title_codes: Title code per row
+            unique_titles: Distinct titles indexed by code
+            description_lengths: Description length per row (ranking signal)
+
+        Returns:
+            TitleIndex
+        """
+        normalized = [normalize_title(title) for title in unique_titles]
+        keys = sorted({key for key in normalized if key})
+        key_ids = {key: i for i, key in enumerate(keys)}
+
+        code_to_key = np.array([key_ids.get(key, -1) for key in normalized], dtype=np.int64)
+        row_keys = code_to_key[title_codes] if len(title_codes) else np.zeros(0, dtype=np.int64)
+        indexed = np.nonzero(row_keys >= 0)[0]
+
+        # Group rows by key, longest description first, earliest row on ties
+        order = np.lexsort((indexed, -description_lengths[indexed], row_keys[indexed]))
+        rows = indexed[order].astype(np.int32)
+        offsets = np.zeros(len(keys) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(row_keys[indexed], minlength=len(keys)), out=offsets[1:])
+
+        # Show each key under its most frequent original spelling
+        code_counts = np.bincount(title_codes, minlength=len(unique_titles))
+        best_code: Dict[int, int] = {}
+        for code, key_id in enumerate(code_to_key):
+            if key_id >= 0 and (key_id not in best_code or code_counts[code] > code_counts[best_code[key_id]]):
+                best_code[key_id] = code
+        display_titles = [unique_titles[best_code[i]] for i in range(len(keys))]
+
+        return cls(keys, display_titles, offsets, rows)
+
+    def lookup(self, title: str) -> Optional[np.ndarray]:
+        """
+        Rows whose normalized title equals the normalized query.
+
+        Args:
+            title: Raw title
+
+        Returns:
+            Row ids best first, or None
+        """
+        key = normalize_title(title)
+        position = bisect_left(self.keys, key)
+        if key and position < len(self.keys) and self.keys[position] == key:
+            return self.rows[self.offsets[position]:self.offsets[position + 1]]
+        return None
+
+    def prefix_positions(self, prefix: str, scan_limit: int = AUTOCOMPLETE_SCAN_LIMIT) -> List[int]:
+        """
+        Positions of keys starting with the normalized prefix.
+
+        Args:
+            prefix: Raw prefix
+            scan_limit: Maximum number of keys to return
+
+        Returns:
+            Key positions in lexicographic order
+        """
+        key = normalize_title(prefix)
+        if not key:
+            return []
+        positions = []
+        position = bisect_left(self.keys, key)
+        while position < len(self.keys) and len(positions) < scan_limit and self.keys[position].startswith(key):
+            positions.append(position)
+            position += 1
+        return positions
+
+    def best_prefix_row(self, prefix: str) -> Optional[int]:
+        """
+        Best row among titles starting with the prefix (most postings wins).
+
+        Args:
+            prefix: Raw prefix
+
+        Returns:
+            Row id, or None
+        """
+        positions = self.prefix_positions(prefix)
+        if not positions:
+            return None
+        position = max(positions, key=self.count)
+        return int(self.rows[self.offsets[position]])
+
+    def autocomplete(self, prefix: str, limit: int = 10) -> List[Dict[str, any]]:
+        """
+        Suggest titles starting with the prefix, most common first.
+
+        Args:
+            prefix: Raw prefix
+            limit: Maximum number of suggestions
+
+        Returns:
+            List of dicts with title, normalized_title and count
+        """
+        positions = self.prefix_positions(prefix)
+        positions.sort(key=lambda position: (-self.count(position), self.keys[position]))
+        return [
+            {
+                'title': self.display_titles[position],
+                'normalized_title': self.keys[position],
+                'count': self.count(position)
+            }
+            for position in positions[:limit]
+        ]
+
+    def count(self, position: int) -> int:
+        """Number of rows under the key at ``position``."""
+        return int(self.offsets[position + 1] - self.offsets[position])
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the row arrays."""
+        return self.offsets.nbytes + self.rows.nbytes
@@ -0,0 +1,131 @@
+"""
+Startup warmup and readiness state
+
+Steps registered here run once at startup (or in the pre-fork parent)
+and exercise the code paths the first requests would otherwise pay for:
+spaCy's lazy internals, pandas and pdf imports, dataset loads and index
+builds. Readiness is reported separately from liveness: /health answers
+as soon as the process runs, /ready only once warmup has finished.
+"""
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from app.utils.logger import log_error, log_info
+from app.utils.timing import registry
+
+WARMUP_ENABLED = os.getenv("WARMUP_ENABLED", "true").lower() == "true"
+
+PENDING, RUNNING, READY, FAILED = "pending", "running", "ready", "failed"
+
+
+class Warmup:
+    """
+    Ordered warmup steps and the resulting readiness state
+    """
+
+    def __init__(self, enabled: bool = WARMUP_ENABLED):
+        """
+        Args:
+            enabled: Run the steps; when False the service is ready at once
+        """
+        self.enabled = enabled
+        self.status = PENDING
+        self.steps: List[Dict[str, any]] = []
+        self.started_at: Optional[float] = None
+        self.total_seconds: Optional[float] = None
+        self._registered: List[tuple] = []
+        self._lock = threading.Lock()
+
+    def add_step(self, name: str, fn: Callable[[], Optional[Dict]], required: bool = True):
+        """
+        Register a warmup step
+
+        Args:
+            name: Step name
+            fn: Callable doing the work; may return a dict of details
+            required: If it fails the service never becomes ready
+                (optional steps, e.g. a missing dataset, are only recorded)
+        """
+        self._registered.append((name, fn, required))
+
+    def claim(self) -> bool:
+        """Mark warmup as started; False if it already ran or is running"""
+        with self._lock:
+            if self.status != PENDING:
+                return False
+            self.status = RUNNING
+            return True
+
+    def run(self) -> str:
+        """
+        Run every step in order (blocking) unless warmup already started
+
+        Returns:
+            Final status
+        """
+        if not self.claim():
+            return self.status
+        if not self.enabled:
+            self.status = READY
+            return self.status
+
+        self.started_at = time.time()
+        started = time.perf_counter()
+        failed_required = False
+        for name, fn, required in self._registered:
+            step_started = time.perf_counter()
+            entry = {"name": name, "required": required}
+            try:
+                details = fn()
+                entry["ok"] = True
+                if details:
+                    entry["details"] = details
+            except Exception as e:
+                entry["ok"] = False
+                entry["error"] = str(e)
+                failed_required = failed_required or required
+                log_error(f"Warmup step {name} failed", e)
+            entry["seconds"] = round(time.perf_counter() - step_started, 4)
+            self.steps.append(entry)
+
+        self.total_seconds = round(time.perf_counter() - started, 4)
+        self.status = FAILED if failed_required else READY
+        log_info("Warmup finished", {
+            "status": self.status,
+            "total_seconds": self.total_seconds,
+            "steps": {step["name"]: step["seconds"] for step in self.steps}
+        })
+        return self.status
+
+    @property
+    def ready(self) -> bool:
+        return self.status == READY
+
+    def report(self) -> Dict[str, any]:
+        """Readiness status with per-step timings"""
+        return {
+            "status": self.status,
+            "ready": self.ready,
+            "total_seconds": self.total_seconds,
+            "steps": list(self.steps)
+        }
+
+    def collect_metrics(self):
+        """Readiness gauge and step durations for /metrics"""
+        yield "hiresight_ready", {}, 1.0 if self.ready else 0.0
+        for step in self.steps:
+            yield "hiresight_warmup_step_seconds", {"step": step["name"]}, step["seconds"]
+
+
+# Process-wide warmup (copied, already finished, into pre-forked workers)
+warmup = Warmup()
+
+registry.register_collector(
+    warmup.collect_metrics,
+    help_texts={
+        "hiresight_ready": "1 once startup warmup has completed",
+        "hiresight_warmup_step_seconds": "Duration of each startup warmup step"
+    }
+)
@@ -0,0 +1 @@
+"""Benchmark and measurement tools for the ML service (run from ml-service/)"""
@@ -0,0 +1,141 @@
+"""
+Shared fixtures for the performance regression suite
+
+Inputs are either checked in under benchmarks/fixtures or generated from
+BENCHMARK_SEED, so two runs of the suite measure exactly the same work.
+
+    pytest benchmarks --benchmark-only
+    python -m benchmarks.regress save baseline
+    python -m benchmarks.regress check baseline --tolerance 0.15
+"""
+import csv
+import random
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.skill_extractor import skill_extractor
+from app.utils import dataset_utils
+from app.utils.dataset_store import DatasetManager
+
+BENCHMARK_SEED = 20240601
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+# A checked-in sample resume (2 pages)
+SAMPLE_PDF = Path(__file__).resolve().parent.parent / "data" / "sample_resumes" / "INFORMATION-TECHNOLOGY" / "10089434.pdf"
+# Rows in the generated job dataset used by the lookup benchmarks
+DATASET_ROWS = 20000
+
+_FILLER = (
+    "responsible for delivering projects with cross functional teams and stakeholders "
+    "improved reliability reduced costs managed releases documented processes supported users "
+    "designed implemented maintained analyzed reported coordinated trained customers vendors"
+).split()
+
+
+def _read_fixture(name: str) -> str:
+    return (FIXTURES_DIR / name).read_text(encoding="utf-8")
+
+
+@pytest.fixture(scope="session")
+def seed() -> int:
+    return BENCHMARK_SEED
+
+
+@pytest.fixture(scope="session")
+def rng() -> random.Random:
+    return random.Random(BENCHMARK_SEED)
+
+
+@pytest.fixture(scope="session")
+def sample_pdf() -> Path:
+    if not SAMPLE_PDF.exists():
+        pytest.skip("sample resume PDF missing")
+    return SAMPLE_PDF
+
+
+@pytest.fixture(scope="session")
+def taxonomy() -> List[str]:
+    return sorted(skill_extractor.all_skills)
+
+
+@pytest.fixture(scope="session")
+def resume_text() -> str:
+    return _read_fixture("resume.txt")
+
+
+@pytest.fixture(scope="session")
+def resume_raw_text() -> str:
+    return _read_fixture("resume_raw.txt")
+
+
+@pytest.fixture(scope="session")
+def job_description() -> str:
+    return _read_fixture("job_description.txt")
+
+
+@pytest.fixture(scope="session")
+def short_text(rng: random.Random, taxonomy: List[str]) -> str:
+    """About 60 words with a handful of skills, like an /extract-skills call"""
+    words = rng.choices(_FILLER, k=50) + rng.sample(taxonomy, 10)
+    rng.shuffle(words)
+    return " ".join(words)
+
+
+@pytest.fixture(scope="session")
+def resume_skills(rng: random.Random, taxonomy: List[str]) -> List[str]:
+    return rng.sample(taxonomy, 25)
+
+
+def _job_listings(seed: int, taxonomy: List[str], count: int) -> List[Dict]:
+    rng = random.Random(seed)
+    return [
+        {"title": f"Job {index}", "skills": rng.sample(taxonomy, rng.randint(5, 20))}
+        for index in range(count)
+    ]
+
+
+@pytest.fixture(scope="session")
+def job_listings(taxonomy: List[str]):
+    """Job listings with skill lists, by count (cached per count)"""
+    cache: Dict[int, List[Dict]] = {}
+
+    def listings(count: int) -> List[Dict]:
+        if count not in cache:
+            cache[count] = _job_listings(BENCHMARK_SEED + count, taxonomy, count)
+        return cache[count]
+    return listings
+
+
+@pytest.fixture(scope="session")
+def job_dataset(tmp_path_factory, taxonomy: List[str]):
+    """
+    Point dataset_utils at a generated job CSV for the session
+
+    Yields:
+        DatasetManager with the indexes already built
+    """
+    rng = random.Random(BENCHMARK_SEED)
+    seniority = ["", "Senior ", "Junior ", "Lead ", "Principal "]
+    roles = ["Software Engineer", "Data Scientist", "DevOps Engineer", "Frontend Developer",
+             "Backend Developer", "Data Analyst", "QA Engineer", "Product Manager",
+             "Machine Learning Engineer", "Cloud Architect", "Security Analyst", "Mobile Developer"]
+    path = tmp_path_factory.mktemp("dataset") / "job_title_des.csv"
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["", "Job Title", "Job Description"])
+        for row in range(DATASET_ROWS):
+            words = rng.choices(_FILLER, k=80) + rng.sample(taxonomy, 12)
+            rng.shuffle(words)
+            writer.writerow([row, rng.choice(seniority) + rng.choice(roles), " ".join(words)])
+
+    manager = DatasetManager(path, path.parent / "Resume.csv")
+    original = dataset_utils.dataset_manager
+    dataset_utils.dataset_manager = manager
+    dataset_utils.get_search_index()
+    dataset_utils.get_title_index()
+    yield manager
+    dataset_utils.dataset_manager = original
@@ -0,0 +1,131 @@
+"""
+Recall cost of keyword-only skill extraction
+
+Parses sample resumes from data/sample_resumes and extracts skills from each
+in both modes. Full extraction (keywords + spaCy) is the reference. Reports
+how many of its skills keyword-only extraction still finds, and how long
+each mode takes.
+
+    python -m benchmarks.extraction_recall --per-category 5
+    python -m benchmarks.extraction_recall --per-category 0 --json recall.json
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from app.services.resume_parser import resume_parser
+from app.services.skill_extractor import skill_extractor
+from app.utils.dataset_utils import get_resume_categories, get_sample_resumes_by_category
+from app.utils.degradation import FULL, KEYWORD_ONLY
+
+
+def load_corpus(per_category: int) -> List[str]:
+    """
+    Resume texts from the sample PDFs
+
+    Args:
+        per_category: Resumes per category (0 = all)
+
+    Returns:
+        Parsed texts
+    """
+    texts = []
+    for category in get_resume_categories():
+        paths = get_sample_resumes_by_category(category)
+        for path in paths[:per_category] if per_category else paths:
+            result = resume_parser.parse_pdf(path)
+            if result.get("success") and result["text"].strip():
+                texts.append(result["text"])
+    return texts
+
+
+def measure(texts: List[str]) -> Dict[str, any]:
+    """
+    Extract every text in both modes and compare
+
+    Args:
+        texts: Resume texts
+
+    Returns:
+        Recall (micro and per-document mean), timings and the skills most
+        often found only by spaCy
+    """
+    full_found = keyword_found = 0
+    doc_recalls = []
+    timings = {FULL: [], KEYWORD_ONLY: []}
+    nlp_only = Counter()
+
+    for text in texts:
+        results = {}
+        for mode in (FULL, KEYWORD_ONLY):
+            started = time.perf_counter()
+            results[mode] = set(skill_extractor.extract_skills(text, mode=mode).get("skills", []))
+            timings[mode].append(time.perf_counter() - started)
+
+        full, keyword = results[FULL], results[KEYWORD_ONLY]
+        full_found += len(full)
+        keyword_found += len(full & keyword)
+        if full:
+            doc_recalls.append(len(full & keyword) / len(full))
+        nlp_only.update(full - keyword)
+
+    def summary(values: List[float]) -> Dict[str, float]:
+        if not values:
+            return {"mean_ms": 0.0, "p95_ms": 0.0}
+        ordered = sorted(values)
+        return {
+            "mean_ms": round(statistics.fmean(values) * 1000, 3),
+            "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 3)
+        }
+
+    return {
+        "documents": len(texts),
+        "spacy_loaded": skill_extractor.nlp is not None,
+        "skills_full": full_found,
+        "skills_keyword_only": keyword_found,
+        "recall_micro": round(keyword_found / full_found, 4) if full_found else 1.0,
+        "recall_mean_per_document": round(statistics.fmean(doc_recalls), 4) if doc_recalls else 1.0,
+        "documents_losing_skills": sum(1 for recall in doc_recalls if recall < 1.0),
+        "timing": {mode: summary(values) for mode, values in timings.items()},
+        "top_nlp_only_skills": nlp_only.most_common(15)
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure keyword-only vs full skill extraction recall")
+    parser.add_argument("--per-category", type=int, default=5, help="Resumes per category (0 = all)")
+    parser.add_argument("--json", help="Also write the report to this file")
+    args = parser.parse_args(argv)
+
+    texts = load_corpus(args.per_category)
+    report = measure(texts)
+    if not report["spacy_loaded"]:
+        print("Warning: spaCy model not loaded; both modes are keyword-only", file=sys.stderr)
+
+    print(f"Documents:                {report['documents']}")
+    print(f"Skills (full):            {report['skills_full']}")
+    print(f"Skills (keyword-only):    {report['skills_keyword_only']}")
+    print(f"Recall (micro):           {report['recall_micro']:.2%}")
+    print(f"Recall (mean/document):   {report['recall_mean_per_document']:.2%}")
+    print(f"Documents losing skills:  {report['documents_losing_skills']}")
+    for mode, timing in report["timing"].items():
+        print(f"{mode:<14} mean {timing['mean_ms']:.1f} ms, p95 {timing['p95_ms']:.1f} ms")
+    if report["top_nlp_only_skills"]:
+        print("Most common spaCy-only skills: " + ", ".join(
+            f"{skill} ({count})" for skill, count in report["top_nlp_only_skills"]
+        ))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,399 @@
+"""
+Seeded synthetic data for scaling tests
+
+Generates a data directory laid out like ml-service/data, at any size:
+
+    <out>/skills.json                          taxonomy (category -> skills)
+    <out>/job_descriptions/job_title_des.csv   job titles and descriptions
+    <out>/Resume.csv                           ID, Resume_str, Category
+    <out>/sample_resumes/<CATEGORY>/<id>.pdf   optional resume PDFs
+
+Skill popularity follows a Zipf law (a few skills appear everywhere, most
+are rare), the number of skills per document is log-normal, and job titles
+are Zipf-distributed too. The same seed always produces the same files.
+
+    python -m benchmarks.generate_data --out /tmp/hiresight-100k \\
+        --skills 100000 --jobs 2000000 --resumes 200000 --pdfs-per-category 20
+
+Point the service at the output with DATA_DIR=<out> and
+SKILLS_JSON_PATH=<out>/skills.json, or in code with
+SkillExtractor(skills_json_path=...) and DatasetManager(...).
+"""
+import argparse
+import csv
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Set
+
+import numpy as np
+
+ML_SERVICE_DIR = Path(__file__).resolve().parent.parent
+REAL_SKILLS_FILE = ML_SERVICE_DIR.parent / "data" / "skills.json"
+
+sys.path.append(str(ML_SERVICE_DIR))
+from app.utils.dataset_utils import JOB_CATEGORIES  # noqa: E402
+from app.utils.skill_taxonomy import skill_name  # noqa: E402
+
+_SYLLABLES = (
+    "ka to vex lin dra mo ri sen qua bel tor ax ne pho lu zi cor fen ga hy "
+    "ob pra sol tek un vor wy xan yel zen ar bi cel dut em fro gri hol"
+).split()
+_SUFFIXES = ["", "", "", "", "", ".js", "DB", "QL", "Ops", "ML", "io", "X"]
+_MODIFIERS = [
+    "distributed", "cloud", "data", "stream", "graph", "real-time", "serverless",
+    "edge", "secure", "mobile", "embedded", "quantum", "reactive", "federated",
+    "applied", "predictive", "automated", "enterprise", "spatial", "financial"
+]
+_NOUNS = [
+    "framework", "toolkit", "engine", "analytics", "testing", "platform", "studio",
+    "pipelines", "modeling", "design", "governance", "orchestration", "compliance",
+    "optimization", "visualization", "architecture", "automation", "forecasting"
+]
+_SYNTHETIC_CATEGORIES = [
+    "frameworks", "libraries", "data_platforms", "domain_knowledge", "practices",
+    "languages", "infrastructure", "analytics"
+]
+_SENIORITY = ["", "", "", "Senior ", "Junior ", "Lead ", "Principal ", "Staff ", "Associate "]
+_ROLES = [
+    "Engineer", "Developer", "Analyst", "Scientist", "Architect", "Manager",
+    "Consultant", "Specialist", "Administrator", "Designer", "Coordinator", "Technician"
+]
+_DOMAINS = [
+    "Software", "Data", "Backend", "Frontend", "Cloud", "Security", "Machine Learning",
+    "DevOps", "QA", "Mobile", "Network", "Database", "Business", "Financial", "Marketing",
+    "Sales", "HR", "Operations", "Product", "Healthcare", "Supply Chain", "Embedded"
+]
+_FILLER = (
+    "responsible for delivering projects with cross functional teams and stakeholders "
+    "improved reliability reduced costs managed releases documented processes supported users "
+    "designed implemented maintained analyzed reported coordinated trained customers vendors "
+    "experience with strong knowledge of hands on familiarity proven track record in "
+    "the a an of to and for with on in our we you will must should team company role"
+).split()
+
+
+def _pseudo_word(rng: np.random.Generator) -> str:
+    syllables = rng.choice(_SYLLABLES, size=int(rng.integers(2, 4)))
+    return "".join(syllables).capitalize()
+
+
+def generate_taxonomy(
+    count: int,
+    rng: np.random.Generator,
+    multiword_ratio: float = 0.4,
+    include_real: bool = True
+) -> Dict[str, list]:
+    """
+    Build a skill taxonomy of ``count`` unique skills
+
+    Args:
+        count: Total skills (real ones included)
+        rng: Seeded generator
+        multiword_ratio: Share of synthetic skills with two or three words
+        include_real: Start from data/skills.json, so its skills stay the most popular
+
+    Returns:
+        Dict of category -> skills, in skills.json format
+    """
+    taxonomy: Dict[str, list] = {}
+    seen = set()
+    if include_real and REAL_SKILLS_FILE.exists():
+        with open(REAL_SKILLS_FILE, "r", encoding="utf-8") as f:
+            for category, skills in json.load(f).items():
+                # Entries are kept whole, so real skills keep their aliases
+                for entry in skills:
+                    if len(seen) < count and skill_name(entry).lower() not in seen:
+                        seen.add(skill_name(entry).lower())
+                        taxonomy.setdefault(category, []).append(entry)
+
+    categories = list(taxonomy) + _SYNTHETIC_CATEGORIES
+    while len(seen) < count:
+        if rng.random() < multiword_ratio:
+            if rng.random() < 0.5:
+                skill = f"{rng.choice(_MODIFIERS)} {_pseudo_word(rng).lower()}"
+            else:
+                skill = f"{_pseudo_word(rng)} {rng.choice(_NOUNS)}"
+            if rng.random() < 0.2:
+                skill = f"{rng.choice(_MODIFIERS)} {skill}"
+        else:
+            skill = _pseudo_word(rng) + rng.choice(_SUFFIXES)
+        if skill.lower() in seen:
+            continue
+        seen.add(skill.lower())
+        taxonomy.setdefault(categories[int(rng.integers(len(categories)))], []).append(skill)
+    return taxonomy
+
+
+def zipf_weights(count: int, exponent: float) -> np.ndarray:
+    """Normalized Zipf probabilities for ranks 1..count"""
+    weights = 1.0 / np.arange(1, count + 1, dtype=np.float64) ** exponent
+    return weights / weights.sum()
+
+
+class TextSampler:
+    """
+    Documents mixing filler words with power-law distributed skills
+    """
+
+    def __init__(
+        self,
+        skills: Sequence[str],
+        rng: np.random.Generator,
+        exponent: float = 1.1,
+        mean_skills: float = 12.0,
+        words: int = 120
+    ):
+        """
+        Args:
+            skills: Skills in popularity order (most popular first)
+            rng: Seeded generator
+            exponent: Zipf exponent of skill popularity
+            mean_skills: Median skills per document (log-normal, 3..60)
+            words: Filler words per document
+        """
+        self.skills = np.asarray(skills, dtype=object)
+        self.rng = rng
+        self.cdf = np.cumsum(zipf_weights(len(skills), exponent))
+        self.mean_skills = mean_skills
+        self.words = words
+        self.filler = np.asarray(_FILLER, dtype=object)
+
+    def documents(self, count: int, chunk: int = 10000) -> Iterator[List[str]]:
+        """
+        Yield each document's skill mentions shuffled into filler text
+
+        Yields:
+            Lists of tokens (join with spaces)
+        """
+        for start in range(0, count, chunk):
+            size = min(chunk, count - start)
+            skill_counts = np.clip(
+                self.rng.lognormal(np.log(self.mean_skills), 0.5, size=size).astype(int), 3, 60
+            )
+            picks = np.searchsorted(self.cdf, self.rng.random(int(skill_counts.sum())))
+            picks = np.minimum(picks, len(self.skills) - 1)
+            filler = self.filler[self.rng.integers(len(self.filler), size=(size, self.words))]
+            offset = 0
+            for row in range(size):
+                mentions = self.skills[picks[offset:offset + skill_counts[row]]]
+                offset += skill_counts[row]
+                tokens = list(filler[row])
+                positions = self.rng.integers(len(tokens) + 1, size=len(mentions))
+                for position, mention in sorted(zip(positions, mentions), reverse=True):
+                    tokens.insert(int(position), mention)
+                yield tokens
+
+
+def generate_titles(count: int, rng: np.random.Generator) -> List[str]:
+    """Distinct job titles, in popularity order"""
+    titles = []
+    seen = set()
+    limit = len(set(_SENIORITY)) * len(_DOMAINS) * len(_ROLES)
+    while len(titles) < min(count, limit):
+        title = f"{rng.choice(_SENIORITY)}{rng.choice(_DOMAINS)} {rng.choice(_ROLES)}"
+        if title not in seen:
+            seen.add(title)
+            titles.append(title)
+    return titles
+
+
+def write_jobs(path: Path, sampler: TextSampler, count: int, rng: np.random.Generator, exponent: float = 1.0):
+    """
+    Write job_title_des.csv with Zipf-distributed titles
+
+    Args:
+        path: Output CSV path
+        sampler: Description generator
+        count: Rows
+        rng: Seeded generator
+        exponent: Zipf exponent of title popularity
+    """
+    titles = generate_titles(2000, rng)
+    title_cdf = np.cumsum(zipf_weights(len(titles), exponent))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["", "Job Title", "Job Description"])
+        title_picks = np.minimum(np.searchsorted(title_cdf, rng.random(count)), len(titles) - 1)
+        for row, tokens in enumerate(sampler.documents(count)):
+            writer.writerow([row, titles[title_picks[row]], " ".join(tokens)])
+            _progress("jobs", row + 1, count)
+
+
+def write_resumes(path: Path, sampler: TextSampler, count: int, rng: np.random.Generator):
+    """
+    Write Resume.csv (ID, Resume_str, Category)
+
+    Args:
+        path: Output CSV path
+        sampler: Resume text generator
+        count: Rows
+        rng: Seeded generator
+    """
+    categories = rng.choice(JOB_CATEGORIES, size=count)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["ID", "Resume_str", "Category"])
+        for row, tokens in enumerate(sampler.documents(count)):
+            writer.writerow([10000000 + row, " ".join(tokens), categories[row]])
+            _progress("resumes", row + 1, count)
+
+
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def build_pdf(lines: Sequence[str], lines_per_page: int = 50) -> bytes:
+    """
+    Minimal text PDF (Helvetica, Latin-1) readable by pdfplumber
+
+    Args:
+        lines: Text lines
+        lines_per_page: Lines before a page break
+
+    Returns:
+        PDF bytes
+    """
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for page in pages:
+        content = "BT /F1 10 Tf 12 TL 50 790 Td " + " ".join(
+            f"({_pdf_escape(line)}) Tj T*" for line in page
+        ) + " ET"
+        objects.append(f"<< /Length {len(content.encode('latin-1', 'replace'))} >>\nstream\n{content}\nendstream")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>"
+        )
+        page_ids.append(len(objects))
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(f'{i} 0 R' for i in page_ids)}] /Count {len(page_ids)} >>"
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1", "replace")
+    xref = len(output)
+    output += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    output += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    output += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(output)
+
+
+def write_pdfs(root: Path, sampler: TextSampler, per_category: int, rng: np.random.Generator):
+    """
+    Write sample_resumes/<CATEGORY>/<id>.pdf for every category
+
+    Args:
+        root: sample_resumes directory
+        sampler: Resume text generator
+        per_category: PDFs per category
+        rng: Seeded generator
+    """
+    documents = sampler.documents(per_category * len(JOB_CATEGORIES))
+    for category in JOB_CATEGORIES:
+        directory = root / category
+        directory.mkdir(parents=True, exist_ok=True)
+        for index in range(per_category):
+            tokens = next(documents)
+            lines = [category.replace("-", " ").title(), "Summary"]
+            lines += [" ".join(tokens[i:i + 12]) for i in range(0, len(tokens), 12)]
+            (directory / f"{20000000 + int(rng.integers(10 ** 7))}.pdf").write_bytes(build_pdf(lines))
+
+
+_last_progress = [0.0]
+
+
+def _progress(label: str, done: int, total: int):
+    now = time.monotonic()
+    if done == total or now - _last_progress[0] >= 2:
+        _last_progress[0] = now
+        print(f"\r{label}: {done:,}/{total:,}", end="\n" if done == total else "", file=sys.stderr, flush=True)
+
+
+def generate(
+    out: Path,
+    skills: int,
+    jobs: int,
+    resumes: int,
+    pdfs_per_category: int = 0,
+    seed: int = 42,
+    exponent: float = 1.1,
+    multiword_ratio: float = 0.4,
+    include_real: bool = True
+) -> Dict[str, any]:
+    """
+    Generate a complete data directory
+
+    Returns:
+        Summary of what was written
+    """
+    rng = np.random.default_rng(seed)
+    out.mkdir(parents=True, exist_ok=True)
+    started = time.perf_counter()
+
+    taxonomy = generate_taxonomy(skills, rng, multiword_ratio, include_real)
+    with open(out / "skills.json", "w", encoding="utf-8") as f:
+        json.dump(taxonomy, f, indent=1)
+    # Popularity order: real skills first, synthetic ones shuffled after them
+    real = _real_skills() if include_real else set()
+    all_skills = [skill_name(entry) for entries in taxonomy.values() for entry in entries]
+    synthetic = [skill for skill in all_skills if skill not in real]
+    rng.shuffle(synthetic)
+    ranked = [skill for skill in all_skills if skill in real] + synthetic
+
+    job_sampler = TextSampler(ranked, rng, exponent=exponent)
+    resume_sampler = TextSampler(ranked, rng, exponent=exponent, mean_skills=18, words=300)
+    if jobs:
+        write_jobs(out / "job_descriptions" / "job_title_des.csv", job_sampler, jobs, rng)
+    if resumes:
+        write_resumes(out / "Resume.csv", resume_sampler, resumes, rng)
+    if pdfs_per_category:
+        write_pdfs(out / "sample_resumes", resume_sampler, pdfs_per_category, rng)
+
+    return {
+        "out": str(out),
+        "skills": len(ranked),
+        "multiword_skills": sum(1 for skill in ranked if " " in skill),
+        "categories": len(taxonomy),
+        "jobs": jobs,
+        "resumes": resumes,
+        "pdfs": pdfs_per_category * len(JOB_CATEGORIES),
+        "seed": seed,
+        "seconds": round(time.perf_counter() - started, 2)
+    }
+
+
+def _real_skills() -> Set[str]:
+    if not REAL_SKILLS_FILE.exists():
+        return set()
+    with open(REAL_SKILLS_FILE, "r", encoding="utf-8") as f:
+        return {skill_name(entry) for entries in json.load(f).values() for entry in entries}
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Generate a seeded synthetic data directory")
+    parser.add_argument("--out", required=True, type=Path, help="Output directory")
+    parser.add_argument("--skills", type=int, default=10000, help="Taxonomy size (default 10000)")
+    parser.add_argument("--jobs", type=int, default=100000, help="Job descriptions (default 100000)")
+    parser.add_argument("--resumes", type=int, default=10000, help="Resume.csv rows (default 10000)")
+    parser.add_argument("--pdfs-per-category", type=int, default=0, help="Resume PDFs per category (default 0)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--zipf", type=float, default=1.1, help="Skill popularity exponent (default 1.1)")
+    parser.add_argument("--multiword", type=float, default=0.4, help="Share of multi-word synthetic skills")
+    parser.add_argument("--no-real-skills", action="store_true", help="Do not seed the taxonomy with data/skills.json")
+    args = parser.parse_args(argv)
+
+    summary = generate(
+        args.out, args.skills, args.jobs, args.resumes, args.pdfs_per_category,
+        seed=args.seed, exponent=args.zipf, multiword_ratio=args.multiword,
+        include_real=not args.no_real_skills
+    )
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
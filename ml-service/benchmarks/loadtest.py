@@ -0,0 +1,391 @@
+"""
+Open-loop HTTP load generator for the ML service
+
+Requests are started on a schedule (Poisson or constant arrivals at
+``--rate`` per second) regardless of how fast the server answers, so a
+slow server builds a backlog instead of quietly slowing the client down.
+Latency is measured from each request's scheduled start, which keeps
+queueing delay in the numbers (no coordinated omission).
+
+    # Against a running service
+    python -m benchmarks.loadtest --url http://localhost:8000 --rate 20 --duration 60
+
+    # Start the service with the fake LLM, then load it
+    python -m benchmarks.loadtest --spawn --server-workers 4 --rate 50 \\
+        --mix upload=1,match=6,search=3,analysis=1 --json report.json
+
+Scenarios (``--mix name=weight``):
+    upload    POST /parse-and-extract with a sample resume PDF
+    analysis  POST /complete-analysis with a PDF and job description
+    extract   POST /extract-skills with a job description
+    match     POST /match with skills and a job description
+    search    POST /dataset/search-jobs with 1-3 keywords
+    skills    GET  /skills/search with a short prefix
+
+Start the server with LLM_FAKE=true (``--spawn`` does) so analyses hit
+the fake model instead of the Gemini API.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+ML_SERVICE_DIR = Path(__file__).resolve().parent.parent
+SAMPLE_RESUMES_DIR = ML_SERVICE_DIR / "data" / "sample_resumes"
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+DEFAULT_MIX = "upload=1,analysis=1,extract=2,match=6,search=3,skills=2"
+# PDFs held in memory for upload scenarios
+MAX_PDFS = 64
+PERCENTILES = (50, 95, 99)
+
+SEARCH_KEYWORDS = [
+    "python", "java", "sql", "aws", "docker", "react", "manager", "analyst",
+    "engineer", "data", "sales", "marketing", "finance", "design", "kubernetes"
+]
+SKILL_PREFIXES = ["py", "ja", "sq", "aw", "do", "re", "ma", "da", "ku", "gi"]
+
+# A request: (method, path, httpx keyword arguments)
+Request = Tuple[str, str, Dict]
+
+
+@dataclass
+class Corpus:
+    """Inputs shared by the scenarios"""
+    pdfs: List[Tuple[str, bytes]]
+    job_description: str
+    skills: List[str]
+
+
+def load_corpus(rng: random.Random) -> Corpus:
+    """
+    Read sample PDFs and the benchmark job description
+
+    Args:
+        rng: Seeded RNG choosing the PDFs
+
+    Returns:
+        Corpus
+    """
+    paths = sorted(SAMPLE_RESUMES_DIR.glob("*/*.pdf"))
+    chosen = rng.sample(paths, min(MAX_PDFS, len(paths))) if paths else []
+    job_description = (FIXTURES_DIR / "job_description.txt").read_text(encoding="utf-8")
+    skills = ["python", "sql", "docker", "aws", "react", "git", "linux", "java",
+              "communication", "leadership", "kubernetes", "machine learning"]
+    return Corpus([(path.name, path.read_bytes()) for path in chosen], job_description, skills)
+
+
+def _upload(rng: random.Random, corpus: Corpus) -> Request:
+    name, data = rng.choice(corpus.pdfs)
+    return "POST", "/parse-and-extract", {"files": {"file": (name, data, "application/pdf")}}
+
+
+def _analysis(rng: random.Random, corpus: Corpus) -> Request:
+    name, data = rng.choice(corpus.pdfs)
+    return "POST", "/complete-analysis", {
+        "files": {"file": (name, data, "application/pdf")},
+        "data": {"job_description": corpus.job_description}
+    }
+
+
+def _extract(rng: random.Random, corpus: Corpus) -> Request:
+    return "POST", "/extract-skills", {"json": {"text": corpus.job_description}}
+
+
+def _match(rng: random.Random, corpus: Corpus) -> Request:
+    return "POST", "/match", {"json": {
+        "resume_skills": rng.sample(corpus.skills, rng.randint(3, 8)),
+        "job_description": corpus.job_description
+    }}
+
+
+def _search(rng: random.Random, corpus: Corpus) -> Request:
+    return "POST", "/dataset/search-jobs", {"json": {
+        "keywords": rng.sample(SEARCH_KEYWORDS, rng.randint(1, 3)),
+        "limit": 10
+    }}
+
+
+def _skills(rng: random.Random, corpus: Corpus) -> Request:
+    return "GET", "/skills/search", {"params": {"query": rng.choice(SKILL_PREFIXES)}}
+
+
+SCENARIOS: Dict[str, Callable[[random.Random, Corpus], Request]] = {
+    "upload": _upload,
+    "analysis": _analysis,
+    "extract": _extract,
+    "match": _match,
+    "search": _search,
+    "skills": _skills
+}
+PDF_SCENARIOS = {"upload", "analysis"}
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """
+    Parse 'name=weight,...'
+
+    Raises:
+        ValueError: Unknown scenario or non-positive total weight
+    """
+    mix = {}
+    for part in filter(None, (item.strip() for item in text.split(","))):
+        name, _, weight = part.partition("=")
+        if name not in SCENARIOS:
+            raise ValueError(f"Unknown scenario '{name}' (choose from {', '.join(SCENARIOS)})")
+        mix[name] = float(weight or 1)
+    if sum(mix.values()) <= 0:
+        raise ValueError("The mix needs at least one positive weight")
+    return mix
+
+
+@dataclass
+class ScenarioStats:
+    latencies: List[float] = field(default_factory=list)
+    statuses: Dict[str, int] = field(default_factory=dict)
+    errors: int = 0
+    shed: int = 0
+
+    def record(self, status: str, latency: float):
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        self.latencies.append(latency)
+        if status in ("429", "503"):
+            self.shed += 1
+        elif not status.startswith("2"):
+            self.errors += 1
+
+
+def percentile(ordered: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a sorted list"""
+    if not ordered:
+        return 0.0
+    rank = max(1, int(round(pct / 100 * len(ordered) + 0.5)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def summarize(stats: ScenarioStats, seconds: float) -> Dict[str, any]:
+    ordered = sorted(stats.latencies)
+    count = len(ordered)
+    summary = {
+        "requests": count,
+        "throughput_rps": round(count / seconds, 3) if seconds else 0.0,
+        "error_rate": round(stats.errors / count, 4) if count else 0.0,
+        "shed_rate": round(stats.shed / count, 4) if count else 0.0,
+        "statuses": dict(sorted(stats.statuses.items())),
+        "mean_ms": round(sum(ordered) / count * 1000, 2) if count else 0.0,
+        "max_ms": round(ordered[-1] * 1000, 2) if count else 0.0
+    }
+    for pct in PERCENTILES:
+        summary[f"p{pct}_ms"] = round(percentile(ordered, pct) * 1000, 2)
+    return summary
+
+
+class LoadTest:
+    """
+    Open-loop load run against one base URL
+    """
+
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.mix = parse_mix(args.mix)
+        self.corpus = load_corpus(self.rng)
+        if self.mix.keys() & PDF_SCENARIOS and not self.corpus.pdfs:
+            raise SystemExit(f"No sample PDFs under {SAMPLE_RESUMES_DIR} for the upload scenarios")
+        self.stats: Dict[str, ScenarioStats] = {name: ScenarioStats() for name in self.mix}
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.skipped = 0
+        # When a list, every measured (scenario, status, latency) is also
+        # appended here; the soak test drains it once per sample
+        self.window: Optional[List[Tuple[str, str, float]]] = None
+
+    def _next_gap(self) -> float:
+        if self.args.arrival == "constant":
+            return 1.0 / self.args.rate
+        return self.rng.expovariate(self.args.rate)
+
+    async def _fire(self, client: httpx.AsyncClient, name: str, scheduled: float, measured: bool):
+        method, path, kwargs = SCENARIOS[name](self.rng, self.corpus)
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            response = await client.request(method, path, **kwargs)
+            await response.aread()
+            status = str(response.status_code)
+        except httpx.TimeoutException:
+            status = "timeout"
+        except httpx.HTTPError as e:
+            status = type(e).__name__
+        finally:
+            self.in_flight -= 1
+        if measured:
+            latency = time.perf_counter() - scheduled
+            self.stats[name].record(status, latency)
+            if self.window is not None:
+                self.window.append((name, status, latency))
+
+    async def run(self) -> Dict[str, any]:
+        args = self.args
+        names = list(self.mix)
+        weights = [self.mix[name] for name in names]
+        limits = httpx.Limits(max_connections=args.max_in_flight, max_keepalive_connections=args.max_in_flight)
+        tasks = set()
+
+        async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout, limits=limits) as client:
+            started = time.perf_counter()
+            measure_from = started + args.warmup
+            stop_at = measure_from + args.duration
+            scheduled = started
+            while scheduled < stop_at:
+                scheduled += self._next_gap()
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                if self.in_flight >= args.max_in_flight:
+                    # The client is the bottleneck; count it rather than wait
+                    self.skipped += 1
+                    continue
+                name = self.rng.choices(names, weights)[0]
+                task = asyncio.create_task(self._fire(client, name, scheduled, scheduled >= measure_from))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.wait(tasks)
+            elapsed = time.perf_counter() - measure_from
+
+        overall = ScenarioStats()
+        for stats in self.stats.values():
+            overall.latencies.extend(stats.latencies)
+            overall.errors += stats.errors
+            overall.shed += stats.shed
+            for status, count in stats.statuses.items():
+                overall.statuses[status] = overall.statuses.get(status, 0) + count
+
+        return {
+            "config": {
+                "url": args.url, "rate": args.rate, "arrival": args.arrival,
+                "duration": args.duration, "warmup": args.warmup, "mix": self.mix,
+                "seed": args.seed, "max_in_flight": args.max_in_flight
+            },
+            "elapsed_seconds": round(elapsed, 3),
+            "peak_in_flight": self.peak_in_flight,
+            "skipped_client_saturated": self.skipped,
+            "endpoints": {name: summarize(stats, elapsed) for name, stats in self.stats.items()},
+            "overall": summarize(overall, elapsed)
+        }
+
+
+def format_table(report: Dict[str, any]) -> str:
+    """Text table of the per-endpoint summary"""
+    header = f"{'endpoint':<10} {'reqs':>7} {'rps':>8} {'err%':>6} {'shed%':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}"
+    lines = [header, "-" * len(header)]
+    rows = list(report["endpoints"].items()) + [("overall", report["overall"])]
+    for name, row in rows:
+        lines.append(
+            f"{name:<10} {row['requests']:>7} {row['throughput_rps']:>8.2f} {row['error_rate'] * 100:>6.2f} "
+            f"{row['shed_rate'] * 100:>6.2f} {row['p50_ms']:>9.1f} {row['p95_ms']:>9.1f} {row['p99_ms']:>9.1f} {row['max_ms']:>9.1f}"
+        )
+    config = report["config"]
+    lines.append("")
+    lines.append(
+        f"{config['arrival']} arrivals at {config['rate']}/s for {config['duration']}s "
+        f"(+{config['warmup']}s warmup); peak in flight {report['peak_in_flight']}, "
+        f"skipped (client saturated) {report['skipped_client_saturated']}"
+    )
+    return "\n".join(lines)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def spawn_server(workers: int, ready_timeout: float) -> Tuple[subprocess.Popen, str]:
+    """
+    Start the service with the fake LLM and wait for /ready
+
+    Args:
+        workers: 1 for plain uvicorn, more for the pre-fork launcher
+        ready_timeout: Seconds to wait for readiness
+
+    Returns:
+        (process, base URL)
+    """
+    port = _free_port()
+    env = {**os.environ, "LLM_FAKE": "true", "PYTHONPATH": str(ML_SERVICE_DIR)}
+    env.setdefault("LOG_LEVEL", "WARNING")
+    if workers > 1:
+        command = [sys.executable, "-m", "app.server", "--workers", str(workers), "--host", "127.0.0.1", "--port", str(port)]
+    else:
+        command = [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+                   "--log-level", "warning", "--no-access-log"]
+    process = subprocess.Popen(command, cwd=ML_SERVICE_DIR, env=env)
+    url = f"http://127.0.0.1:{port}"
+
+    deadline = time.monotonic() + ready_timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit(f"Server exited with status {process.returncode}")
+        try:
+            if httpx.get(f"{url}/ready", timeout=2).status_code == 200:
+                return process, url
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    process.terminate()
+    raise SystemExit(f"Server not ready after {ready_timeout}s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Open-loop HTTP load test for the ML service")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--url", help="Base URL of a running service")
+    target.add_argument("--spawn", action="store_true", help="Start the service (fake LLM) on a free port")
+    parser.add_argument("--server-workers", type=int, default=1, help="Workers for --spawn (>1 uses app.server)")
+    parser.add_argument("--rate", type=float, default=10.0, help="Arrivals per second")
+    parser.add_argument("--arrival", choices=("poisson", "constant"), default="poisson")
+    parser.add_argument("--duration", type=float, default=30.0, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=5.0, help="Unmeasured seconds before measuring")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Scenario weights (default {DEFAULT_MIX})")
+    parser.add_argument("--max-in-flight", type=int, default=512, help="Client-side concurrency cap")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Per-request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--json", help="Write the report to this file")
+    args = parser.parse_args(argv)
+    if args.rate <= 0:
+        parser.error("--rate must be positive")
+    try:
+        parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+
+    process = None
+    if args.spawn:
+        process, args.url = spawn_server(args.server_workers, ready_timeout=180)
+    try:
+        report = asyncio.run(LoadTest(args).run())
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=30)
+
+    print(format_table(report))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Save and compare performance baselines
+
+Runs the pytest-benchmark suite in benchmarks/ and compares its JSON output
+with a stored baseline, flagging every benchmark whose statistic grew by
+more than the tolerance. Exits with status 1 on a regression, so it can gate
+a CI job.
+
+    python -m benchmarks.regress save baseline
+    python -m benchmarks.regress check baseline --tolerance 0.15
+    python -m benchmarks.regress compare old.json new.json --stat mean
+
+Baselines are machine-specific: compare runs from the same host.
+"""
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+BASELINES_DIR = BENCHMARKS_DIR / "baselines"
+STATS = ("min", "median", "mean")
+
+
+def run_suite(output: Path, pytest_args: List[str]) -> int:
+    """
+    Run the benchmark suite, writing pytest-benchmark JSON
+
+    Args:
+        output: JSON output path
+        pytest_args: Extra pytest arguments (e.g. -k batch)
+
+    Returns:
+        pytest exit code
+    """
+    command = [
+        sys.executable, "-m", "pytest", str(BENCHMARKS_DIR), "-q",
+        "--benchmark-only", f"--benchmark-json={output}", *pytest_args
+    ]
+    return subprocess.call(command, cwd=BENCHMARKS_DIR.parent)
+
+
+def load_results(path: Path, stat: str) -> Dict[str, float]:
+    """Benchmark name -> statistic in seconds"""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return {bench["fullname"]: bench["stats"][stat] for bench in data["benchmarks"]}
+
+
+def compare(
+    baseline: Dict[str, float],
+    current: Dict[str, float],
+    tolerance: float
+) -> Tuple[List[Tuple[str, float, float, float, str]], bool]:
+    """
+    Compare two result sets
+
+    Args:
+        baseline: Name -> seconds
+        current: Name -> seconds
+        tolerance: Allowed relative slowdown (0.1 = 10%)
+
+    Returns:
+        (rows of (name, baseline, current, change, verdict), any regression)
+    """
+    rows = []
+    regressed = False
+    for name in sorted(set(baseline) | set(current)):
+        old, new = baseline.get(name), current.get(name)
+        if old is None or new is None:
+            rows.append((name, old, new, None, "new" if old is None else "missing"))
+            continue
+        change = (new - old) / old if old else 0.0
+        if change > tolerance:
+            verdict = "REGRESSION"
+            regressed = True
+        elif change < -tolerance:
+            verdict = "faster"
+        else:
+            verdict = "ok"
+        rows.append((name, old, new, change, verdict))
+    return rows, regressed
+
+
+def _format_time(seconds) -> str:
+    if seconds is None:
+        return "-"
+    if seconds >= 1:
+        return f"{seconds:.3f} s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.3f} ms"
+    return f"{seconds * 1e6:.2f} us"
+
+
+def print_report(rows, stat: str, tolerance: float):
+    width = max([len(row[0]) for row in rows] + [9])
+    print(f"{'Benchmark':<{width}}  {'baseline':>12}  {'current':>12}  {'change':>8}  ({stat}, tolerance {tolerance:.0%})")
+    for name, old, new, change, verdict in rows:
+        change_text = "-" if change is None else f"{change:+.1%}"
+        print(f"{name:<{width}}  {_format_time(old):>12}  {_format_time(new):>12}  {change_text:>8}  {verdict}")
+
+
+def _baseline_path(name: str) -> Path:
+    path = Path(name)
+    return path if path.suffix == ".json" else BASELINES_DIR / f"{name}.json"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark baselines and regression checks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    save = commands.add_parser("save", help="Run the suite and store the result as a baseline")
+    save.add_argument("name", help="Baseline name (stored in benchmarks/baselines/) or .json path")
+
+    for command, help_text in (("check", "Run the suite and compare against a baseline"),
+                               ("compare", "Compare two existing result files")):
+        sub = commands.add_parser(command, help=help_text)
+        sub.add_argument("baseline", help="Baseline name or .json path")
+        if command == "compare":
+            sub.add_argument("current", help="Result .json path")
+        sub.add_argument("--tolerance", type=float, default=0.10, help="Allowed slowdown (default 0.10)")
+        sub.add_argument("--stat", choices=STATS, default="median")
+
+    args, pytest_args = parser.parse_known_args(argv)
+
+    if args.command == "save":
+        output = _baseline_path(args.name)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        code = run_suite(output, pytest_args)
+        if code == 0:
+            print(f"Baseline saved to {output}")
+        sys.exit(code)
+
+    baseline_path = _baseline_path(args.baseline)
+    if args.command == "check":
+        with tempfile.TemporaryDirectory() as tmp:
+            current_path = Path(tmp) / "current.json"
+            code = run_suite(current_path, pytest_args)
+            if code != 0:
+                sys.exit(code)
+            current = load_results(current_path, args.stat)
+    else:
+        current = load_results(Path(args.current), args.stat)
+
+    rows, regressed = compare(load_results(baseline_path, args.stat), current, args.tolerance)
+    print_report(rows, args.stat, args.tolerance)
+    sys.exit(1 if regressed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+How extraction, matching and job search scale with data size
+
+Generates (or reuses) synthetic data directories with benchmarks.generate_data
+and measures, per size:
+
+    taxonomy size -> SkillExtractor load time and memory, keyword extraction
+                     latency on a fixed resume, batch_match over 1k jobs
+    job count     -> dataset load time, search/title index build time and
+                     memory, search and title lookup latency
+
+    python -m benchmarks.scaling --skills 1000,10000,100000 --jobs 10000,100000,1000000 \\
+        --work-dir /tmp/hiresight-scaling --json scaling.json
+"""
+import argparse
+import json
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from benchmarks.generate_data import TextSampler, generate_taxonomy, write_jobs
+
+from app.services.matcher import matcher
+from app.services.skill_extractor import SkillExtractor
+from app.utils.dataset_store import DatasetManager
+from app.utils.search_index import BM25Index
+from app.utils.skill_taxonomy import skill_name
+from app.utils.title_index import TitleIndex
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+SEED = 42
+REPEATS = 20
+
+
+def _latency_ms(fn: Callable, repeats: int = REPEATS) -> Dict[str, float]:
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    samples.sort()
+    return {
+        "median_ms": round(statistics.median(samples) * 1000, 3),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000, 3)
+    }
+
+
+def _measure_build(fn: Callable):
+    """(result, seconds, traced peak MB) of one call"""
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, round(seconds, 3), round(peak / (1024 * 1024), 1)
+
+
+def skills_scaling(size: int, work_dir: Path) -> Dict[str, any]:
+    path = work_dir / f"skills-{size}.json"
+    if not path.exists():
+        taxonomy = generate_taxonomy(size, np.random.default_rng(SEED))
+        path.write_text(json.dumps(taxonomy), encoding="utf-8")
+
+    extractor, load_seconds, load_mb = _measure_build(lambda: SkillExtractor(skills_json_path=str(path)))
+    resume = (FIXTURES_DIR / "resume.txt").read_text(encoding="utf-8")
+    skills = sorted(extractor.all_skills)
+    rng = np.random.default_rng(SEED)
+    jobs = [
+        {"title": f"Job {i}", "skills": list(rng.choice(skills, size=15, replace=False))}
+        for i in range(1000)
+    ]
+    resume_skills = list(rng.choice(skills, size=25, replace=False))
+    return {
+        "skills": len(extractor.all_skills),
+        "load_seconds": load_seconds,
+        "load_peak_mb": load_mb,
+        "keyword_extraction": _latency_ms(lambda: extractor._extract_by_keywords(resume)),
+        "batch_match_1k_jobs": _latency_ms(lambda: matcher.batch_match(resume_skills, jobs), repeats=5)
+    }
+
+
+def jobs_scaling(count: int, work_dir: Path) -> Dict[str, any]:
+    path = work_dir / f"jobs-{count}" / "job_title_des.csv"
+    if not path.exists():
+        rng = np.random.default_rng(SEED)
+        taxonomy = generate_taxonomy(10000, rng)
+        ranked = [skill_name(entry) for entries in taxonomy.values() for entry in entries]
+        write_jobs(path, TextSampler(ranked, rng), count, rng)
+
+    manager = DatasetManager(path, path.parent / "Resume.csv")
+    jobs, load_seconds, load_mb = _measure_build(manager.get_jobs)
+    index, index_seconds, index_mb = _measure_build(lambda: BM25Index.build(jobs.title_codes, jobs.unique_titles, jobs.descriptions))
+    titles, title_seconds, title_mb = _measure_build(
+        lambda: TitleIndex.build(jobs.title_codes, jobs.unique_titles, jobs.descriptions.lengths())
+    )
+    return {
+        "jobs": len(jobs),
+        "csv_mb": round(path.stat().st_size / (1024 * 1024), 1),
+        "load_seconds": load_seconds,
+        "load_peak_mb": load_mb,
+        "search_index_seconds": index_seconds,
+        "search_index_peak_mb": index_mb,
+        "title_index_seconds": title_seconds,
+        "title_index_peak_mb": title_mb,
+        "search": _latency_ms(lambda: index.search(["python", "sql", "aws"], limit=10)),
+        "title_lookup": _latency_ms(lambda: titles.lookup("senior data engineer"))
+    }
+
+
+def _sizes(text: str) -> List[int]:
+    return [int(part) for part in text.split(",") if part.strip()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure latency and memory against data size")
+    parser.add_argument("--skills", default="1000,10000,50000", help="Taxonomy sizes")
+    parser.add_argument("--jobs", default="10000,100000", help="Job counts")
+    parser.add_argument("--work-dir", type=Path, default=Path("/tmp/hiresight-scaling"),
+                        help="Generated data is cached here between runs")
+    parser.add_argument("--json", help="Write the results to this file")
+    args = parser.parse_args(argv)
+    args.work_dir.mkdir(parents=True, exist_ok=True)
+
+    results = {"skills": [], "jobs": []}
+    for size in _sizes(args.skills):
+        row = skills_scaling(size, args.work_dir)
+        results["skills"].append(row)
+        print(f"skills={row['skills']:>7}  load {row['load_seconds']:>7.2f}s {row['load_peak_mb']:>7.1f}MB  "
+              f"keywords {row['keyword_extraction']['median_ms']:>9.2f}ms  "
+              f"batch_match(1k) {row['batch_match_1k_jobs']['median_ms']:>8.2f}ms")
+    for count in _sizes(args.jobs):
+        row = jobs_scaling(count, args.work_dir)
+        results["jobs"].append(row)
+        print(f"jobs={row['jobs']:>9}  load {row['load_seconds']:>6.2f}s {row['load_peak_mb']:>7.1f}MB  "
+              f"index {row['search_index_seconds']:>6.2f}s {row['search_index_peak_mb']:>7.1f}MB  "
+              f"search {row['search']['median_ms']:>7.2f}ms  title {row['title_lookup']['median_ms']:>6.3f}ms")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,309 @@
+"""
+Soak test: hours of mixed load, failing on upward drift
+
+Drives the service with the load tester's open-loop workload and every
+``--sample-interval`` records:
+
+    rss        resident memory of the workers (plus the pre-fork parent)
+    uss        unique memory of the workers
+    open_fds   open file descriptors of the same processes
+    temp_files, temp_bytes
+               files in temp_uploads and the job upload spool
+    p50/p95/p99_ms
+               latency of the requests measured in that interval
+    structure:<name>
+               hiresight_structure_bytes from /metrics (taxonomy, indexes,
+               spaCy StringStore, ...), sized at most every MEMORY_SIZE_INTERVAL
+
+After the warmup, each series is checked for an upward trend. A series
+fails when both its Theil-Sen slope, projected over the run, and the
+difference between the medians of its last and first tenth exceed the
+limit: max(relative limit x baseline, absolute floor). Requiring both keeps
+a single spike or a step during warmup from failing the run. The exit
+status is 1 when any series fails.
+
+    python -m benchmarks.soak --spawn --server-workers 2 --duration 4h --rate 5 \\
+        --json soak.json
+
+    # Against a running service (temp-dir and fd numbers come from its
+    # /process/memory endpoint)
+    python -m benchmarks.soak --url http://localhost:8000 --duration 8h
+"""
+import argparse
+import asyncio
+import json
+import re
+import statistics
+import sys
+import time
+from typing import Dict, List, Tuple
+
+import httpx
+
+from benchmarks.loadtest import DEFAULT_MIX, LoadTest, format_table, parse_mix, percentile, spawn_server
+
+# name -> (relative limit, absolute floor); floors are in the series' unit
+DEFAULT_LIMITS = {
+    "rss": (0.10, 32 * 1024 * 1024),
+    "uss": (0.10, 32 * 1024 * 1024),
+    "open_fds": (0.25, 16),
+    "temp_files": (0.0, 5),
+    "temp_bytes": (0.0, 10 * 1024 * 1024),
+    "p50_ms": (0.25, 5.0),
+    "p95_ms": (0.25, 10.0),
+    "p99_ms": (0.50, 25.0),
+    "structure": (0.20, 1024 * 1024),
+}
+
+# Fewer samples than this after the warmup and a series is not judged
+MIN_SAMPLES = 6
+
+_STRUCTURE_LINE = re.compile(r'^hiresight_structure_bytes\{structure="([^"]+)"\} (\S+)$', re.MULTILINE)
+
+
+def parse_duration(text: str) -> float:
+    """Seconds from '90', '90s', '30m' or '4h'"""
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([smh]?)\s*", text)
+    if not match:
+        raise argparse.ArgumentTypeError(f"Invalid duration '{text}' (use e.g. 90s, 30m, 4h)")
+    return float(match.group(1)) * {"": 1, "s": 1, "m": 60, "h": 3600}[match.group(2)]
+
+
+def theil_sen_slope(times: List[float], values: List[float]) -> float:
+    """Median of the pairwise slopes; robust to outliers such as GC pauses"""
+    slopes = [
+        (values[j] - values[i]) / (times[j] - times[i])
+        for i in range(len(times))
+        for j in range(i + 1, len(times))
+        if times[j] > times[i]
+    ]
+    return statistics.median(slopes) if slopes else 0.0
+
+
+def detect_trend(times: List[float], values: List[float], relative: float, floor: float) -> Dict[str, any]:
+    """
+    Judge one series for upward drift
+
+    Args:
+        times: Sample times in seconds
+        values: Sample values
+        relative: Allowed growth as a fraction of the baseline
+        floor: Allowed growth in absolute terms (whichever limit is larger wins)
+
+    Returns:
+        Dict with baseline, end, slope_per_hour, growth, projected_growth,
+        limit and verdict (ok, drift or insufficient)
+    """
+    if len(values) < MIN_SAMPLES:
+        return {"samples": len(values), "verdict": "insufficient"}
+    edge = max(3, len(values) // 10)
+    baseline = statistics.median(values[:edge])
+    end = statistics.median(values[-edge:])
+    slope = theil_sen_slope(times, values)
+    projected = slope * (times[-1] - times[0])
+    growth = end - baseline
+    limit = max(relative * abs(baseline), floor)
+    return {
+        "samples": len(values),
+        "baseline": round(baseline, 3),
+        "end": round(end, 3),
+        "slope_per_hour": round(slope * 3600, 3),
+        "growth": round(growth, 3),
+        "projected_growth": round(projected, 3),
+        "limit": round(limit, 3),
+        "verdict": "drift" if min(growth, projected) > limit else "ok"
+    }
+
+
+class SoakTest:
+    """
+    A load test plus periodic resource and latency sampling
+    """
+
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.load = LoadTest(args)
+        self.load.window = []
+        self.samples: List[Dict[str, any]] = []
+
+    async def _sample(self, client: httpx.AsyncClient, elapsed: float) -> Dict[str, any]:
+        window, self.load.window = self.load.window, []
+        latencies = sorted(latency for _, _, latency in window)
+        errors = sum(1 for _, status, _ in window if not status.startswith("2") and status not in ("429", "503"))
+        sample = {
+            "t": round(elapsed, 3),
+            "warmup": elapsed < self.args.warmup,
+            "requests": len(latencies),
+            "errors": errors,
+            "in_flight": self.load.in_flight
+        }
+        if latencies:
+            for pct in (50, 95, 99):
+                sample[f"p{pct}_ms"] = round(percentile(latencies, pct) * 1000, 3)
+
+        try:
+            report = (await client.get("/process/memory")).json()["data"]
+            processes = list(report["workers"]) + ([report["parent"]] if report.get("parent") else [])
+            sample["rss"] = sum(process["rss"] for process in processes)
+            sample["uss"] = sum(process["uss"] or 0 for process in report["workers"])
+            sample["open_fds"] = sum(process.get("open_fds") or 0 for process in processes)
+            temp_dirs = report.get("temp_dirs", {})
+            sample["temp_files"] = sum(usage["files"] for usage in temp_dirs.values())
+            sample["temp_bytes"] = sum(usage["bytes"] for usage in temp_dirs.values())
+        except (httpx.HTTPError, KeyError, ValueError) as e:
+            sample["sample_error"] = f"process/memory: {e}"
+
+        try:
+            metrics = (await client.get("/metrics")).text
+            for name, value in _STRUCTURE_LINE.findall(metrics):
+                sample[f"structure:{name}"] = float(value)
+        except httpx.HTTPError as e:
+            sample["sample_error"] = f"metrics: {e}"
+        return sample
+
+    async def _sampler(self, started: float, done: asyncio.Event):
+        async with httpx.AsyncClient(base_url=self.args.url, timeout=30) as client:
+            next_at = started + self.args.sample_interval
+            while not done.is_set():
+                try:
+                    await asyncio.wait_for(done.wait(), timeout=max(0.0, next_at - time.perf_counter()))
+                except asyncio.TimeoutError:
+                    pass
+                if done.is_set():
+                    break
+                sample = await self._sample(client, time.perf_counter() - started)
+                self.samples.append(sample)
+                next_at += self.args.sample_interval
+                print(_format_sample(sample), flush=True)
+
+    async def run(self) -> Dict[str, any]:
+        done = asyncio.Event()
+        started = time.perf_counter()
+        sampler = asyncio.create_task(self._sampler(started, done))
+        try:
+            load_report = await self.load.run()
+        finally:
+            done.set()
+            await sampler
+        return {"load": load_report, "samples": self.samples, "trends": self.analyze()}
+
+    def analyze(self) -> Dict[str, Dict[str, any]]:
+        """Trend verdict per series, over the samples taken after the warmup"""
+        measured = [sample for sample in self.samples if not sample["warmup"]]
+        names = sorted({key for sample in measured for key in sample if key in DEFAULT_LIMITS or key.startswith("structure:")})
+        trends = {}
+        for name in names:
+            points = [(sample["t"], sample[name]) for sample in measured if name in sample]
+            relative, floor = self.args.limits["structure" if name.startswith("structure:") else name]
+            trends[name] = detect_trend([t for t, _ in points], [v for _, v in points], relative, floor)
+        return trends
+
+
+def _format_sample(sample: Dict[str, any]) -> str:
+    def megabytes(key):
+        return f"{sample[key] / (1024 * 1024):8.1f}" if key in sample else "       -"
+
+    return (
+        f"t={sample['t']:>8.0f}s{' (warmup)' if sample['warmup'] else '         '} "
+        f"reqs {sample['requests']:>6} err {sample['errors']:>4}  "
+        f"p95 {sample.get('p95_ms', 0):>8.1f}ms  rss {megabytes('rss')}MB  uss {megabytes('uss')}MB  "
+        f"fds {sample.get('open_fds', '-'):>5}  temp {sample.get('temp_files', '-'):>4} files"
+    )
+
+
+def _is_bytes(name: str) -> bool:
+    return name in ("rss", "uss", "temp_bytes") or name.startswith("structure:")
+
+
+def format_trends(trends: Dict[str, Dict[str, any]]) -> str:
+    """Text table of the trend verdicts (byte series in MB)"""
+    header = f"{'series':<36} {'baseline':>12} {'end':>12} {'slope/h':>12} {'growth':>12} {'limit':>12}  verdict"
+    lines = [header, "-" * len(header)]
+    for name, trend in trends.items():
+        if trend["verdict"] == "insufficient":
+            lines.append(f"{name:<36} {'':>12} {'':>12} {'':>12} {'':>12} {'':>12}  insufficient ({trend['samples']} samples)")
+            continue
+        scale = 1024 * 1024 if _is_bytes(name) else 1
+        label = f"{name} (MB)" if _is_bytes(name) else name
+        values = [trend[key] / scale for key in ("baseline", "end", "slope_per_hour", "growth", "limit")]
+        lines.append(
+            f"{label:<36} " + " ".join(f"{value:>12.2f}" for value in values)
+            + f"  {'DRIFT' if trend['verdict'] == 'drift' else 'ok'}"
+        )
+    return "\n".join(lines)
+
+
+def _limits(args: argparse.Namespace) -> Dict[str, Tuple[float, float]]:
+    limits = dict(DEFAULT_LIMITS)
+    limits["rss"] = limits["uss"] = (args.max_memory_growth, DEFAULT_LIMITS["rss"][1])
+    limits["open_fds"] = (DEFAULT_LIMITS["open_fds"][0], args.max_fd_growth)
+    limits["temp_files"] = (0.0, args.max_temp_files)
+    for name in ("p50_ms", "p95_ms"):
+        limits[name] = (args.max_latency_growth, DEFAULT_LIMITS[name][1])
+    limits["p99_ms"] = (args.max_p99_growth, DEFAULT_LIMITS["p99_ms"][1])
+    limits["structure"] = (args.max_structure_growth, DEFAULT_LIMITS["structure"][1])
+    return limits
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Soak test: long mixed load with drift detection")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--url", help="Base URL of a running service")
+    target.add_argument("--spawn", action="store_true", help="Start the service (fake LLM) on a free port")
+    parser.add_argument("--server-workers", type=int, default=1, help="Workers for --spawn (>1 uses app.server)")
+    parser.add_argument("--duration", type=parse_duration, default=parse_duration("2h"), help="Measured time, e.g. 4h")
+    parser.add_argument("--warmup", type=parse_duration, default=parse_duration("5m"),
+                        help="Load before trends are judged (caches fill, indexes build)")
+    parser.add_argument("--sample-interval", type=parse_duration, default=parse_duration("30s"))
+    parser.add_argument("--rate", type=float, default=5.0, help="Arrivals per second")
+    parser.add_argument("--arrival", choices=("poisson", "constant"), default="poisson")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Scenario weights (default {DEFAULT_MIX})")
+    parser.add_argument("--max-in-flight", type=int, default=256, help="Client-side concurrency cap")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Per-request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--max-memory-growth", type=float, default=0.10, help="Allowed RSS/USS growth (fraction)")
+    parser.add_argument("--max-fd-growth", type=float, default=16, help="Allowed growth in open descriptors")
+    parser.add_argument("--max-temp-files", type=float, default=5, help="Allowed growth in spooled temp files")
+    parser.add_argument("--max-latency-growth", type=float, default=0.25, help="Allowed p50/p95 growth (fraction)")
+    parser.add_argument("--max-p99-growth", type=float, default=0.50,
+                        help="Allowed p99 growth (fraction); looser because the tail is noisier")
+    parser.add_argument("--max-structure-growth", type=float, default=0.20,
+                        help="Allowed growth of each long-lived structure (fraction)")
+    parser.add_argument("--json", help="Write the samples, trends and load report to this file")
+    args = parser.parse_args(argv)
+    if args.rate <= 0:
+        parser.error("--rate must be positive")
+    try:
+        parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+    args.limits = _limits(args)
+
+    process = None
+    if args.spawn:
+        process, args.url = spawn_server(args.server_workers, ready_timeout=180)
+    try:
+        report = asyncio.run(SoakTest(args).run())
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=30)
+
+    print()
+    print(format_table(report["load"]))
+    print()
+    print(format_trends(report["trends"]))
+    drifted = [name for name, trend in report["trends"].items() if trend["verdict"] == "drift"]
+    report["passed"] = not drifted
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({**report, "config": {**report["load"]["config"], "limits": args.limits}}, f, indent=2)
+    if drifted:
+        print(f"\nFAIL: upward drift in {', '.join(drifted)}")
+        return 1
+    print("\nPASS: no upward drift")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,33 @@
+"""Benchmarks: dataset lookups on a generated 20k-row job table"""
+import random
+
+from app.utils import dataset_utils
+
+
+def test_search_jobs_page(benchmark, job_dataset):
+    page = benchmark(dataset_utils.search_jobs_page, ["python", "docker", "aws"], 10, 0)
+    assert page["jobs"]
+
+
+def test_search_jobs_deep_page(benchmark, job_dataset):
+    benchmark(dataset_utils.search_jobs_page, ["sql", "agile"], 10, 500)
+
+
+def test_job_by_title_exact(benchmark, job_dataset):
+    job = benchmark(dataset_utils.get_job_description_by_title, "senior data scientist")
+    assert job["job_title"]
+
+
+def test_job_by_title_substring(benchmark, job_dataset):
+    benchmark(dataset_utils.get_job_description_by_title, "ngineer")
+
+
+def test_autocomplete_titles(benchmark, job_dataset):
+    suggestions = benchmark(dataset_utils.autocomplete_job_titles, "dat", 10)
+    assert suggestions
+
+
+def test_random_job(benchmark, job_dataset, seed):
+    random.seed(seed)
+    job = benchmark(dataset_utils.get_random_job_description)
+    assert job["job_title"]
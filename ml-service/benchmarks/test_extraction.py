@@ -0,0 +1,28 @@
+"""Benchmarks: skill extraction"""
+import pytest
+
+from app.services.skill_extractor import skill_extractor
+from app.utils.degradation import FULL, KEYWORD_ONLY
+
+requires_spacy = pytest.mark.skipif(skill_extractor.nlp is None, reason="spaCy model not installed")
+
+
+def test_keywords_short_text(benchmark, short_text):
+    skills = benchmark(skill_extractor._extract_by_keywords, short_text)
+    assert skills
+
+
+def test_keywords_resume(benchmark, resume_text):
+    skills = benchmark(skill_extractor._extract_by_keywords, resume_text)
+    assert skills
+
+
+@requires_spacy
+def test_nlp_resume(benchmark, resume_text):
+    benchmark(skill_extractor._extract_by_nlp, resume_text)
+
+
+@pytest.mark.parametrize("mode", [FULL, KEYWORD_ONLY])
+def test_extract_skills_resume(benchmark, resume_text, mode):
+    result = benchmark(skill_extractor.extract_skills, resume_text, mode=mode)
+    assert result["success"]
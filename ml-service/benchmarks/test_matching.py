@@ -0,0 +1,23 @@
+"""Benchmarks: resume to job matching"""
+import pytest
+
+from app.services.matcher import matcher
+
+
+def test_calculate_match_skills(benchmark, resume_skills, job_listings):
+    job_skills = job_listings(1)[0]["skills"]
+    result = benchmark(matcher.calculate_match, resume_skills=resume_skills, job_skills=job_skills)
+    assert result["success"]
+
+
+def test_calculate_match_description(benchmark, resume_skills, job_description):
+    # Includes extracting the skills from the job description
+    result = benchmark(matcher.calculate_match, resume_skills=resume_skills, job_description=job_description)
+    assert result["success"]
+
+
+@pytest.mark.parametrize("jobs", [1, 100, 10000])
+def test_batch_match(benchmark, resume_skills, job_listings, jobs):
+    listings = job_listings(jobs)
+    result = benchmark(matcher.batch_match, resume_skills, listings)
+    assert result["total_jobs"] == jobs
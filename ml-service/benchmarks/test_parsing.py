@@ -0,0 +1,12 @@
+"""Benchmarks: PDF parsing and text cleaning"""
+from app.services.resume_parser import resume_parser
+
+
+def test_parse_pdf(benchmark, sample_pdf):
+    result = benchmark.pedantic(resume_parser.parse_pdf, args=(str(sample_pdf),), rounds=5, iterations=1)
+    assert result["success"]
+
+
+def test_clean_text(benchmark, resume_raw_text):
+    cleaned = benchmark(resume_parser._clean_text, resume_raw_text)
+    assert cleaned
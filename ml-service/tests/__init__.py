@@ -0,0 +1 @@
+"""Unit tests for the ML service (run from ml-service/: pytest tests)"""
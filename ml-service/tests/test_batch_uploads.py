@@ -0,0 +1,80 @@
+"""
+Temp file cleanup for POST /parse-and-extract/batch
+"""
+import asyncio
+import io
+import threading
+import time
+
+import pytest
+from starlette.datastructures import UploadFile
+from starlette.requests import ClientDisconnect
+
+from app import main
+
+
+def _uploads(count: int):
+    return [UploadFile(io.BytesIO(b"%PDF-1.4 test"), filename=f"resume_{i}.pdf") for i in range(count)]
+
+
+@pytest.fixture
+def temp_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "TEMP_DIR", tmp_path)
+    return tmp_path
+
+
+def test_disconnect_before_stream_starts_removes_uploads(temp_dir):
+    async def scenario():
+        response = await main.parse_and_extract_batch(files=_uploads(3), concurrency=None, fields=None)
+        assert len(list(temp_dir.iterdir())) == 3
+
+        async def receive():
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            raise OSError("client went away")
+
+        scope = {"type": "http", "asgi": {"spec_version": "2.4"}}
+        with pytest.raises(ClientDisconnect):
+            await response(scope, receive, send)
+
+    asyncio.run(scenario())
+    assert list(temp_dir.iterdir()) == []
+
+
+def test_cancel_during_spool_removes_uploads(temp_dir, monkeypatch):
+    started = threading.Semaphore(0)
+    release = threading.Event()
+    finished = threading.Semaphore(0)
+    save_upload = main._save_upload
+
+    def slow_save(file, temp_file_path=None):
+        try:
+            path = save_upload(file, temp_file_path)
+            started.release()
+            release.wait(5)
+            return path
+        finally:
+            finished.release()
+
+    monkeypatch.setattr(main, "_save_upload", slow_save)
+
+    async def scenario():
+        handler = asyncio.create_task(
+            main.parse_and_extract_batch(files=_uploads(2), concurrency=None, fields=None)
+        )
+        for _ in range(2):
+            assert await asyncio.to_thread(started.acquire, timeout=5)
+        handler.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await handler
+
+    asyncio.run(scenario())
+    release.set()
+    for _ in range(2):
+        assert finished.acquire(timeout=5)
+    # The save threads remove their own file after finishing
+    deadline = time.monotonic() + 5
+    while list(temp_dir.iterdir()) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert list(temp_dir.iterdir()) == []
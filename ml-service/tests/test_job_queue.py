@@ -0,0 +1,234 @@
+"""
+SQLite job store and queue: idempotency, backpressure, claiming, retention
+and lease-based recovery
+"""
+import asyncio
+
+import pytest
+
+from app.utils import job_queue
+from app.utils.job_queue import (
+    FAILED,
+    QUEUED,
+    RUNNING,
+    SUCCEEDED,
+    IdempotencyConflict,
+    JobQueue,
+    JobStore,
+    QueueFull,
+    fingerprint
+)
+
+
+class WallClock:
+    """Stands in for time.time in app.utils.job_queue"""
+
+    def __init__(self, start: float = 1_700_000_000.0):
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+@pytest.fixture
+def wall_clock(monkeypatch) -> WallClock:
+    fake = WallClock()
+    monkeypatch.setattr(job_queue.time, "time", fake)
+    return fake
+
+
+@pytest.fixture
+def store(tmp_path) -> JobStore:
+    return JobStore(tmp_path / "jobs.sqlite3")
+
+
+# Idempotency and backpressure
+
+def test_idempotent_replay_returns_original_job(store):
+    key_fingerprint = fingerprint("resume", b"%PDF", "job text", 0)
+    job, created = store.create("analysis", {"n": 1}, idempotency_key="k1", request_fingerprint=key_fingerprint)
+    replay, replay_created = store.create("analysis", {"n": 1}, idempotency_key="k1", request_fingerprint=key_fingerprint)
+    assert created and not replay_created
+    assert replay["id"] == job["id"]
+    assert store.counts()[QUEUED] == 1
+
+
+def test_idempotency_key_reused_for_other_request_conflicts(store):
+    store.create("analysis", {}, idempotency_key="k1", request_fingerprint=fingerprint("a"))
+    with pytest.raises(IdempotencyConflict):
+        store.create("analysis", {}, idempotency_key="k1", request_fingerprint=fingerprint("b"))
+    assert store.counts()[QUEUED] == 1
+
+
+def test_fingerprint_separates_parts():
+    assert fingerprint("ab", "c") != fingerprint("a", "bc")
+    assert fingerprint("a", b"b") == fingerprint(b"a", "b")
+
+
+def test_expired_idempotency_key_can_be_reused(store, wall_clock):
+    job, _ = store.create("analysis", {}, idempotency_key="k1", request_fingerprint=fingerprint("a"))
+    store.claim("owner")
+    store.finish(job["id"], {"ok": True}, ttl=60)
+    wall_clock.advance(61)
+    again, created = store.create("analysis", {}, idempotency_key="k1", request_fingerprint=fingerprint("b"))
+    assert created and again["id"] != job["id"]
+
+
+def test_queue_full(store):
+    store.create("analysis", {}, max_queued=2)
+    store.create("analysis", {}, max_queued=2)
+    with pytest.raises(QueueFull):
+        store.create("analysis", {}, max_queued=2)
+    assert store.counts()[QUEUED] == 2
+    # Running jobs do not count against the limit
+    store.claim("owner")
+    store.create("analysis", {}, max_queued=2)
+
+
+# Claiming
+
+def test_claim_by_priority_then_age(store, wall_clock):
+    low, _ = store.create("analysis", {"name": "low"}, priority=0)
+    wall_clock.advance(1)
+    high, _ = store.create("analysis", {"name": "high"}, priority=5)
+    wall_clock.advance(1)
+    later_low, _ = store.create("analysis", {"name": "later-low"}, priority=0)
+
+    claimed = [store.claim("owner") for _ in range(3)]
+    assert [job["id"] for job in claimed] == [high["id"], low["id"], later_low["id"]]
+    assert all(job["status"] == RUNNING and job["attempts"] == 1 for job in claimed)
+    assert claimed[0]["payload"] == {"name": "high"}
+    assert store.claim("owner") is None
+
+
+def test_claim_is_exclusive_across_connections(tmp_path):
+    first = JobStore(tmp_path / "jobs.sqlite3")
+    second = JobStore(tmp_path / "jobs.sqlite3")
+    first.create("analysis", {})
+    assert first.claim("a") is not None
+    assert second.claim("b") is None
+
+
+# Retention
+
+def test_purge_expired_returns_payloads(store, wall_clock):
+    job, _ = store.create("analysis", {"file": "x.pdf"})
+    store.claim("owner")
+    store.finish(job["id"], error="boom", ttl=60)
+    assert store.get(job["id"])["status"] == FAILED
+    assert store.purge_expired() == []
+
+    wall_clock.advance(60)
+    assert store.get(job["id"]) is None
+    purged = store.purge_expired()
+    assert [row["payload"] for row in purged] == [{"file": "x.pdf"}]
+    assert sum(store.counts().values()) == 0
+
+
+# Leases and recovery
+
+def test_live_lease_is_not_requeued(tmp_path, wall_clock):
+    owner_store = JobStore(tmp_path / "jobs.sqlite3")
+    sibling_store = JobStore(tmp_path / "jobs.sqlite3")
+    job, _ = owner_store.create("analysis", {})
+    owner_store.claim("worker-1", lease=30)
+
+    wall_clock.advance(29)
+    assert sibling_store.requeue_interrupted() == (0, [])
+    assert sibling_store.get(job["id"])["status"] == RUNNING
+
+    # Heartbeat keeps it alive past the original lease
+    assert owner_store.renew_leases("worker-1", lease=30) == 1
+    wall_clock.advance(29)
+    assert sibling_store.requeue_interrupted() == (0, [])
+
+
+def test_expired_lease_is_requeued_and_old_owner_cannot_finish(store, wall_clock):
+    job, _ = store.create("analysis", {})
+    store.claim("worker-1", lease=30)
+    wall_clock.advance(31)
+    assert store.requeue_interrupted()[0] == 1
+    assert store.get(job["id"])["status"] == QUEUED
+
+    rerun = store.claim("worker-2")
+    assert rerun["attempts"] == 2
+    assert not store.finish(job["id"], {"stale": True}, owner="worker-1")
+    assert store.finish(job["id"], {"fresh": True}, owner="worker-2")
+    finished = store.get(job["id"])
+    assert finished["status"] == SUCCEEDED and finished["result"] == {"fresh": True}
+
+
+def test_requeue_fails_jobs_out_of_attempts(store, wall_clock):
+    job, _ = store.create("analysis", {"file": "x.pdf"})
+    for _ in range(3):
+        store.claim("worker", lease=1)
+        wall_clock.advance(2)
+        requeued, exhausted = store.requeue_interrupted(max_attempts=3)
+    assert requeued == 0
+    assert [row["id"] for row in exhausted] == [job["id"]]
+    assert exhausted[0]["payload"] == {"file": "x.pdf"}
+    failed = store.get(job["id"])
+    assert failed["status"] == FAILED and failed["error"] == "Interrupted too many times"
+    assert failed["expires_at"] is not None
+
+
+def test_release_requeues_own_jobs_only(store):
+    mine, _ = store.create("analysis", {})
+    theirs, _ = store.create("analysis", {})
+    store.claim("me")
+    store.claim("them")
+    assert store.release("me") == 1
+    assert store.get(mine["id"])["status"] == QUEUED
+    assert store.get(theirs["id"])["status"] == RUNNING
+
+
+# JobQueue
+
+def test_queue_recover_cleans_up_exhausted_jobs(store, wall_clock):
+    cleaned = []
+    queue = JobQueue(store, workers=1)
+    queue.register("analysis", None, cleanup=lambda payload: cleaned.append(payload["file"]))
+    store.create("analysis", {"file": "x.pdf"})
+    for _ in range(job_queue.JOB_MAX_ATTEMPTS):
+        store.claim("dead-worker", lease=1)
+        wall_clock.advance(2)
+        queue.recover()
+    assert cleaned == ["x.pdf"]
+
+
+def test_queue_runs_jobs_and_reports_progress(store):
+    async def handler(payload, progress):
+        await progress("parse", "running")
+        await progress("parse", "done")
+        if payload.get("fail"):
+            raise RuntimeError("handler failed")
+        return {"doubled": payload["n"] * 2}
+
+    async def scenario():
+        queue = JobQueue(store, workers=2)
+        queue.register("analysis", handler, stages=("parse",))
+        queue.start()
+        try:
+            ok, _ = await queue.submit("analysis", {"n": 21})
+            bad, _ = await queue.submit("analysis", {"n": 0, "fail": True})
+            for _ in range(200):
+                jobs = [await queue.get(ok["id"]), await queue.get(bad["id"])]
+                if all(job["status"] in (SUCCEEDED, FAILED) for job in jobs):
+                    return jobs
+                await asyncio.sleep(0.01)
+            raise AssertionError("jobs did not finish")
+        finally:
+            await queue.stop()
+
+    ok, bad = asyncio.run(scenario())
+    assert ok["status"] == SUCCEEDED and ok["result"] == {"doubled": 42}
+    assert ok["progress"]["stages"] == {"parse": "done"}
+    assert bad["status"] == FAILED and bad["error"] == "handler failed"
+
+
+def test_unknown_kind_is_rejected(store):
+    with pytest.raises(ValueError):
+        asyncio.run(JobQueue(store).submit("missing", {}))
@@ -0,0 +1,48 @@
+"""
+Error records written by the structured logger
+"""
+import io
+import json
+
+import pytest
+
+from app.utils import logger
+
+
+@pytest.fixture
+def stream(monkeypatch):
+    buffer = io.StringIO()
+    monkeypatch.setattr(logger._writer, "stream", buffer)
+    return buffer
+
+
+def _records(stream):
+    logger.flush_logs()
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_raised_error_keeps_its_traceback(stream, monkeypatch):
+    monkeypatch.setattr(logger, "LOG_FORMAT", "json")
+
+    def load():
+        raise ValueError("bad header")
+
+    try:
+        load()
+    except ValueError as e:
+        logger.log_error("Error loading dataset", e)
+
+    record = _records(stream)[-1]
+    assert record["error_type"] == "ValueError"
+    assert record["error"] == "bad header"
+    assert "in load" in record["traceback"]
+    assert record["traceback"].rstrip().endswith("ValueError: bad header")
+
+
+def test_unraised_error_has_no_traceback(stream, monkeypatch):
+    monkeypatch.setattr(logger, "LOG_FORMAT", "json")
+    logger.log_error("Rejected input", ValueError("empty"))
+
+    record = _records(stream)[-1]
+    assert record["error"] == "empty"
+    assert "traceback" not in record
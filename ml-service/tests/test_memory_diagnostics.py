@@ -0,0 +1,49 @@
+"""
+Structure size gauges must not walk structures on the scraping thread
+"""
+import time
+
+from app.utils.memory_diagnostics import MemoryDiagnostics
+
+WALK_SECONDS = 0.3
+
+
+def _slow_size():
+    time.sleep(WALK_SECONDS)
+    return 1024, 8
+
+
+def _wait_for(condition, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        time.sleep(0.01)
+
+
+def test_collect_metrics_reads_cache_and_refreshes_in_background():
+    diagnostics = MemoryDiagnostics(size_interval=60)
+    diagnostics.register("slow", _slow_size)
+
+    started = time.perf_counter()
+    assert list(diagnostics.collect_metrics()) == []
+    assert time.perf_counter() - started < WALK_SECONDS / 2
+
+    _wait_for(lambda: "slow" in diagnostics.cached_structure_sizes())
+    gauges = {(name, labels.get("structure")): value for name, labels, value in diagnostics.collect_metrics()}
+    assert gauges[("hiresight_structure_bytes", "slow")] == 1024
+    assert gauges[("hiresight_structure_entries", "slow")] == 8
+
+
+def test_stale_cache_starts_one_refresh():
+    calls = []
+
+    def counted():
+        calls.append(1)
+        return _slow_size()
+
+    diagnostics = MemoryDiagnostics(size_interval=0)
+    diagnostics.register("slow", counted)
+    for _ in range(20):
+        diagnostics.cached_structure_sizes()
+    _wait_for(lambda: not diagnostics._refreshing)
+    assert len(calls) == 1
@@ -0,0 +1,93 @@
+"""
+Concurrent profiled requests through ProfilingMiddleware and the pools
+"""
+import asyncio
+import cProfile
+import threading
+import time
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from app.utils import profiling
+from app.utils.executors import ManagedPool
+from app.utils.profiling import Profiler, ProfilingMiddleware
+
+CONCURRENT_REQUESTS = 4
+
+
+class ExclusiveProfile(cProfile.Profile):
+    """
+    cProfile.Profile as it behaves from Python 3.12: a second enable() while
+    another profiler is active raises ValueError
+    """
+
+    _active = None
+    _lock = threading.Lock()
+
+    def enable(self, *args, **kwargs):
+        with ExclusiveProfile._lock:
+            if ExclusiveProfile._active is not None:
+                raise ValueError("Another profiling tool is already active")
+            ExclusiveProfile._active = self
+        super().enable(*args, **kwargs)
+
+    def disable(self):
+        super().disable()
+        with ExclusiveProfile._lock:
+            ExclusiveProfile._active = None
+
+
+def _busy(seconds: float) -> float:
+    deadline = time.perf_counter() + seconds
+    total = 0.0
+    while time.perf_counter() < deadline:
+        total += sum(i * i for i in range(200))
+    return total
+
+
+def _app(profiler: Profiler, pool: ManagedPool):
+    async def work(request):
+        await pool.run(_busy, 0.1)
+        return JSONResponse({"ok": True})
+
+    return ProfilingMiddleware(Starlette(routes=[Route("/work", work)]), profiler=profiler)
+
+
+async def _concurrent_requests(app):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await asyncio.gather(*(
+            client.get("/work", headers={"X-Profile": "1"}) for _ in range(CONCURRENT_REQUESTS)
+        ))
+
+
+@pytest.mark.parametrize("exclusive", [False, True], ids=["cprofile", "interpreter-wide-cprofile"])
+def test_concurrent_profiled_requests(monkeypatch, exclusive):
+    if exclusive:
+        monkeypatch.setattr(profiling.cProfile, "Profile", ExclusiveProfile)
+    profiler = Profiler(enabled=True, sample_rate=0.0, interval=0.002, max_concurrent=CONCURRENT_REQUESTS)
+    # Pool calls go through the process-wide profiler
+    monkeypatch.setattr(profiling, "profiler", profiler)
+    pool = ManagedPool("profiling-test", CONCURRENT_REQUESTS)
+    try:
+        responses = asyncio.run(_concurrent_requests(_app(profiler, pool)))
+    finally:
+        pool.shutdown()
+
+    assert [response.status_code for response in responses] == [200] * CONCURRENT_REQUESTS
+    assert all("x-profile-id" in response.headers for response in responses)
+    assert profiler.active == 0
+    assert profiler._threads == {}
+
+    profiles = [profiler.get(response.headers["x-profile-id"]) for response in responses]
+    assert all(profile is not None and profile.profiled_seconds > 0 for profile in profiles)
+    with_cprofile = [profile for profile in profiles if profile.pstats_bytes() is not None]
+    assert with_cprofile
+    if exclusive:
+        # Segments that overlapped another ran under the sampler alone
+        assert profiler.sampled_only == sum(profile.sampled_only_segments for profile in profiles)
+        assert len(with_cprofile) + profiler.sampled_only == CONCURRENT_REQUESTS
@@ -0,0 +1,235 @@
+"""
+Circuit breaker, retry policy, deadline and ResilientCaller behaviour
+"""
+import threading
+import time
+
+import pytest
+
+from app.utils.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    Deadline,
+    DeadlineExceeded,
+    ResilientCaller,
+    RetryPolicy
+)
+
+
+class ClientError(Exception):
+    """Non-retryable error in these tests"""
+
+
+def _breaker(**kwargs) -> CircuitBreaker:
+    settings = dict(failure_rate_threshold=0.5, minimum_calls=4, window_seconds=60, open_seconds=30)
+    settings.update(kwargs)
+    return CircuitBreaker(**settings)
+
+
+# CircuitBreaker
+
+def test_breaker_needs_minimum_calls_before_opening(clock):
+    breaker = _breaker()
+    for _ in range(3):
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+
+
+def test_breaker_opens_on_failure_rate(clock):
+    breaker = _breaker()
+    breaker.record_success()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_breaker_window_forgets_old_failures(clock):
+    breaker = _breaker()
+    for _ in range(3):
+        breaker.record_failure()
+    clock.advance(61)
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.stats()["window_failures"] == 1
+
+
+def test_breaker_half_open_after_cool_down(clock):
+    breaker = _breaker(half_open_max_calls=1)
+    for _ in range(4):
+        breaker.record_failure()
+    clock.advance(29.9)
+    assert breaker.state == CircuitBreaker.OPEN
+    clock.advance(0.2)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request()
+    # Only one probe at a time
+    assert not breaker.allow_request()
+
+
+def test_breaker_half_open_success_closes(clock):
+    breaker = _breaker()
+    for _ in range(4):
+        breaker.record_failure()
+    clock.advance(30)
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.stats()["window_calls"] == 1
+
+
+def test_breaker_half_open_failure_reopens(clock):
+    breaker = _breaker()
+    for _ in range(4):
+        breaker.record_failure()
+    clock.advance(30)
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.stats()["times_opened"] == 2
+    clock.advance(29)
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_breaker_ignored_outcome_frees_probe(clock):
+    breaker = _breaker()
+    for _ in range(4):
+        breaker.record_failure()
+    clock.advance(30)
+    assert breaker.allow_request()
+    breaker.record_ignored()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request()
+
+
+# RetryPolicy
+
+def test_retry_delay_within_jitter_bounds():
+    policy = RetryPolicy(base_delay=0.5, max_delay=3.0)
+    for retry, ceiling in ((1, 0.5), (2, 1.0), (3, 2.0), (4, 3.0), (10, 3.0)):
+        delays = [policy.delay(retry) for _ in range(500)]
+        assert all(0 <= delay <= ceiling for delay in delays)
+        # Full jitter spreads over the whole range
+        assert max(delays) > ceiling * 0.8
+        assert min(delays) < ceiling * 0.2
+
+
+# Deadline
+
+def test_deadline_expiry(clock):
+    deadline = Deadline(5)
+    assert deadline.remaining() == 5
+    assert deadline.cap(20) == 5
+    assert deadline.cap(2) == 2
+    clock.advance(4)
+    assert not deadline.expired()
+    clock.advance(1)
+    assert deadline.expired()
+    assert deadline.remaining() == 0
+
+
+def test_unbounded_deadline():
+    deadline = Deadline()
+    assert deadline.remaining() is None
+    assert not deadline.expired()
+    assert deadline.cap(7) == 7
+
+
+# ResilientCaller
+
+def _caller(**kwargs) -> ResilientCaller:
+    settings = dict(
+        breaker=_breaker(),
+        retry_policy=RetryPolicy(
+            max_retries=2, base_delay=0, max_delay=0,
+            is_retryable=lambda e: not isinstance(e, ClientError)
+        ),
+        attempt_timeout=5
+    )
+    settings.update(kwargs)
+    return ResilientCaller("test", **settings)
+
+
+def test_caller_retries_then_succeeds():
+    outcomes = [ConnectionError("down"), ConnectionError("down"), "ok"]
+
+    def fn(timeout):
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    caller = _caller()
+    assert caller.call(fn) == "ok"
+    assert caller.stats()["counters"]["retries"] == 2
+
+
+def test_caller_runs_inline_without_hedging():
+    threads = []
+    caller = _caller()
+    caller.call(lambda timeout: threads.append(threading.get_ident()))
+    assert threads == [threading.get_ident()]
+
+
+def test_non_retryable_errors_do_not_trip_breaker():
+    caller = _caller()
+
+    def fn(timeout):
+        raise ClientError("bad api key")
+
+    for _ in range(10):
+        with pytest.raises(ClientError):
+            caller.call(fn)
+    assert caller.breaker.state == CircuitBreaker.CLOSED
+    assert caller.breaker.stats()["window_calls"] == 0
+
+
+def test_open_breaker_short_circuits():
+    caller = _caller(retry_policy=RetryPolicy(max_retries=0))
+
+    def fn(timeout):
+        raise ConnectionError("down")
+
+    for _ in range(4):
+        with pytest.raises(ConnectionError):
+            caller.call(fn)
+    with pytest.raises(CircuitOpenError):
+        caller.call(fn)
+    assert caller.stats()["counters"]["short_circuited"] == 1
+
+
+def test_expired_deadline_raises(clock):
+    deadline = Deadline(1)
+    clock.advance(2)
+    with pytest.raises(DeadlineExceeded):
+        _caller().call(lambda timeout: "ok", deadline=deadline)
+
+
+def test_attempt_timeout_is_capped_by_deadline(clock):
+    seen = []
+    _caller(attempt_timeout=20).call(lambda timeout: seen.append(timeout), deadline=Deadline(3))
+    assert seen == [3]
+
+
+def test_hedged_executor_fits_concurrent_callers():
+    calls = []
+
+    def fn(timeout):
+        calls.append(timeout)
+        time.sleep(0.05)
+        return "ok"
+
+    caller = _caller(hedge=True, max_callers=16, attempt_timeout=1)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(caller.call(fn))) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == ["ok"] * 16
+    assert len(calls) == 16
+    assert caller.stats()["counters"]["timeouts"] == 0
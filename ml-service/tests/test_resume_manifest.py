@@ -0,0 +1,69 @@
+"""
+Sample resume manifest: configured categories vs other subdirectories
+"""
+import threading
+
+from app.utils.resume_manifest import ResumeManifest
+
+
+def _write(directory, name: str, content: bytes = b"%PDF-1.4"):
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / name).write_bytes(content)
+
+
+def test_other_directory_is_listed_but_not_counted(tmp_path):
+    _write(tmp_path / "A", "a.pdf")
+    _write(tmp_path / "job_data", "x.pdf")
+    manifest = ResumeManifest(tmp_path, ["A"], check_interval=0)
+
+    assert manifest.counts() == {"A": 1}
+    assert manifest.get_paths("job_data") == [str(tmp_path / "job_data" / "x.pdf")]
+    assert manifest.counts() == {"A": 1}
+    assert manifest.categories == ["A"]
+
+
+def test_other_directory_rescanned_only_on_change(tmp_path):
+    _write(tmp_path / "B", "b1.pdf")
+    manifest = ResumeManifest(tmp_path, [], check_interval=0)
+
+    assert len(manifest.get_files("B")) == 1
+    scans = manifest.scans
+    assert len(manifest.get_files("B")) == 1
+    assert manifest.scans == scans
+
+
+def test_rejects_names_outside_root(tmp_path):
+    manifest = ResumeManifest(tmp_path / "resumes", [], check_interval=0)
+    (tmp_path / "resumes").mkdir()
+    (tmp_path / "outside").mkdir()
+
+    assert manifest.get_paths("") == []
+    assert manifest.get_paths(".hidden") == []
+    assert manifest.get_paths("../outside") == []
+    assert manifest.get_paths("missing") == []
+
+
+def test_counts_while_other_directories_are_listed(tmp_path):
+    _write(tmp_path / "A", "a.pdf")
+    for i in range(50):
+        _write(tmp_path / f"other_{i}", "x.pdf")
+    manifest = ResumeManifest(tmp_path, ["A"], check_interval=0)
+    errors = []
+
+    def list_others():
+        for i in range(50):
+            manifest.get_paths(f"other_{i}")
+
+    def count():
+        try:
+            for _ in range(200):
+                assert manifest.counts() == {"A": 1}
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=list_others), threading.Thread(target=count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []